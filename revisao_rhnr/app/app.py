@@ -9,17 +9,28 @@ from revisao_rhnr.app.paginas.relatorio_selecao_proposta import (
 from revisao_rhnr.app.paginas.revisao_rhnr import revisao_rhnr
 
 st.set_page_config(page_title="Revisão RHNR", layout="wide")
-tab1, tab2, tab3 = st.tabs(
+
+# Com st.navigation apenas a página selecionada é executada, então cada aba só
+# consulta os dados que ela mesma exibe.
+pagina = st.navigation(
     [
-        "Relatório - Seleção Inicial RHNR",
-        "Relatório - Seleção RHNR Proposta",
-        "Análise e Revisão RHNR",
-    ]
+        st.Page(
+            relatorio_selecao_inicial,
+            title="Relatório - Seleção Inicial RHNR",
+            url_path="selecao_inicial",
+            default=True,
+        ),
+        st.Page(
+            relatorio_selecao_proposta,
+            title="Relatório - Seleção RHNR Proposta",
+            url_path="selecao_proposta",
+        ),
+        st.Page(
+            revisao_rhnr,
+            title="Análise e Revisão RHNR",
+            url_path="revisao_rhnr",
+        ),
+    ],
+    position="top",
 )
-
-with tab1:
-    relatorio_selecao_inicial()
-with tab2:
-    relatorio_selecao_proposta()
-with tab3:
-    revisao_rhnr()
+pagina.run()
@@ -7,14 +7,27 @@ import streamlit as st
 from dotenv import load_dotenv
 from sqlalchemy import Engine, create_engine
 
+from revisao_rhnr.app.exportacao import FormatoExportacao, exporta_tabela
+from revisao_rhnr.app.indice_bitmap import IndiceBitmap, ModoCombinacao
 from revisao_rhnr.databases.database_access import (
+    CONSULTA_PAINEL_REVISAO_RHNR,
     ColunaRHNRInicial,
     ColunaRHNRProposta,
-    retorna_estacoes_rhnr_proposta,
-    retorna_estacoes_rhnr_selecao_inicial,
-    retorna_estacoes_validadas_rhnr,
-    retorna_objetivos_especificos,
-    retorna_tipologia_da_estacao,
+    ColunaTabelaRHNRProposta,
+    ConjuntoDadosApp,
+    retorna_dados_app,
+    retorna_dataframe,
+    retorna_versao_dados,
+)
+from revisao_rhnr.databases.grafo_redundancia import (
+    GrafoRedundancia,
+    grupos_com_varias_mantidas,
+)
+from revisao_rhnr.databases.painel_revisao_rhnr import (
+    COLUNAS_TABELA_RHNR_PROPOSTA,
+    formatar_campo_descricao,
+    monta_estacoes_com_tipologia,
+    monta_proposta_rhnr,
 )
 
 load_dotenv()
@@ -47,35 +60,8 @@ type ColunaTabelaRHNRInicial = Literal[
 ]
 
 
-type ColunaTabelaRHNRProposta = Literal[
-    "Código da Estação",
-    "Nome",
-    "Responsável",
-    "Operadora",
-    "Bacia",
-    "Operando",
-    "Tipologia Atual",
-    "Tipologia Mapeada",
-    "RHNR Inicial?",
-    "RHNR Implementada",
-    "Ação Proposta",
-    "Tipologia Proposta",
-    "Integra RHNR?",
-    "Objs. Específicos",
-]
-
-
-def formatar_campo_descricao(estacoes: list[dict]) -> list[dict]:
-    estacoes_modificadas = []
-    for estacao in estacoes:
-        nova_estacao = {}
-        for key, value in estacao.items():
-            if key == "Descrição":
-                nova_estacao["RHNR Implementada"] = "RHNR" in str(value)
-            else:
-                nova_estacao[key] = value
-        estacoes_modificadas.append(nova_estacao)
-    return estacoes_modificadas
+# database_url = os.getenv("DATABASE_URL")
+database_url = f"sqlite:///{Path.cwd() / 'revisao_rhnr' / 'databases' / 'database.db'}"
 
 
 @st.cache_resource
@@ -83,91 +69,202 @@ def get_db_engine(url: str):
     return create_engine(url)
 
 
-@st.cache_data
+def get_engine() -> Engine:
+    if not database_url:
+        st.error("DATABASE_URL not set in environment variables.")
+        st.stop()
+    return get_db_engine(database_url)
+
+
+# Uma execução das páginas chama vários acessores; com a validade curta a versão
+# é consultada uma vez por execução, e uma nova carga aparece em até esse tempo.
+VALIDADE_VERSAO_DADOS = 2
+
+
+@st.cache_data(ttl=VALIDADE_VERSAO_DADOS, show_spinner=False)
+def get_versao_dados_banco(_engine: Engine, url: str) -> str:
+    return retorna_versao_dados(_engine)
+
+
+def get_versao_dados() -> str:
+    return get_versao_dados_banco(get_engine(), database_url)
+
+
+type ConjuntosDados = tuple[ConjuntoDadosApp, ...]
+
+# Conjuntos de dados lidos por cada página, juntos em uma única transação: a
+# página nunca combina tabelas de cargas diferentes do banco e também não paga
+# pelas consultas que só as outras páginas usam.
+DADOS_SELECAO_INICIAL: ConjuntosDados = ("tipologia", "selecao_inicial")
+DADOS_SELECAO_PROPOSTA: ConjuntosDados = (
+    "tipologia",
+    "selecao_inicial",
+    "proposta",
+    "objetivos_especificos",
+    "redundancias",
+)
+DADOS_ESTACOES_VALIDADAS: ConjuntosDados = ("tipologia", "validadas")
+DADOS_REDUNDANCIAS: ConjuntosDados = ("redundancias",)
+
+
+# Os caches são indexados pela versão dos dados e não pelo conteúdo de
+# DataFrames: uma nova carga do banco invalida tudo na próxima execução e,
+# enquanto nada muda, cada rerun custa apenas a verificação da versão.
+@st.cache_data(max_entries=8)
+def get_dados_app(
+    _engine: Engine, versao: str, conjuntos: ConjuntosDados
+) -> dict[ConjuntoDadosApp, pd.DataFrame]:
+    return retorna_dados_app(_engine, conjuntos)
+
+
+@st.cache_data(max_entries=2)
+def get_tipologia_estacoes(_engine: Engine, versao: str) -> pd.DataFrame:
+    return get_dados_app(_engine, versao, ("tipologia",))["tipologia"]
+
+
+@st.cache_data(max_entries=4)
 def get_estacoes_selecao_inicial_rhnr(
-    _engine: Engine, df_tipo_estacoes: pd.DataFrame
+    _engine: Engine, versao: str, conjuntos: ConjuntosDados = DADOS_SELECAO_INICIAL
 ) -> pd.DataFrame:
-    estacoes = retorna_estacoes_rhnr_selecao_inicial(_engine)
-    estacoes_modificadas = formatar_campo_descricao(estacoes)
-    return pd.DataFrame(estacoes_modificadas).merge(
-        df_tipo_estacoes, on="Código da Estação", how="left"
+    dados = get_dados_app(_engine, versao, conjuntos)
+    return monta_estacoes_com_tipologia(dados["selecao_inicial"], dados["tipologia"])
+
+
+@st.cache_data(max_entries=2)
+def get_estacoes_validadas_rhnr(_engine: Engine, versao: str) -> pd.DataFrame:
+    dados = get_dados_app(_engine, versao, DADOS_ESTACOES_VALIDADAS)
+    return monta_estacoes_com_tipologia(dados["validadas"], dados["tipologia"])
+
+
+@st.cache_data(max_entries=2)
+def get_estacoes_proposta_rhnr(_engine: Engine, versao: str) -> pd.DataFrame:
+    dados = get_dados_app(_engine, versao, DADOS_SELECAO_PROPOSTA)
+    return formatar_campo_descricao(dados["proposta"])
+
+
+@st.cache_data(max_entries=2)
+def get_objetivos_especificos(_engine: Engine, versao: str) -> pd.DataFrame:
+    conjuntos: ConjuntosDados = ("objetivos_especificos",)
+    return get_dados_app(_engine, versao, conjuntos)["objetivos_especificos"]
+
+
+# Grafo imutável montado uma vez por versão e compartilhado entre as sessões.
+# A página de revisão o monta só com `estacoes_redundantes`; a da seleção
+# proposta, com as redundâncias da mesma leitura das demais tabelas.
+@st.cache_resource(max_entries=4)
+def get_grafo_redundancia(
+    _engine: Engine, versao: str, conjuntos: ConjuntosDados = DADOS_REDUNDANCIAS
+) -> GrafoRedundancia:
+    return GrafoRedundancia.de_dataframe(
+        get_dados_app(_engine, versao, conjuntos)["redundancias"]
     )
 
 
-@st.cache_data
-def get_tipologia_estacoes(_engine: Engine) -> pd.DataFrame:
-    tipologia_estacoes = retorna_tipologia_da_estacao(_engine)
-    return pd.DataFrame(tipologia_estacoes)
+@st.cache_data(max_entries=2)
+def get_proposta_rhnr(_engine: Engine, versao: str) -> pd.DataFrame:
+    dados = get_dados_app(_engine, versao, DADOS_SELECAO_PROPOSTA)
+    return monta_proposta_rhnr(
+        df_estacoes_proposta=get_estacoes_proposta_rhnr(_engine, versao),
+        df_objs_especificos=dados["objetivos_especificos"],
+        df_tipo_estacoes=dados["tipologia"],
+        df_filtro=get_estacoes_selecao_inicial_rhnr(
+            _engine, versao, DADOS_SELECAO_PROPOSTA
+        ),
+        grafo_redundancia=get_grafo_redundancia(
+            _engine, versao, DADOS_SELECAO_PROPOSTA
+        ),
+    )
 
 
-@st.cache_data
-def get_estacoes_validadas_rhnr(
-    _engine: Engine, df_tipo_estacoes: pd.DataFrame
-) -> pd.DataFrame:
-    estacoes = retorna_estacoes_validadas_rhnr(_engine)
-    estacoes_modificadas = formatar_campo_descricao(estacoes)
-    return pd.DataFrame(estacoes_modificadas).merge(
-        df_tipo_estacoes, on="Código da Estação", how="left"
+@st.cache_data(max_entries=2)
+def get_painel_revisao_rhnr(_engine: Engine, versao: str) -> pd.DataFrame:
+    return retorna_dataframe(_engine, CONSULTA_PAINEL_REVISAO_RHNR)
+
+
+# O índice guarda os bitmaps já montados entre execuções, por isso fica em
+# cache_resource (mesmo objeto compartilhado) e não é serializado a cada rerun.
+@st.cache_resource(max_entries=2)
+def get_indice_painel_revisao_rhnr(_engine: Engine, versao: str) -> IndiceBitmap:
+    return IndiceBitmap(
+        get_painel_revisao_rhnr(_engine, versao),
+        COLUNAS_TABELA_RHNR_PROPOSTA,
     )
 
 
-@st.cache_data
-def get_estacoes_proposta_rhnr(_engine: Engine) -> pd.DataFrame:
-    estacoes = retorna_estacoes_rhnr_proposta(_engine)
-    estacoes_modificadas = formatar_campo_descricao(estacoes)
-    return pd.DataFrame(estacoes_modificadas)
-
-
-@st.cache_data
-def get_objetivos_especificos(_engine: Engine) -> pd.DataFrame:
-    objs_esps = retorna_objetivos_especificos(_engine)
-    result = []
-    for objs in objs_esps:
-        lista_objs = [
-            nome_obj[4:]
-            for nome_obj, tem_obj in objs.items()
-            if tem_obj and nome_obj not in ["codigo", "tipo_mapeamento"]
-        ]
-        result.append(
-            {
-                "Código da Estação": objs["codigo"],
-                "Objs. Específicos": ", ".join(lista_objs),
-            }
-        )
-    return pd.DataFrame(result)
-
-
-@st.cache_data
-def join_dataframes_proposta_rhnr(
-    df1: pd.DataFrame,
-    df2: pd.DataFrame,
-    df_tipo_estacoes: pd.DataFrame,
-    df_filtro: pd.DataFrame,
-):
-    df = df1.merge(df2, on="Código da Estação", how="left")
-    df["RHNR Inicial?"] = df["Código da Estação"].isin(df_filtro["Código da Estação"])
-    return df.merge(df_tipo_estacoes, on="Código da Estação", how="left")[
-        list(get_args(ColunaTabelaRHNRProposta.__value__))
-    ]
+@st.cache_data(max_entries=2)
+def get_grupos_com_varias_mantidas(_engine: Engine, versao: str) -> pd.DataFrame:
+    return grupos_com_varias_mantidas(
+        get_painel_revisao_rhnr(_engine, versao),
+        get_grafo_redundancia(_engine, versao),
+    )
 
 
-# database_url = os.getenv("DATABASE_URL")
-database_url = f"sqlite:///{Path.cwd() / 'revisao_rhnr' / 'databases' / 'database.db'}"
+type FiltrosPainel = tuple[tuple[ColunaTabelaRHNRProposta, tuple], ...]
 
 
-if not database_url:
-    st.error("DATABASE_URL not set in environment variables.")
-    st.stop()
-
-engine = get_db_engine(database_url)
-df_tipo_estacoes = get_tipologia_estacoes(engine)
-df_rhnr_inicial = get_estacoes_selecao_inicial_rhnr(engine, df_tipo_estacoes)
-df_estacoes_validadas = get_estacoes_validadas_rhnr(engine, df_tipo_estacoes)
-df_estacoes_rhnr_proposta = get_estacoes_proposta_rhnr(engine)
-df_objs_especificos = get_objetivos_especificos(engine)
-df_rhnr_proposta = join_dataframes_proposta_rhnr(
-    df1=df_estacoes_rhnr_proposta,
-    df2=df_objs_especificos,
-    df_tipo_estacoes=df_tipo_estacoes,
-    df_filtro=df_rhnr_inicial,
-)
+# Cacheado pelo estado dos filtros: o arquivo só é gerado quando o download é
+# pedido e é reaproveitado enquanto os filtros e os dados não mudarem.
+@st.cache_data(max_entries=8, show_spinner="Gerando arquivo...")
+def get_exportacao_painel_revisao_rhnr(
+    _engine: Engine,
+    versao: str,
+    filtros: FiltrosPainel,
+    modo: ModoCombinacao,
+    formato: FormatoExportacao,
+) -> bytes:
+    indice = get_indice_painel_revisao_rhnr(_engine, versao)
+    selecao = indice.filtra(dict(filtros), modo=modo)
+    df_selecao = get_painel_revisao_rhnr(_engine, versao).iloc[indice.linhas(selecao)]
+    return exporta_tabela(df_selecao, formato)
+
+
+# Acessores usados pelas páginas: cada página só lê, na primeira vez em que é
+# renderizada para a versão atual do banco, os conjuntos de dados que exibe.
+def df_tipo_estacoes() -> pd.DataFrame:
+    return get_tipologia_estacoes(get_engine(), get_versao_dados())
+
+
+def df_rhnr_inicial(conjuntos: ConjuntosDados = DADOS_SELECAO_INICIAL) -> pd.DataFrame:
+    return get_estacoes_selecao_inicial_rhnr(
+        get_engine(), get_versao_dados(), conjuntos
+    )
+
+
+def df_estacoes_validadas() -> pd.DataFrame:
+    return get_estacoes_validadas_rhnr(get_engine(), get_versao_dados())
+
+
+def df_estacoes_rhnr_proposta() -> pd.DataFrame:
+    return get_estacoes_proposta_rhnr(get_engine(), get_versao_dados())
+
+
+def df_objs_especificos() -> pd.DataFrame:
+    return get_objetivos_especificos(get_engine(), get_versao_dados())
+
+
+def df_rhnr_proposta() -> pd.DataFrame:
+    return get_proposta_rhnr(get_engine(), get_versao_dados())
+
+
+def df_painel_revisao_rhnr() -> pd.DataFrame:
+    return get_painel_revisao_rhnr(get_engine(), get_versao_dados())
+
+
+def grafo_redundancia() -> GrafoRedundancia:
+    return get_grafo_redundancia(get_engine(), get_versao_dados())
+
+
+def df_grupos_com_varias_mantidas() -> pd.DataFrame:
+    return get_grupos_com_varias_mantidas(get_engine(), get_versao_dados())
+
+
+def indice_painel_revisao_rhnr() -> IndiceBitmap:
+    return get_indice_painel_revisao_rhnr(get_engine(), get_versao_dados())
+
+
+def exportacao_painel_revisao_rhnr(
+    filtros: FiltrosPainel, modo: ModoCombinacao, formato: FormatoExportacao
+) -> bytes:
+    return get_exportacao_painel_revisao_rhnr(
+        get_engine(), get_versao_dados(), filtros, modo, formato
+    )
@@ -0,0 +1,84 @@
+"""Exportação da tabela de revisão da RHNR em xlsx, CSV ou Parquet.
+
+Os arquivos são gerados apenas quando o usuário pede o download e escritos em
+lotes, sem montar cópias da tabela inteira além do próprio DataFrame: o xlsx
+usa o modo `write_only` do openpyxl, que grava as linhas em fluxo.
+"""
+
+from importlib.util import find_spec
+from io import BytesIO
+from typing import Callable, Iterator, Literal
+
+import pandas as pd
+from openpyxl import Workbook
+
+type FormatoExportacao = Literal["xlsx", "csv", "parquet"]
+
+MIME_EXPORTACAO: dict[FormatoExportacao, str] = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# O Parquet depende do pyarrow, que não é dependência obrigatória do projeto.
+FORMATOS_DISPONIVEIS: tuple[FormatoExportacao, ...] = ("xlsx", "csv") + (
+    ("parquet",) if find_spec("pyarrow") else ()
+)
+
+_TAMANHO_LOTE = 5_000
+
+
+def _lotes(df: pd.DataFrame) -> Iterator[pd.DataFrame]:
+    for inicio in range(0, len(df), _TAMANHO_LOTE):
+        yield df.iloc[inicio : inicio + _TAMANHO_LOTE]
+
+
+def exporta_xlsx(df: pd.DataFrame) -> bytes:
+    workbook = Workbook(write_only=True)
+    planilha = workbook.create_sheet()
+    planilha.append(list(df.columns))
+    for lote in _lotes(df):
+        # Nulos do pandas (pd.NA/NaN) viram células vazias.
+        lote = lote.astype(object).where(lote.notna(), None)
+        for linha in lote.itertuples(index=False, name=None):
+            planilha.append(linha)
+    output = BytesIO()
+    workbook.save(output)
+    return output.getvalue()
+
+
+def exporta_csv(df: pd.DataFrame) -> bytes:
+    output = BytesIO()
+    # utf-8-sig para que o Excel reconheça a acentuação ao abrir o arquivo.
+    df.to_csv(output, index=False, encoding="utf-8-sig", chunksize=_TAMANHO_LOTE)
+    return output.getvalue()
+
+
+def exporta_parquet(df: pd.DataFrame) -> bytes:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as erro:
+        raise ImportError(
+            "A exportação em Parquet requer o pacote pyarrow (pip install pyarrow)."
+        ) from erro
+
+    output = BytesIO()
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    with pq.ParquetWriter(output, schema) as writer:
+        for lote in _lotes(df):
+            writer.write_table(
+                pa.Table.from_pandas(lote, schema=schema, preserve_index=False)
+            )
+    return output.getvalue()
+
+
+_EXPORTADORES: dict[FormatoExportacao, Callable[[pd.DataFrame], bytes]] = {
+    "xlsx": exporta_xlsx,
+    "csv": exporta_csv,
+    "parquet": exporta_parquet,
+}
+
+
+def exporta_tabela(df: pd.DataFrame, formato: FormatoExportacao) -> bytes:
+    return _EXPORTADORES[formato](df)
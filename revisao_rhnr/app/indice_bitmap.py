@@ -0,0 +1,108 @@
+"""Índice de bitmaps por coluna para filtrar a tabela de revisão da RHNR.
+
+Cada coluna indexada é fatorada uma única vez em códigos inteiros; o bitmap
+(bitset empacotado com `np.packbits`) de cada valor é montado na primeira vez
+em que é usado e reaproveitado nas execuções seguintes. Filtros com vários
+campos viram `&`/`|` entre bitsets, e as contagens por valor saem de um
+`np.bincount` sobre os códigos, sem percorrer o DataFrame.
+"""
+
+from typing import Any, Hashable, Iterable, Literal, Mapping
+
+import numpy as np
+import pandas as pd
+
+type ModoCombinacao = Literal["todos", "algum"]
+
+
+class IndiceBitmap:
+    def __init__(self, df: pd.DataFrame, colunas: Iterable[Hashable]) -> None:
+        self.total_linhas = len(df)
+        self._codigos: dict[Hashable, np.ndarray] = {}
+        self._valores: dict[Hashable, list[Any]] = {}
+        self._posicao_valor: dict[Hashable, dict[Any, int]] = {}
+        self._contagens: dict[Hashable, np.ndarray] = {}
+        self._bitmaps: dict[tuple[Hashable, int], np.ndarray] = {}
+
+        for coluna in colunas:
+            # Valores nulos recebem o código -1 e são representados por None.
+            codigos, valores = pd.factorize(df[coluna], sort=True)
+            self._codigos[coluna] = codigos.astype(np.int32)
+            self._valores[coluna] = valores.tolist()
+            self._posicao_valor[coluna] = {
+                valor: posicao for posicao, valor in enumerate(self._valores[coluna])
+            }
+            self._contagens[coluna] = self._conta_codigos(coluna, codigos)
+
+    def _conta_codigos(self, coluna: Hashable, codigos: np.ndarray) -> np.ndarray:
+        """Contagem por código; a última posição guarda o número de nulos."""
+        total_valores = len(self._valores[coluna])
+        return np.roll(np.bincount(codigos + 1, minlength=total_valores + 1), -1)
+
+    def _codigo(self, coluna: Hashable, valor: Any) -> int:
+        if valor is None or valor is pd.NA:
+            return -1
+        return self._posicao_valor[coluna].get(valor, -2)
+
+    def bitmap(self, coluna: Hashable, valor: Any) -> np.ndarray:
+        """Bitset das linhas em que `coluna` é igual a `valor` (None = nulo)."""
+        codigo = self._codigo(coluna, valor)
+        chave = (coluna, codigo)
+        if chave not in self._bitmaps:
+            self._bitmaps[chave] = np.packbits(self._codigos[coluna] == codigo)
+        return self._bitmaps[chave]
+
+    def todas_linhas(self) -> np.ndarray:
+        return np.packbits(np.ones(self.total_linhas, dtype=bool))
+
+    def filtra(
+        self,
+        filtros: Mapping[Hashable, Iterable[Any]],
+        modo: ModoCombinacao = "todos",
+    ) -> np.ndarray:
+        """Combina os filtros em um único bitset.
+
+        Os valores de um mesmo campo são combinados com OU; os campos entre si
+        com E (`modo="todos"`) ou com OU (`modo="algum"`). Campos sem valores
+        selecionados são ignorados.
+        """
+        bitsets = [
+            np.bitwise_or.reduce([self.bitmap(coluna, valor) for valor in valores])
+            for coluna, valores in filtros.items()
+            if valores
+        ]
+        if not bitsets:
+            return self.todas_linhas()
+        if modo == "todos":
+            return np.bitwise_and.reduce(bitsets)
+        return np.bitwise_or.reduce(bitsets)
+
+    def linhas(self, bitset: np.ndarray) -> np.ndarray:
+        """Posições (para uso com `.iloc`) das linhas marcadas no bitset."""
+        return np.flatnonzero(np.unpackbits(bitset, count=self.total_linhas))
+
+    def conta(self, bitset: np.ndarray) -> int:
+        return int(np.bitwise_count(bitset).sum())
+
+    def valores(self, coluna: Hashable) -> list[Any]:
+        """Valores distintos da coluna, ordenados e com None no fim se houver nulos."""
+        return self._valores[coluna] + ([None] if self._contagens[coluna][-1] else [])
+
+    def contagens(
+        self, coluna: Hashable, bitset: np.ndarray | None = None
+    ) -> dict[Any, int]:
+        """Número de linhas por valor da coluna, opcionalmente dentro do bitset."""
+        if bitset is None:
+            contagens = self._contagens[coluna]
+        else:
+            codigos = self._codigos[coluna][self.linhas(bitset)]
+            contagens = self._conta_codigos(coluna, codigos)
+        return {
+            valor: int(total)
+            for valor, total in zip(self._valores[coluna] + [None], contagens)
+            if total
+        }
+
+    def valores_presentes(self, coluna: Hashable, bitset: np.ndarray) -> list[Any]:
+        """Valores distintos da coluna entre as linhas marcadas no bitset."""
+        return list(self.contagens(coluna, bitset))
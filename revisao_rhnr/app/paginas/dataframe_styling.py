@@ -1,14 +1,39 @@
+from itertools import cycle
 from typing import Any, Sequence
+
+import numpy as np
 import pandas as pd
 
+
 def highlight_rows_by_category(
-    row: pd.Series, column: str, match_values: Sequence[Any], colors: Sequence[str]
-) -> list[str]:
-    if len(match_values) != len(colors):
-        raise ValueError("match_values and colors must have the same length")
+    data: pd.DataFrame, column: str, match_values: Sequence[Any], colors: Sequence[str]
+) -> pd.DataFrame:
+    """Background color of every row according to its value in `column`.
+
+    Meant for `Styler.apply(..., axis=None)`: the color of each category is
+    resolved once and spread to the rows through the categorical codes, instead
+    of calling Python once per row. Colors are cycled when there are more
+    categories than colors; a missing value in `match_values` matches NA rows.
+    """
+    styles = [f"background-color: {color}" for color in colors]
+    style_by_value = list(zip(match_values, cycle(styles)))
+    # Like the first-match lookup, a repeated value keeps its first color.
+    style_by_category: dict[Any, str] = {}
+    for value, style in style_by_value:
+        if not pd.isna(value):
+            style_by_category.setdefault(value, style)
+    categories = list(style_by_category)
+    category_styles = list(style_by_category.values())
+    na_style = next((style for value, style in style_by_value if pd.isna(value)), "")
 
-    for match_value, color in zip(match_values, colors):
-        if row[column] == match_value:
-            return [f"background-color: {color}"] * len(row)
+    values = data[column]
+    codes = pd.Categorical(values.astype(object), categories=categories).codes
+    # Code -1 (unmatched or NA) points at the trailing "" (no styling).
+    row_styles = np.array(category_styles + [""], dtype=object)[codes]
+    row_styles[values.isna().to_numpy()] = na_style
 
-    return [""] * len(row)  # No styling for other categories
\ No newline at end of file
+    return pd.DataFrame(
+        np.repeat(row_styles[:, np.newaxis], data.shape[1], axis=1),
+        index=data.index,
+        columns=data.columns,
+    )
@@ -1,11 +1,11 @@
 import streamlit as st
 
-from revisao_rhnr.app.data import (
-    df_rhnr_inicial,
-)
+from revisao_rhnr.app import data
+
 
-@st.cache_data
 def relatorio_selecao_inicial():
+    df_rhnr_inicial = data.df_rhnr_inicial()
+
     st.header("Relatório de Estações - Seleção Inicial RHNR")
 
     st.subheader("Estações da seleção inicial da RHNR corrigidas:")
@@ -1,15 +1,14 @@
 import streamlit as st
 
-from revisao_rhnr.app.data import (
-    df_estacoes_rhnr_proposta,
-    df_rhnr_inicial,
-    df_rhnr_proposta,
-)
+from revisao_rhnr.app import data
 from revisao_rhnr.app.paginas.dataframe_styling import highlight_rows_by_category
 
 
-@st.cache_data
 def relatorio_selecao_proposta():
+    df_rhnr_inicial = data.df_rhnr_inicial(data.DADOS_SELECAO_PROPOSTA)
+    df_estacoes_rhnr_proposta = data.df_estacoes_rhnr_proposta()
+    df_rhnr_proposta = data.df_rhnr_proposta()
+
     df_rhnr_filtro = df_rhnr_inicial[
         df_rhnr_inicial["Código da Estação"].isin(
             df_estacoes_rhnr_proposta[
@@ -31,7 +30,7 @@ def relatorio_selecao_proposta():
     st.dataframe(
         df_rhnr_perm.style.apply(
             highlight_rows_by_category,
-            axis=1,
+            axis=None,
             column="Operando",
             match_values=[0, 1],
             colors=["#ffe6e6", "#e6fff2"],
@@ -52,7 +51,7 @@ def relatorio_selecao_proposta():
     st.dataframe(
         df_rhnr_adicionais.style.apply(
             highlight_rows_by_category,
-            axis=1,
+            axis=None,
             column="Operando",
             match_values=[0, 1],
             colors=["#ffe6e6", "#e6fff2"],
@@ -1,16 +1,10 @@
-from io import BytesIO
-from typing import Sequence, get_args
+from typing import get_args
 
-import numpy as np
-import pandas as pd
 import streamlit as st
 
-from revisao_rhnr.app.data import (
-    ColunaTabelaRHNRProposta,
-    df_estacoes_validadas,
-    df_rhnr_inicial,
-    df_rhnr_proposta,
-)
+from revisao_rhnr.app import data
+from revisao_rhnr.app.data import ColunaTabelaRHNRProposta
+from revisao_rhnr.app.exportacao import FORMATOS_DISPONIVEIS, MIME_EXPORTACAO
 from revisao_rhnr.app.paginas.dataframe_styling import highlight_rows_by_category
 
 select_options: tuple[ColunaTabelaRHNRProposta] = get_args(
@@ -18,69 +12,6 @@ select_options: tuple[ColunaTabelaRHNRProposta] = get_args(
 )
 
 
-def padroniza_dicionario_rhnr(dataframe: pd.DataFrame) -> dict:
-    dicionario = {}
-    total_linhas = dataframe.shape[0]
-    for col in dataframe.columns:
-        if "Objetivo" in col:
-            continue
-        if col in select_options:
-            dicionario[col] = dataframe[col].to_list()
-        else:
-            dicionario[col] = [None] * total_linhas
-    return dicionario
-
-
-@st.cache_data
-def adiciona_estacoes_rhrn_inicial_e_validadas() -> pd.DataFrame:
-    dict_rede_inicial = padroniza_dicionario_rhnr(df_rhnr_inicial)
-    df_rede_inicial = pd.DataFrame(dict_rede_inicial)
-    df_rede_inicial["RHNR Inicial?"] = True
-    df_rede_inicial_sem_proposta = df_rede_inicial[
-        ~df_rede_inicial["Código da Estação"].isin(
-            df_rhnr_proposta["Código da Estação"]
-        )
-    ]
-
-    dict_estacoes_validadas = padroniza_dicionario_rhnr(df_estacoes_validadas)
-    df_rede_validada = pd.DataFrame(dict_estacoes_validadas)
-    df_rede_validada_sem_inicial = df_rede_validada[
-        ~df_rede_validada["Código da Estação"].isin(
-            df_rede_inicial["Código da Estação"]
-        )
-    ].copy()
-    df_rede_validada_sem_inicial["RHNR Inicial?"] = False
-    df_rede_validada_sem_inicial_e_sem_proposta = df_rede_validada_sem_inicial[
-        ~df_rede_validada_sem_inicial["Código da Estação"].isin(
-            df_rhnr_proposta["Código da Estação"]
-        )
-    ]
-
-    return (
-        pd.concat(
-            [
-                df_rhnr_proposta,
-                df_rede_inicial_sem_proposta,
-                df_rede_validada_sem_inicial_e_sem_proposta,
-            ]
-        )
-        .sort_values(by="Código da Estação")
-        .reset_index(drop=True)
-    )
-
-
-@st.cache_data
-def create_dictionary_select_options(
-    dataframe: pd.DataFrame, columns: Sequence[ColunaTabelaRHNRProposta]
-) -> dict[ColunaTabelaRHNRProposta, list[str]]:
-    result = {}
-    for column in columns:
-        result[column] = (
-            dataframe[column].replace(np.nan, None).sort_values().unique().tolist()
-        )
-    return result
-
-
 def revisao_rhnr() -> None:
     colors = [
         "#8dd3c7",
@@ -110,9 +41,8 @@ def revisao_rhnr() -> None:
         
     ]
 
-    df_rhnr_final = adiciona_estacoes_rhrn_inicial_e_validadas()
-
-    select_dicionario = create_dictionary_select_options(df_rhnr_final, select_options)
+    df_rhnr_final = data.df_painel_revisao_rhnr()
+    indice = data.indice_painel_revisao_rhnr()
 
     pills_options: list[ColunaTabelaRHNRProposta] = [
         "Responsável",
@@ -123,87 +53,99 @@ def revisao_rhnr() -> None:
         "RHNR Inicial?",
         "Integra RHNR?",
         "Ação Proposta",
+        "Grupo Redundância",
     ]
 
-    coluna1, coluna2 = st.columns(2, vertical_alignment="center", border=True)
+    coluna1, coluna2 = st.columns([0.7, 0.3], vertical_alignment="center", border=True)
 
     with coluna1:
-        select_campo = st.selectbox(
-            label="Campo da tabela:",
-            index=None,
-            options=list(select_dicionario.keys()),
-            placeholder="Selecione um campo da tabela para filtrar",
+        campos_filtro = st.multiselect(
+            label="Campos da tabela:",
+            options=select_options,
+            placeholder="Selecione um ou mais campos da tabela para filtrar",
         )
     with coluna2:
-        if not select_campo:
-            valores_filtro = st.selectbox(
-                label="Valor do Filtro:",
-                options=[""],
-                disabled=True,
-            )
-        else:
-            valores_filtro = st.selectbox(
-                label="Selecione o valor a filtar:",
-                index=None,
-                options=[
-                    option
-                    for option in select_dicionario[select_campo]
-                    if option is not None
-                ],  # type: ignore
-                placeholder=f"Selecione um valor do campo {select_campo} para filtrar",
-            )
+        modo_filtro = st.radio(
+            label="Combinar os campos com:",
+            options=["todos", "algum"],
+            format_func={
+                "todos": "E (todos os campos)",
+                "algum": "OU (algum dos campos)",
+            }.get,
+            horizontal=True,
+        )
+
+    filtros: dict[ColunaTabelaRHNRProposta, list] = {}
+    for campo in campos_filtro:
+        contagens = indice.contagens(campo)
+        filtros[campo] = st.multiselect(
+            label=f"Valores do campo {campo}:",
+            options=list(contagens),
+            format_func=lambda valor, contagens=contagens: (
+                f"{'(vazio)' if valor is None else valor} ({contagens[valor]})"
+            ),
+            placeholder=f"Selecione um ou mais valores do campo {campo} para filtrar",
+        )
 
     pill_selection = st.pills(
         "Coluna a destacar:", pills_options, selection_mode="single"
     )
 
-    if select_campo is not None:
-        # and valores_filtro is not None:
-        if valores_filtro is None:
-            df_selecao = df_rhnr_final[df_rhnr_final[select_campo].isna()]
-        else:
-            df_selecao = df_rhnr_final[df_rhnr_final[select_campo] == valores_filtro]
-    else:
-        df_selecao = df_rhnr_final
+    selecao = indice.filtra(filtros, modo=modo_filtro)  # type: ignore
+    df_selecao = df_rhnr_final.iloc[indice.linhas(selecao)]
 
     coluna3, coluna4 = st.columns([0.6, 0.4], vertical_alignment="center")
 
     with coluna3:
         st.subheader("Tabela de Revisão da RHNR")
     with coluna4:
-        st.subheader(f"Número de estações selecionadas: {df_selecao.shape[0]}")
+        st.subheader(f"Número de estações selecionadas: {indice.conta(selecao)}")
 
     if pill_selection:
-        pill_dictionary = create_dictionary_select_options(df_selecao, pills_options)
+        valores_destaque = indice.valores_presentes(pill_selection, selecao)
         st.dataframe(
             df_selecao.style.apply(
                 highlight_rows_by_category,
-                axis=1,
+                axis=None,
                 column=pill_selection,  # type: ignore
-                match_values=pill_dictionary[pill_selection],  # type: ignore
-                colors=colors[0 : len(pill_dictionary[pill_selection])],  # type: ignore
+                match_values=valores_destaque,
+                colors=colors,
             ),
             hide_index=True,
         )
     else:
         st.dataframe(df_selecao, hide_index=True)
 
-    st.download_button(
-        label="Download da Tabela",
-        data=to_excel(df_selecao),
-        mime="application/vnd.ms-excel",
-        file_name="revisao_rhnr.xlsx",
-        type="primary",
-    )
+    df_grupos_mantidos = data.df_grupos_com_varias_mantidas()
+    total_grupos = df_grupos_mantidos["Grupo Redundância"].nunique()
+    with st.expander(
+        f"Grupos de redundância com mais de uma estação mantida na RHNR: {total_grupos}"
+    ):
+        st.dataframe(df_grupos_mantidos, hide_index=True)
 
+    coluna5, coluna6 = st.columns([0.3, 0.7], vertical_alignment="bottom")
 
-def to_excel(df):
-    """
-    Converts a Pandas DataFrame to an Excel file in-memory.
-    """
-    output = BytesIO()
-    writer = pd.ExcelWriter(output, engine="openpyxl")
-    df.to_excel(writer, index=False)
-    writer.close()  # Use writer.close() instead of writer.save() for newer pandas versions
-    processed_data = output.getvalue()
-    return processed_data
+    with coluna5:
+        formato = st.segmented_control(
+            "Formato do arquivo:", FORMATOS_DISPONIVEIS, default="xlsx"
+        )
+    # O arquivo só é gerado quando pedido e fica em cache para o estado atual
+    # dos filtros; ao mudar os filtros é preciso pedi-lo de novo.
+    estado_exportacao = (
+        tuple((campo, tuple(valores)) for campo, valores in filtros.items() if valores),
+        modo_filtro,
+        formato,
+    )
+    with coluna6:
+        if st.button("Preparar download", disabled=formato is None):
+            st.session_state["exportacao_revisao_rhnr"] = estado_exportacao
+
+    if formato and st.session_state.get("exportacao_revisao_rhnr") == estado_exportacao:
+        st.download_button(
+            label="Download da Tabela",
+            data=data.exportacao_painel_revisao_rhnr(*estado_exportacao),  # type: ignore
+            mime=MIME_EXPORTACAO[formato],
+            file_name=f"revisao_rhnr.{formato}",
+            type="primary",
+            on_click="ignore",
+        )
@@ -1,15 +1,21 @@
 "Estações levantadas manualmente na Revisão RHNR pelo Flávio Troger"
 
 import os
+from pathlib import Path
 
 import pandas as pd
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, select
-from sqlalchemy.orm import Session
+from sqlalchemy import create_engine
 
 from revisao_rhnr.databases.alimentacao_tabelas_bd_bases_cplar.constantes import (
     COLS_OBJS_ESPECIFICOS,
 )
+from revisao_rhnr.databases.alimentacao_tabelas_bd_bases_cplar.insercao_em_lote import (
+    insere_novas,
+)
+from revisao_rhnr.databases.alimentacao_tabelas_bd_bases_cplar.leitura_planilhas import (
+    le_planilha,
+)
 from revisao_rhnr.databases.models_postgres import (
     EstacaoPropostaRHNR,
     ObjetivoEspecificoEstacaoProposta,
@@ -31,7 +37,7 @@ def retorna_tipologia_estacao(row: pd.Series) -> str:
         tipologia.append("T")
 
     if not tipologia:
-        raise ValueError(f"Tipologia inválida para a estação {row['Código']}")
+        raise ValueError(f"Tipologia inválida para a estação {row['Código-Estação']}")
 
     return "".join(tipologia)
 
@@ -55,52 +61,48 @@ def main():
         obj_esp: None for obj_esp in COLS_OBJS_ESPECIFICOS.values()
     }
 
-    df = pd.read_excel(io=f"{folder}/{filename}")
-
+    df = le_planilha(
+        Path(folder) / filename,
+        colunas=[
+            "Código-Estação",
+            "Escala",
+            "Descarga líquida",
+            "Qualidade da água",
+            "Sedimentos",
+            "Telemétrica",
+            "Objetivos Especificos",
+        ],
+    )
+
+    linhas_estacoes = []
+    linhas_objs_esps = []
     for _, row in df.iterrows():
-        tipologia = retorna_tipologia_estacao(row)
-        codigo = row["Código-Estação"]
-
-        dict_dados = dict_cols_comum_estacoes | {
-            "codigo": codigo,
-            "tipo_estacao": tipologia,
-        }
-        with Session(engine) as session:
-            stmt_prop = select(EstacaoPropostaRHNR).where(
-                EstacaoPropostaRHNR.codigo == codigo
-            )
-            estacao_prop_existente = session.execute(stmt_prop).scalar_one_or_none()
-            if not estacao_prop_existente:
-                print(
-                    f"Inserindo estação {codigo} no Tabela revisao_rhnr.estacoes_proposta_rhnr..."
-                )
-                estacao = EstacaoPropostaRHNR(**dict_dados)
-                session.add(estacao)
-
-            stmt_obj_esp = select(ObjetivoEspecificoEstacaoProposta).where(
-                ObjetivoEspecificoEstacaoProposta.codigo == codigo
-            )
-            obj_esp_existente = session.execute(stmt_obj_esp).scalar_one_or_none()
-            if not obj_esp_existente:
-                objs_especificos = row["Objetivos Especificos"].split(",")
-                dict_objs_especificos = {
-                    f"obj_{obj.strip()}": 1 for obj in objs_especificos
-                }
-                print(
-                    f"Inserindo estação {codigo} no Tabela revisao_rhnr.obj_espec_estacoes_propostas..."
-                )
-                objs_esp = (
-                    dict_cols_comum_objs_esps
-                    | {
-                        "codigo": codigo,
-                        "tipo_mapeamento": "Manual",
-                    }
-                    | dict_objs_especificos
-                )
-                obj_esp = ObjetivoEspecificoEstacaoProposta(**objs_esp)
-                session.add(obj_esp)
-
-            session.commit()
+        codigo = int(row["Código-Estação"])
+        linhas_estacoes.append(
+            dict_cols_comum_estacoes
+            | {"codigo": codigo, "tipo_estacao": retorna_tipologia_estacao(row)}
+        )
+        objs_especificos = str(row["Objetivos Especificos"]).split(",")
+        linhas_objs_esps.append(
+            dict_cols_comum_objs_esps
+            | {"codigo": codigo, "tipo_mapeamento": "Manual"}
+            | {f"obj_{obj.strip()}": 1 for obj in objs_especificos}
+        )
+
+    # Estações e objetivos já cadastrados são mantidos como estão.
+    with engine.begin() as connection:
+        inseridas = insere_novas(
+            connection, EstacaoPropostaRHNR.__table__, linhas_estacoes
+        )
+        print(
+            f"{len(inseridas)} estações inseridas na tabela revisao_rhnr.estacoes_proposta_rhnr."
+        )
+        inseridas = insere_novas(
+            connection, ObjetivoEspecificoEstacaoProposta.__table__, linhas_objs_esps
+        )
+        print(
+            f"{len(inseridas)} estações inseridas na tabela revisao_rhnr.obj_espec_estacoes_propostas."
+        )
 
 
 if __name__ == "__main__":
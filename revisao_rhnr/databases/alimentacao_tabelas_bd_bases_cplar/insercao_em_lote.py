@@ -0,0 +1,66 @@
+"""Inserção em lote nas tabelas da revisão com `INSERT ... ON CONFLICT` do dialeto.
+
+Em vez de consultar a existência de cada estação e gravar uma a uma, o lote
+inteiro vai em um único comando executado com `executemany`, e o banco decide
+o que fazer com os códigos que já existem. Funciona no PostgreSQL e no SQLite.
+"""
+
+from typing import Any, Callable
+
+from sqlalchemy import Connection, Table
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import Insert as InsertPostgres
+from sqlalchemy.dialects.sqlite import Insert as InsertSQLite
+
+_INSERTS_POR_DIALETO: dict[str, Callable[[Table], InsertPostgres | InsertSQLite]] = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def _insert_do_dialeto(
+    connection: Connection, tabela: Table
+) -> InsertPostgres | InsertSQLite:
+    try:
+        insert = _INSERTS_POR_DIALETO[connection.dialect.name]
+    except KeyError:
+        raise NotImplementedError(
+            f"Inserção em lote não suportada para o banco {connection.dialect.name}."
+        ) from None
+    return insert(tabela)
+
+
+def insere_novas(
+    connection: Connection, tabela: Table, linhas: list[dict[str, Any]]
+) -> list[Any]:
+    """Insere as linhas cuja chave primária ainda não existe na tabela.
+
+    Retorna as chaves das linhas inseridas; as já existentes ficam como estão.
+    """
+    if not linhas:
+        return []
+    stmt = _insert_do_dialeto(connection, tabela)
+    stmt = stmt.on_conflict_do_nothing(index_elements=tabela.primary_key.columns)
+    return list(connection.scalars(stmt.returning(*tabela.primary_key), linhas))
+
+
+def insere_ou_atualiza(
+    connection: Connection, tabela: Table, linhas: list[dict[str, Any]]
+) -> list[Any]:
+    """Insere as linhas novas e sobrescreve as existentes com os valores do lote.
+
+    Todas as linhas precisam ter as mesmas colunas. Retorna as chaves gravadas.
+    """
+    if not linhas:
+        return []
+    stmt = _insert_do_dialeto(connection, tabela)
+    colunas_chave = {coluna.name for coluna in tabela.primary_key}
+    stmt = stmt.on_conflict_do_update(
+        index_elements=tabela.primary_key.columns,
+        set_={
+            coluna: stmt.excluded[coluna]
+            for coluna in linhas[0]
+            if coluna not in colunas_chave
+        },
+    )
+    return list(connection.scalars(stmt.returning(*tabela.primary_key), linhas))
@@ -0,0 +1,177 @@
+"""Leitura das planilhas da revisão em fluxo, só com as colunas mapeadas, e com cache.
+
+A planilha é aberta no modo `read_only` do openpyxl, que lê as linhas do xml em
+fluxo em vez de carregar a pasta de trabalho inteira, e só os valores das
+colunas pedidas são guardados, em uma lista. A conversão de tipos e de nulos é a
+mesma do `pd.read_excel` (via `TextParser`), então o resultado é igual ao de
+antes. Essa conversão precisa das linhas todas de uma vez: o `TextParser` acessa
+a lista por índice, e converter em blocos inferiria o tipo de cada coluna bloco a
+bloco, o que poderia dar tipos diferentes dos do `pd.read_excel`.
+
+O DataFrame lido é gravado em Parquet em `DIRETORIO_CACHE`, com nome derivado do
+hash do conteúdo do arquivo e dos parâmetros de leitura: uma planilha que não
+mudou é carregada do cache, sem abrir o xlsx.
+"""
+
+import hashlib
+import json
+import os
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+import pandas as pd
+from openpyxl import load_workbook
+from openpyxl.cell.cell import TYPE_ERROR, TYPE_NUMERIC
+from openpyxl.worksheet._read_only import ReadOnlyWorksheet
+from pandas.io.parsers import TextParser
+
+DIRETORIO_CACHE = Path(__file__).parent / "cache_planilhas"
+
+VALORES_NULOS = [
+    "-",
+    "--",
+    "---",
+    " --",
+    "",
+    "NOVA",
+    "***",
+    "NOVA ESTAÇÃO",
+    "99999999",
+]
+
+# O cache em Parquet depende do pyarrow, que não é dependência obrigatória.
+_CACHE_DISPONIVEL = find_spec("pyarrow") is not None
+
+_TAMANHO_BLOCO_HASH = 1024 * 1024
+
+
+def hash_arquivo(caminho: Path) -> str:
+    sha256 = hashlib.sha256()
+    with open(caminho, "rb") as arquivo:
+        while bloco := arquivo.read(_TAMANHO_BLOCO_HASH):
+            sha256.update(bloco)
+    return sha256.hexdigest()
+
+
+def _valor_celula(cell: Any) -> Any:
+    """Mesma conversão de células do leitor openpyxl do pandas."""
+    if cell.value is None:
+        return ""
+    if cell.data_type == TYPE_ERROR:
+        return np.nan
+    if cell.data_type == TYPE_NUMERIC:
+        inteiro = int(cell.value)
+        return inteiro if inteiro == cell.value else float(cell.value)
+    return cell.value
+
+
+def _linhas_colunas(
+    planilha: ReadOnlyWorksheet, colunas: list[str], skip_rows: int
+) -> Iterator[list[Any]]:
+    """Cabeçalho e linhas da planilha com apenas as colunas pedidas."""
+    linha_cabecalho = skip_rows + 1
+    cabecalho = [
+        str(_valor_celula(cell))
+        for linha in planilha.iter_rows(
+            min_row=linha_cabecalho, max_row=linha_cabecalho
+        )
+        for cell in linha
+    ]
+    nomes = set(colunas)
+    posicoes = [posicao for posicao, nome in enumerate(cabecalho) if nome in nomes]
+    if faltantes := nomes - {cabecalho[posicao] for posicao in posicoes}:
+        raise ValueError(f"Colunas não encontradas na planilha: {sorted(faltantes)}")
+
+    yield [cabecalho[posicao] for posicao in posicoes]
+    # As células à direita da última coluna pedida nem chegam a ser criadas.
+    linhas = planilha.iter_rows(min_row=linha_cabecalho + 1, max_col=max(posicoes) + 1)
+    linhas_vazias = 0
+    for linha in linhas:
+        # Linhas vazias só são repassadas se houver dados depois delas, como o
+        # pandas faz ao descartar as linhas em branco no fim da planilha.
+        if all(cell.value is None for cell in linha):
+            linhas_vazias += 1
+            continue
+        for _ in range(linhas_vazias):
+            yield [""] * len(posicoes)
+        linhas_vazias = 0
+        yield [
+            _valor_celula(linha[posicao]) if posicao < len(linha) else ""
+            for posicao in posicoes
+        ]
+
+
+def le_planilha_excel(
+    caminho: Path,
+    colunas: list[str],
+    skip_rows: int = 0,
+    sheet_name: str | None = None,
+) -> pd.DataFrame:
+    """Lê as colunas pedidas da planilha, sem cache."""
+    workbook = load_workbook(caminho, read_only=True, data_only=True)
+    try:
+        planilha = workbook[sheet_name] if sheet_name else workbook.worksheets[0]
+        # As dimensões gravadas no arquivo nem sempre estão corretas.
+        planilha.reset_dimensions()
+        linhas = list(_linhas_colunas(planilha, colunas, skip_rows))
+        with TextParser(linhas, header=0, na_values=VALORES_NULOS) as parser:
+            return parser.read()
+    finally:
+        workbook.close()
+
+
+def _caminho_cache(
+    caminho: Path, colunas: list[str], skip_rows: int, sheet_name: str | None
+) -> Path:
+    parametros = json.dumps(
+        [sorted(colunas), skip_rows, sheet_name, VALORES_NULOS], ensure_ascii=False
+    )
+    chave_parametros = hashlib.sha256(parametros.encode()).hexdigest()[:16]
+    return DIRETORIO_CACHE / f"{hash_arquivo(caminho)}-{chave_parametros}.parquet"
+
+
+def _grava_cache(df: pd.DataFrame, destino: Path) -> None:
+    import pyarrow as pa
+
+    destino.parent.mkdir(parents=True, exist_ok=True)
+    temporario = destino.with_suffix(f".{os.getpid()}.tmp")
+    try:
+        df.to_parquet(temporario, index=False)
+    except pa.ArrowException as erro:
+        # Colunas com tipos mistos (ex.: números e textos em observações) não
+        # têm tipo Parquet; a planilha continua sendo lida, só não fica em cache.
+        temporario.unlink(missing_ok=True)
+        print(f"Planilha não gravada em cache ({erro}).")
+        return
+    os.replace(temporario, destino)
+
+
+def _le_cache(caminho_cache: Path) -> pd.DataFrame:
+    df = pd.read_parquet(caminho_cache)
+    # O Parquet devolve os nulos das colunas de texto como None; a leitura da
+    # planilha os deixa como NaN.
+    objetos = df.select_dtypes(object).columns
+    df[objetos] = df[objetos].where(df[objetos].notna(), np.nan)
+    return df
+
+
+def le_planilha(
+    caminho: Path,
+    colunas: list[str],
+    skip_rows: int = 0,
+    sheet_name: str | None = None,
+    usa_cache: bool = True,
+) -> pd.DataFrame:
+    """Lê as colunas pedidas da planilha, do cache quando o arquivo não mudou."""
+    if not (usa_cache and _CACHE_DISPONIVEL):
+        return le_planilha_excel(caminho, colunas, skip_rows, sheet_name)
+
+    caminho_cache = _caminho_cache(caminho, colunas, skip_rows, sheet_name)
+    if caminho_cache.exists():
+        return _le_cache(caminho_cache)
+
+    df = le_planilha_excel(caminho, colunas, skip_rows, sheet_name)
+    _grava_cache(df, caminho_cache)
+    return df
@@ -3,12 +3,15 @@
 import os
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, select, update
-from sqlalchemy.orm import Session
+from sqlalchemy import create_engine
 
 from revisao_rhnr.databases.alimentacao_tabelas_bd_bases_cplar.constantes import (
     COLS_OBJS_ESPECIFICOS,
 )
+from revisao_rhnr.databases.alimentacao_tabelas_bd_bases_cplar.insercao_em_lote import (
+    insere_novas,
+    insere_ou_atualiza,
+)
 from revisao_rhnr.databases.models_postgres import (
     EstacaoPropostaRHNR,
     ObjetivoEspecificoEstacaoProposta,
@@ -56,52 +59,46 @@ def main() -> None:
         obj_esp: None for obj_esp in COLS_OBJS_ESPECIFICOS.values()
     }
 
-    for codigo in estacoes:
-        dict_dados = {"codigo": codigo} | dict_cols_comum_estacoes
-        with Session(engine) as session:
-            stmt_prop = select(EstacaoPropostaRHNR).where(
-                EstacaoPropostaRHNR.codigo == codigo
-            )
-            estacao_prop_existente = session.execute(stmt_prop).scalar_one_or_none()
-            if not estacao_prop_existente:
-                print(
-                    f"Inserindo estação {codigo} no Tabela revisao_rhnr.estacoes_proposta_rhnr..."
-                )
-                estacao = EstacaoPropostaRHNR(**dict_dados)
-                session.add(estacao)
-
-            stmt_obj_esp = select(ObjetivoEspecificoEstacaoProposta).where(
-                ObjetivoEspecificoEstacaoProposta.codigo == codigo
-            )
-            obj_esp_existente = session.execute(stmt_obj_esp).scalar_one_or_none()
-            if not obj_esp_existente:
-                print(
-                    f"Inserindo estação {codigo} no Tabela revisao_rhnr.obj_espec_estacoes_propostas..."
-                )
-                objs_esp = dict_cols_comum_objs_esps | {
-                    "codigo": codigo,
-                    "obj_6d": 1,
-                    "tipo_mapeamento": "Manual",
-                }
-                obj_esp = ObjetivoEspecificoEstacaoProposta(**objs_esp)
-                session.add(obj_esp)
-
-            if codigo in estacoes_atualizar_objetivos:
-                print(
-                    f"Atualizando objetivos específicos da estação {codigo} na tabela revisao_rhnr.obj_espec_estacoes_propostas..."
-                )
-                objs_esp_atualizado = dict_cols_comum_objs_esps | {
-                    "obj_6d": 1,
-                    "tipo_mapeamento": "Manual",
-                }
-                stmt_obj_esp_update = (
-                    update(ObjetivoEspecificoEstacaoProposta).where(
-                        ObjetivoEspecificoEstacaoProposta.codigo == codigo
-                    )
-                ).values(**objs_esp_atualizado)
-                session.execute(stmt_obj_esp_update)
+    linhas_estacoes = [
+        {"codigo": codigo} | dict_cols_comum_estacoes for codigo in estacoes
+    ]
+    linhas_objs_esps = [
+        dict_cols_comum_objs_esps
+        | {"codigo": codigo, "obj_6d": 1, "tipo_mapeamento": "Manual"}
+        for codigo in estacoes
+    ]
 
-            session.commit()
+    with engine.begin() as connection:
+        inseridas = insere_novas(
+            connection, EstacaoPropostaRHNR.__table__, linhas_estacoes
+        )
+        print(
+            f"{len(inseridas)} estações inseridas na tabela revisao_rhnr.estacoes_proposta_rhnr."
+        )
+        # Os objetivos das estações a atualizar são sobrescritos mesmo se já
+        # existirem; os das demais só são inseridos se ainda não existirem.
+        inseridas = insere_novas(
+            connection,
+            ObjetivoEspecificoEstacaoProposta.__table__,
+            [
+                linha
+                for linha in linhas_objs_esps
+                if linha["codigo"] not in estacoes_atualizar_objetivos
+            ],
+        )
+        atualizadas = insere_ou_atualiza(
+            connection,
+            ObjetivoEspecificoEstacaoProposta.__table__,
+            [
+                linha
+                for linha in linhas_objs_esps
+                if linha["codigo"] in estacoes_atualizar_objetivos
+            ],
+        )
+        print(
+            f"{len(inseridas)} estações inseridas e {len(atualizadas)} atualizadas "
+            "na tabela revisao_rhnr.obj_espec_estacoes_propostas."
+        )
 
 
 if __name__ == "__main__":
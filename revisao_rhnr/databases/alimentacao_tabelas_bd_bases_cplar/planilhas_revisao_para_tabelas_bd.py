@@ -1,13 +1,43 @@
 """Module para alimentar tabelas do banco de dados a partir de arquivos Excel específicos da revisão da RHNR."""
 
+import argparse
 import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from pathlib import Path
+from typing import Callable, Literal
 
 import pandas as pd
 from dotenv import load_dotenv
-from sqlalchemy import Engine, create_engine
-from sqlalchemy.orm import Session
+from sqlalchemy import Connection, Engine, Table, create_engine, delete
 
-from revisao_rhnr.databases.models_sqlite import EstacaoRedundante
+from revisao_rhnr.databases.alimentacao_tabelas_bd_bases_cplar.constantes import (
+    COLS_OBJS_ESPECIFICOS,
+)
+from revisao_rhnr.databases.alimentacao_tabelas_bd_bases_cplar.leitura_planilhas import (
+    le_planilha,
+)
+from revisao_rhnr.databases.models_postgres import (
+    EstacaoPropostaRHNR,
+    EstacaoRedundante,
+    EstacaoRHNRSelecaoInicial,
+    ObjetivoEspecificoEstacaoProposta,
+)
+
+type TabelaRevisao = Literal[
+    "estacoes_proposta_rhnr", "estacoes_redundantes", "obj_espec_estacoes_propostas"
+]
+
+
+def _remove_estacoes(connection: Connection, tabela: Table, codigos: pd.Series) -> None:
+    """Apaga as linhas das estações que vão ser regravadas.
+
+    Feito na mesma transação da gravação, torna a carga repetível: rodar de novo
+    substitui as linhas das estações da planilha em vez de duplicá-las.
+    """
+    codigos = codigos.dropna().astype("int64").unique().tolist()
+    connection.execute(delete(tabela).where(tabela.c.codigo.in_(codigos)))
 
 
 def alimenta_estacoes_rhnr_selecao_inicial(engine: Engine):
@@ -28,13 +58,15 @@ def alimenta_estacoes_rhnr_selecao_inicial(engine: Engine):
     df = pd.read_excel(os.path.join(folder_path, file_path))[colunas.keys()].rename(
         columns=colunas
     )
-    df.to_sql(
-        name="estacoes_rhnr_selecao_inicial",
-        con=engine,
-        if_exists="append",
-        schema="revisao_rhnr",
-        index=False,
-    )
+    with engine.begin() as connection:
+        _remove_estacoes(connection, EstacaoRHNRSelecaoInicial.__table__, df.codigo)
+        df.to_sql(
+            name="estacoes_rhnr_selecao_inicial",
+            con=connection,
+            if_exists="append",
+            schema="revisao_rhnr",
+            index=False,
+        )
 
 
 def retorna_dataframe_da_tabela_excel(
@@ -42,31 +74,24 @@ def retorna_dataframe_da_tabela_excel(
     colunas: dict[str, str],
     skip_rows: int,
     sheet_name: str | None = None,
+    usa_cache: bool = True,
 ) -> pd.DataFrame:
     folder_path = "C:/Users/marco.goncalves/Downloads/Revisao_RHNR"
 
-    df = pd.read_excel(
-        os.path.join(folder_path, file_path),
-        skiprows=skip_rows,
-        usecols=list(colunas.keys()),
-        na_values=[
-            "-",
-            "--",
-            "---",
-            " --",
-            "",
-            "NOVA",
-            "***",
-            "NOVA ESTAÇÃO",
-            "99999999",
-        ],
-        sheet_name=sheet_name if sheet_name else 0,
+    df = le_planilha(
+        Path(folder_path) / file_path,
+        colunas=list(colunas.keys()),
+        skip_rows=skip_rows,
+        sheet_name=sheet_name,
+        usa_cache=usa_cache,
     ).rename(columns=colunas)
 
     return df
 
 
-def alimenta_estacoes_proposta_rhnr(engine: Engine, dataframe: pd.DataFrame) -> None:
+def alimenta_estacoes_proposta_rhnr(
+    connection: Connection, dataframe: pd.DataFrame
+) -> None:
     # Tabela revisao_rhnr.estacoes_proposta_rhnr
     colunas_tabela_estacoes_proposta = [
         "codigo",
@@ -87,44 +112,78 @@ def alimenta_estacoes_proposta_rhnr(engine: Engine, dataframe: pd.DataFrame) ->
         .copy()
         .replace({"proposta_integra_rhnr": renomeia_boolean})
     )
+    _remove_estacoes(connection, EstacaoPropostaRHNR.__table__, df.codigo)
     df.to_sql(
         name="estacoes_proposta_rhnr",
-        con=engine,
+        con=connection,
         if_exists="append",
         schema="revisao_rhnr",
         index=False,
     )
 
 
-def alimenta_estacoes_redundantes(engine: Engine, dataframe: pd.DataFrame) -> None:
+# Cada linha do texto de redundância é "<código> - <tipo>[ comentário]", com um
+# único " - " na linha. O tipo é o texto até o primeiro espaço depois do " - ".
+_PADRAO_REDUNDANCIA = (
+    r"^\s*(?P<codigo_redundante>[+-]?\d+)\s* - (?!.* - )(?P<tipo_estacao>[^ ]*)"
+)
+
+
+def extrai_estacoes_redundantes(
+    dataframe: pd.DataFrame,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Separa o texto de redundância em um par (codigo, codigo_redundante) por linha.
+
+    Retorna os pares válidos e as linhas de texto fora do padrão, com o código
+    da estação a que pertencem. Linhas em branco são ignoradas.
+    """
+    linhas = (
+        dataframe.loc[
+            dataframe.codigo.notna() & dataframe.redundancia.notna(),
+            ["codigo", "redundancia"],
+        ]
+        .assign(redundancia=lambda df: df.redundancia.astype(str).str.split("\n"))
+        .explode("redundancia", ignore_index=True)
+    )
+    linhas = linhas[linhas.redundancia.str.strip() != ""]
+
+    partes = linhas.redundancia.str.extract(_PADRAO_REDUNDANCIA)
+    validas = partes.codigo_redundante.notna()
+    estacoes_redundantes = pd.DataFrame(
+        {
+            "codigo": linhas.codigo[validas].astype("int64"),
+            "codigo_redundante": partes.codigo_redundante[validas].astype("int64"),
+            "tipo_estacao": partes.tipo_estacao[validas],
+        }
+    )
+    return estacoes_redundantes, linhas[~validas]
+
+
+def alimenta_estacoes_redundantes(
+    connection: Connection, dataframe: pd.DataFrame
+) -> None:
     # Tabela revisao_rhnr.estacoes_redundantes
-    colunas_tabela_estacoes_redundantes = ["codigo", "redundancia"]
-
-    table_rows: list[EstacaoRedundante] = []
-    for _, row in dataframe[colunas_tabela_estacoes_redundantes].iterrows():
-        if pd.isna(row.codigo) or pd.isna(row.redundancia):
-            continue
-
-        print(f"Linha: {row.redundancia}")
-        for info_redundancia in row.redundancia.split("\n"):
-            print(f"{info_redundancia=}")
-            codigo_redundante, tipo_estacao = info_redundancia.split(" - ")
-            print(
-                f"{codigo_redundante=}, {tipo_estacao=}, tamanho={len(tipo_estacao.strip())}"
-            )
-            table_rows.append(
-                EstacaoRedundante(
-                    codigo=int(row.codigo),
-                    codigo_redundante=int(codigo_redundante.strip()),
-                    tipo_estacao=tipo_estacao.split(" ")[0],
-                )
-            )
-    with Session(engine) as session:
-        session.add_all(table_rows)
-        session.commit()
+    df, malformadas = extrai_estacoes_redundantes(dataframe)
+    if not malformadas.empty:
+        print(
+            f"{len(malformadas)} redundâncias fora do padrão '<código> - <tipo>' "
+            f"foram ignoradas:\n{malformadas.to_string(index=False)}"
+        )
+
+    # Todas as estações da planilha, inclusive as que ficaram sem redundância.
+    _remove_estacoes(connection, EstacaoRedundante.__table__, dataframe.codigo)
+    df.to_sql(
+        name="estacoes_redundantes",
+        con=connection,
+        if_exists="append",
+        schema="revisao_rhnr",
+        index=False,
+    )
 
 
-def alimenta_objetivos_especificos(engine: Engine, dataframe: pd.DataFrame) -> None:
+def alimenta_objetivos_especificos(
+    connection: Connection, dataframe: pd.DataFrame
+) -> None:
     # Tabela revisao_rhnr.obj_espec_estacoes_propostas
     colunas_tabela_objs_especificos = [
         "codigo",
@@ -151,285 +210,276 @@ def alimenta_objetivos_especificos(engine: Engine, dataframe: pd.DataFrame) -> N
     ]
 
     df = dataframe[colunas_tabela_objs_especificos][~dataframe.codigo.isna()].copy()
+    _remove_estacoes(connection, ObjetivoEspecificoEstacaoProposta.__table__, df.codigo)
     df.to_sql(
         name="obj_espec_estacoes_propostas",
-        con=engine,
+        con=connection,
         if_exists="append",
         schema="revisao_rhnr",
         index=False,
     )
 
 
+@dataclass(frozen=True)
+class PerfilPlanilha:
+    """Como ler a planilha de revisão de uma região e quais tabelas ela alimenta.
+
+    `ajustes` são aplicados em ordem ao DataFrame lido e `filtro_proposta`
+    restringe apenas as linhas gravadas em estacoes_proposta_rhnr. As funções
+    precisam ser de nível de módulo para serem enviadas aos processos de leitura.
+    `tipo_mapeamento` é gravado nos objetivos específicos (coluna obrigatória) e
+    é exigido dos perfis que alimentam obj_espec_estacoes_propostas.
+    """
+
+    arquivo: str
+    colunas: dict[str, str]
+    skip_rows: int
+    tipo_mapeamento: str | None
+    sheet_name: str | None = None
+    ajustes: tuple[Callable[[pd.DataFrame], pd.DataFrame], ...] = ()
+    filtro_proposta: Callable[[pd.DataFrame], pd.Series] | None = None
+    tabelas: tuple[TabelaRevisao, ...] = (
+        "estacoes_proposta_rhnr",
+        "obj_espec_estacoes_propostas",
+    )
+
+    def __post_init__(self) -> None:
+        if "obj_espec_estacoes_propostas" in self.tabelas and not self.tipo_mapeamento:
+            raise ValueError(
+                f"{self.arquivo}: informe o tipo_mapeamento dos objetivos específicos"
+            )
+
+
+def _sem_proposta_tipo(df: pd.DataFrame) -> pd.DataFrame:
+    return df.assign(proposta_tipo=None)
+
+
+def _sem_proposta_operacao(df: pd.DataFrame) -> pd.DataFrame:
+    return df.assign(proposta_operacao=None)
+
+
+def _objetivos_2_para_1(df: pd.DataFrame) -> pd.DataFrame:
+    colunas_objs = list(COLS_OBJS_ESPECIFICOS.values())
+    return df.assign(**{col: df[col].replace({2.0: 1.0}) for col in colunas_objs})
+
+
+def _exclui_pluviometricas(df: pd.DataFrame) -> pd.Series:
+    return ~df.tipo_estacao.isin(["P", "PT", "T"]) & ~df.codigo.isna()
+
+
+PERFIS_PLANILHAS: dict[str, PerfilPlanilha] = {
+    "sao_francisco": PerfilPlanilha(
+        arquivo="Revisão rede São Francisco_sub-médio e baixo.xlsx",
+        colunas={
+            "Código": "codigo",
+            "Tipo": "tipo_estacao",
+            "Redundância\n(estações próximas)": "redundancia",
+        }
+        | COLS_OBJS_ESPECIFICOS
+        | {
+            "Operação \nda Estação": "proposta_operacao",
+            "Tipo\nSugerido": "proposta_tipo",
+            "Integrar \na RHNR": "proposta_integra_rhnr",
+            "Observações sobre a Proposta": "observacao",
+        },
+        skip_rows=3,
+        tipo_mapeamento="Manual",
+        tabelas=(
+            "estacoes_proposta_rhnr",
+            "estacoes_redundantes",
+            "obj_espec_estacoes_propostas",
+        ),
+    ),
+    "maranhao_piaui": PerfilPlanilha(
+        arquivo="Revisão rede Maranhão e Piauí_SGB_RETE.xlsx",
+        colunas={"Código": "codigo", "Tipologia atual": "tipo_estacao"}
+        | COLS_OBJS_ESPECIFICOS
+        | {
+            "Proposição": "proposta_operacao",
+            "Tipologia": "proposta_tipo",
+            "RHNR": "proposta_integra_rhnr",
+            "Análise/justificativa/observações": "observacao",
+        },
+        skip_rows=1,
+        tipo_mapeamento="Manual",
+        sheet_name="Rede atual",
+    ),
+    "ceara": PerfilPlanilha(
+        arquivo="Revisão rede Ceará_SGB_REFO.xlsx",
+        colunas={"Código": "codigo", "Tipologia Atual": "tipo_estacao"}
+        | COLS_OBJS_ESPECIFICOS
+        | {
+            "Proposição": "proposta_operacao",
+            "Tipologia Proposta": "proposta_tipo",
+            "Proposta RHNR": "proposta_integra_rhnr",
+            "Sugestão": "observacao",
+        },
+        skip_rows=1,
+        tipo_mapeamento="Manual",
+    ),
+    "rio_grande_do_sul": PerfilPlanilha(
+        arquivo="Revisão rede Rio Grande do Sul.xlsx",
+        colunas={"Estação - Código": "codigo", "Tipologia Atual": "tipo_estacao"}
+        | COLS_OBJS_ESPECIFICOS
+        | {
+            "Ação de Médio/ Longo Prazos (2026 ou após)": "proposta_operacao",
+            "Tipologia a ser mantida": "proposta_tipo",
+            "Integrar à RHNR": "proposta_integra_rhnr",
+            "Observações": "observacao",
+        },
+        skip_rows=2,
+        tipo_mapeamento="Manual",
+    ),
+    "paraiba_do_sul": PerfilPlanilha(
+        arquivo="Revisão rede Paraíba do Sul.xlsx",
+        colunas={"Código": "codigo", "Tipo": "tipo_estacao"}
+        | COLS_OBJS_ESPECIFICOS
+        | {
+            "Estação": "proposta_operacao",
+            "RHNR": "proposta_integra_rhnr",
+            "Observações": "observacao",
+        },
+        skip_rows=3,
+        tipo_mapeamento="Manual",
+        ajustes=(_sem_proposta_tipo,),
+    ),
+    "pcj_tiete_grande_paranapanema": PerfilPlanilha(
+        arquivo="Revisão rede PCJ_Tiete_Grande_Paranapanema.xlsx",
+        colunas={"Código": "codigo", "Tipo": "tipo_estacao"}
+        | COLS_OBJS_ESPECIFICOS
+        | {
+            "Estação": "proposta_operacao",
+            "RHNR": "proposta_integra_rhnr",
+            "Observações": "observacao",
+        },
+        skip_rows=3,
+        tipo_mapeamento="Manual",
+        ajustes=(_sem_proposta_tipo, _objetivos_2_para_1),
+    ),
+    # A planilha de Recife não tem colunas de objetivos específicos.
+    "rn_pb_pe_al": PerfilPlanilha(
+        arquivo="Revisão rede RN_PB_PE_AL_SGB_Recife.xlsx",
+        colunas={
+            "Código": "codigo",
+            "Tipo Atual": "tipo_estacao",
+            "Proposição": "proposta_operacao",
+            "Tipo Sugerido": "proposta_tipo",
+            "RHNR": "proposta_integra_rhnr",
+            "Operação 2022": "observacao",
+        },
+        skip_rows=1,
+        tipo_mapeamento=None,
+        sheet_name="Geral",
+        filtro_proposta=_exclui_pluviometricas,
+        tabelas=("estacoes_proposta_rhnr",),
+    ),
+    # As estações do Rio Doce já constam da proposta; só os objetivos são carregados.
+    "rio_doce": PerfilPlanilha(
+        arquivo="Revisão rede Rio Doce.xlsx",
+        colunas={
+            "Código": "codigo",
+            "Tipo": "tipo_estacao",
+            "Operação da Estação": "proposta_operacao_planilha",
+            "Tipo Sugerido": "proposta_tipo",
+            "Integrar a RHNR": "proposta_integra_rhnr",
+            "Observações": "observacao",
+        }
+        | COLS_OBJS_ESPECIFICOS,
+        skip_rows=3,
+        tipo_mapeamento="Manual",
+        sheet_name="Proposta_RHN-ANA_RioDoce",
+        ajustes=(_sem_proposta_operacao,),
+        tabelas=("obj_espec_estacoes_propostas",),
+    ),
+}
+
+
+def le_planilha_perfil(perfil: PerfilPlanilha, usa_cache: bool = True) -> pd.DataFrame:
+    df = retorna_dataframe_da_tabela_excel(
+        perfil.arquivo,
+        colunas=perfil.colunas,
+        skip_rows=perfil.skip_rows,
+        sheet_name=perfil.sheet_name,
+        usa_cache=usa_cache,
+    )
+    for ajuste in perfil.ajustes:
+        df = ajuste(df)
+    if perfil.tipo_mapeamento is not None:
+        df["tipo_mapeamento"] = perfil.tipo_mapeamento
+    return df
+
+
+def alimenta_tabelas_perfil(
+    connection: Connection, perfil: PerfilPlanilha, df: pd.DataFrame
+) -> None:
+    if "estacoes_proposta_rhnr" in perfil.tabelas:
+        df_proposta = df[perfil.filtro_proposta(df)] if perfil.filtro_proposta else df
+        alimenta_estacoes_proposta_rhnr(connection, df_proposta)
+    if "estacoes_redundantes" in perfil.tabelas:
+        alimenta_estacoes_redundantes(connection, df)
+    if "obj_espec_estacoes_propostas" in perfil.tabelas:
+        alimenta_objetivos_especificos(connection, df)
+
+
+def alimenta_tabelas_planilhas(
+    engine: Engine,
+    perfis: dict[str, PerfilPlanilha] = PERFIS_PLANILHAS,
+    max_processos: int | None = None,
+    usa_cache: bool = True,
+) -> None:
+    """Lê as planilhas em processos paralelos e grava tudo em uma única transação.
+
+    A leitura do xlsx é limitada por CPU, por isso usa processos e
+    não threads. Se alguma planilha falhar, nada é gravado. As linhas das
+    estações de cada planilha são substituídas, então a carga pode ser repetida.
+    """
+    with ProcessPoolExecutor(max_workers=max_processos) as executor:
+        dataframes = dict(
+            zip(
+                perfis,
+                executor.map(le_planilha_perfil, perfis.values(), repeat(usa_cache)),
+            )
+        )
+
+    with engine.begin() as connection:
+        for nome, perfil in perfis.items():
+            print(f"Gravando planilha {nome} ({len(dataframes[nome])} linhas)...")
+            alimenta_tabelas_perfil(connection, perfil, dataframes[nome])
+
+
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description=(
+            "Carrega as planilhas regionais da revisão nas tabelas revisao_rhnr."
+        )
+    )
+    parser.add_argument(
+        "perfis",
+        nargs="*",
+        help=f"Perfis a carregar (padrão: todos): {', '.join(PERFIS_PLANILHAS)}.",
+    )
+    parser.add_argument("--processos", type=int, default=None)
+    parser.add_argument(
+        "--sem-cache",
+        action="store_true",
+        help="Relê as planilhas mesmo que estejam no cache.",
+    )
+    parser.add_argument(
+        "--selecao-inicial",
+        action="store_true",
+        help="Carrega também a seleção inicial da RHNR (planilha de 2016).",
+    )
+    args = parser.parse_args()
+    if desconhecidos := set(args.perfis) - PERFIS_PLANILHAS.keys():
+        parser.error(f"perfis desconhecidos: {', '.join(sorted(desconhecidos))}")
+
     load_dotenv()
     engine = create_engine(os.environ["DATABASE_URL"])
-    # alimenta_estacoes_rhnr_selecao_inicial(engine)
-
-    # =================================================
-    # Colunas Tabela São Franciscio - Sub-médio e baixo
-    # =================================================
-    # colunas = {
-    #     "Código": "codigo",
-    #     "Tipo": "tipo_estacao",
-    #     "Redundância\n(estações próximas)": "redundancia",
-    #     "1a": "obj_1a",
-    #     "1b": "obj_1b",
-    #     "2a": "obj_2a",
-    #     "2b": "obj_2b",
-    #     "2c": "obj_2c",
-    #     "3a": "obj_3a",
-    #     "3b": "obj_3b",
-    #     "4a": "obj_4a",
-    #     "4b": "obj_4b",
-    #     "4c": "obj_4c",
-    #     "4d": "obj_4d",
-    #     "5a": "obj_5a",
-    #     "5b": "obj_5b",
-    #     "6a": "obj_6a",
-    #     "6b": "obj_6b",
-    #     "6c": "obj_6c",
-    #     "6d": "obj_6d",
-    #     "6e": "obj_6e",
-    #     "6f": "obj_6f",
-    #     "Operação \nda Estação": "proposta_operacao",
-    #     "Tipo\nSugerido": "proposta_tipo",
-    #     "Integrar \na RHNR": "proposta_integra_rhnr",
-    #     "Observações sobre a Proposta": "observacao",
-    # }
-    # df = retorna_dataframe_da_tabela_excel(
-    #     "Revisão rede São Francisco_sub-médio e baixo.xlsx",
-    #     colunas=colunas,
-    #     skip_rows=3
-    # )
-
-    # ==============================================
-    # Colunas Tabela Maranhão Piauí
-    # ==============================================
-    # colunas = {
-    #     "Código": "codigo",
-    #     "Tipologia atual": "tipo_estacao",
-    #     "1a": "obj_1a",
-    #     "1b": "obj_1b",
-    #     "2a": "obj_2a",
-    #     "2b": "obj_2b",
-    #     "2c": "obj_2c",
-    #     "3a": "obj_3a",
-    #     "3b": "obj_3b",
-    #     "4a": "obj_4a",
-    #     "4b": "obj_4b",
-    #     "4c": "obj_4c",
-    #     "4d": "obj_4d",
-    #     "5a": "obj_5a",
-    #     "5b": "obj_5b",
-    #     "6a": "obj_6a",
-    #     "6b": "obj_6b",
-    #     "6c": "obj_6c",
-    #     "6d": "obj_6d",
-    #     "6e": "obj_6e",
-    #     "6f": "obj_6f",
-    #     "Proposição": "proposta_operacao",
-    #     "Tipologia": "proposta_tipo",
-    #     "RHNR": "proposta_integra_rhnr",
-    #     "Análise/justificativa/observações": "observacao",
-    # }
-    # df = retorna_dataframe_da_tabela_excel(
-    #     "Revisão rede Maranhão e Piauí_SGB_RETE.xlsx",
-    #     colunas=colunas,
-    #     skip_rows=1,
-    #     sheet_name='Rede atual'
-    # )
-
-    # ==============================================
-    # Colunas Tabela Ceará
-    # ==============================================
-    # colunas = {
-    #     "Código": "codigo",
-    #     "Tipologia Atual": "tipo_estacao",
-    #     "1a": "obj_1a",
-    #     "1b": "obj_1b",
-    #     "2a": "obj_2a",
-    #     "2b": "obj_2b",
-    #     "2c": "obj_2c",
-    #     "3a": "obj_3a",
-    #     "3b": "obj_3b",
-    #     "4a": "obj_4a",
-    #     "4b": "obj_4b",
-    #     "4c": "obj_4c",
-    #     "4d": "obj_4d",
-    #     "5a": "obj_5a",
-    #     "5b": "obj_5b",
-    #     "6a": "obj_6a",
-    #     "6b": "obj_6b",
-    #     "6c": "obj_6c",
-    #     "6d": "obj_6d",
-    #     "6e": "obj_6e",
-    #     "6f": "obj_6f",
-    #     "Proposição": "proposta_operacao",
-    #     "Tipologia Proposta": "proposta_tipo",
-    #     "Proposta RHNR": "proposta_integra_rhnr",
-    #     "Sugestão": "observacao",
-    # }
-    # df = retorna_dataframe_da_tabela_excel(
-    #     "Revisão rede Ceará_SGB_REFO.xlsx",
-    #     colunas=colunas,
-    #     skip_rows=1,
-    # )
-
-    # ==============================================
-    # Colunas Tabela Rio Grande do Sul
-    # ==============================================
-    # colunas = {
-    #     "Estação - Código": "codigo",
-    #     "Tipologia Atual": "tipo_estacao",
-    #     "1a": "obj_1a",
-    #     "1b": "obj_1b",
-    #     "2a": "obj_2a",
-    #     "2b": "obj_2b",
-    #     "2c": "obj_2c",
-    #     "3a": "obj_3a",
-    #     "3b": "obj_3b",
-    #     "4a": "obj_4a",
-    #     "4b": "obj_4b",
-    #     "4c": "obj_4c",
-    #     "4d": "obj_4d",
-    #     "5a": "obj_5a",
-    #     "5b": "obj_5b",
-    #     "6a": "obj_6a",
-    #     "6b": "obj_6b",
-    #     "6c": "obj_6c",
-    #     "6d": "obj_6d",
-    #     "6e": "obj_6e",
-    #     "6f": "obj_6f",
-    #     "Ação de Médio/ Longo Prazos (2026 ou após)": "proposta_operacao",
-    #     "Tipologia a ser mantida": "proposta_tipo",
-    #     "Integrar à RHNR": "proposta_integra_rhnr",
-    #     "Observações": "observacao",
-    # }
-    # df = retorna_dataframe_da_tabela_excel(
-    #     "Revisão rede Rio Grande do Sul.xlsx",
-    #     colunas=colunas,
-    #     skip_rows=2,
-    # )
-
-    # ==============================================
-    # Colunas Tabela Paraíba do Sul
-    # ==============================================
-    # colunas = {
-    #     "Código": "codigo",
-    #     "Tipo": "tipo_estacao",
-    #     "1a": "obj_1a",
-    #     "1b": "obj_1b",
-    #     "2a": "obj_2a",
-    #     "2b": "obj_2b",
-    #     "2c": "obj_2c",
-    #     "3a": "obj_3a",
-    #     "3b": "obj_3b",
-    #     "4a": "obj_4a",
-    #     "4b": "obj_4b",
-    #     "4c": "obj_4c",
-    #     "4d": "obj_4d",
-    #     "5a": "obj_5a",
-    #     "5b": "obj_5b",
-    #     "6a": "obj_6a",
-    #     "6b": "obj_6b",
-    #     "6c": "obj_6c",
-    #     "6d": "obj_6d",
-    #     "6e": "obj_6e",
-    #     "6f": "obj_6f",
-    #     "Estação": "proposta_operacao",
-    #     # "Tipologia a ser mantida": "proposta_tipo",
-    #     "RHNR": "proposta_integra_rhnr",
-    #     "Observações": "observacao",
-    # }
-    # df = retorna_dataframe_da_tabela_excel(
-    #     "Revisão rede Paraíba do Sul.xlsx",
-    #     colunas=colunas,
-    #     skip_rows=3,
-    # )
-    # df['proposta_tipo'] = None
-
-    # ==============================================
-    # Colunas Tabela PCJ/Tietê/Grande/Paranapanema
-    # ================================================
-    # colunas = {
-    #     "Código": "codigo",
-    #     "Tipo": "tipo_estacao",
-    #     "1a": "obj_1a",
-    #     "1b": "obj_1b",
-    #     "2a": "obj_2a",
-    #     "2b": "obj_2b",
-    #     "2c": "obj_2c",
-    #     "3a": "obj_3a",
-    #     "3b": "obj_3b",
-    #     "4a": "obj_4a",
-    #     "4b": "obj_4b",
-    #     "4c": "obj_4c",
-    #     "4d": "obj_4d",
-    #     "5a": "obj_5a",
-    #     "5b": "obj_5b",
-    #     "6a": "obj_6a",
-    #     "6b": "obj_6b",
-    #     "6c": "obj_6c",
-    #     "6d": "obj_6d",
-    #     "6e": "obj_6e",
-    #     "6f": "obj_6f",
-    #     "Estação": "proposta_operacao",
-    #     # "Tipologia a ser mantida": "proposta_tipo",
-    #     "RHNR": "proposta_integra_rhnr",
-    #     "Observações": "observacao",
-    # }
-    # df = retorna_dataframe_da_tabela_excel(
-    #     "Revisão rede PCJ_Tiete_Grande_Paranapanema.xlsx",
-    #     colunas=colunas,
-    #     skip_rows=3,
-    # )
-    # df['proposta_tipo'] = None
-    # objs_cols = [col for col in df.columns if 'obj' in col]
-    # for col in  objs_cols:
-    #     df[col] = df[col].replace({2.0: 1.0})
-
-    # ==============================================
-    # Colunas Tabela RN / PB / PE / AL
-    # ==============================================
-    # colunas = {
-    #     "Código": "codigo",
-    #     "Tipo Atual": "tipo_estacao",
-    #     "Proposição": "proposta_operacao",
-    #     "Tipo Sugerido": "proposta_tipo",
-    #     "RHNR": "proposta_integra_rhnr",
-    #     "Operação 2022": "observacao",
-    # }
-    # df = retorna_dataframe_da_tabela_excel(
-    #     "Revisão rede RN_PB_PE_AL_SGB_Recife.xlsx",
-    #     colunas=colunas,
-    #     skip_rows=1,
-    #     sheet_name="Geral",
-    # )
-    # df_filter = df[(~df.tipo_estacao.isin(['P', 'PT', 'T'])) & (~df.codigo.isna())]
-
-    # alimenta_estacoes_proposta_rhnr(engine, df_filter)
-    # alimenta_estacoes_redundantes(engine, df)
-    # alimenta_objetivos_especificos(engine, df)
-
-    # ==============================================
-    # Colunas Tabela Bacia do Rio Doce
-    # ==============================================
-    # colunas = {
-    #     "Código": "codigo",
-    #     "Tipo": "tipo_estacao",
-    #     "Operação da Estação": "proposta_operacao_planilha",
-    #     "Tipo Sugerido": "proposta_tipo",
-    #     "Integrar a RHNR": "proposta_integra_rhnr",
-    #     "Observações": "observacao",
-    # } | colunas_obs_especificos
-
-    # df = retorna_dataframe_da_tabela_excel(
-    #     "Revisão rede Rio Doce.xlsx",
-    #     colunas=colunas,
-    #     skip_rows=3,
-    #     sheet_name="Proposta_RHN-ANA_RioDoce",
-    # )
-    # df["proposta_operacao"] = None
-    # df["tipo_mapeamento"] = "Manual"
-    # # alimenta_estacoes_proposta_rhnr(engine, df)
-    # alimenta_objetivos_especificos(engine, df)
+    if args.selecao_inicial:
+        alimenta_estacoes_rhnr_selecao_inicial(engine)
+    alimenta_tabelas_planilhas(
+        engine,
+        {nome: PERFIS_PLANILHAS[nome] for nome in args.perfis or PERFIS_PLANILHAS},
+        max_processos=args.processos,
+        usa_cache=not args.sem_cache,
+    )
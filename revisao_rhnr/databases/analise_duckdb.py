@@ -0,0 +1,79 @@
+"""Consultas analíticas com DuckDB sobre o snapshot Parquet (ver `snapshot_parquet`).
+
+Cada dataset do snapshot vira uma view com o mesmo nome. O DuckDB lê os arquivos
+por memória mapeada, só carrega as colunas usadas na consulta e aproveita a
+partição por bacia em filtros sobre `Bacia`. O banco SQLite do app não é tocado.
+
+Exemplo:
+    consulta_snapshot(
+        'SELECT "Bacia", count(*) AS estacoes FROM painel_revisao_rhnr '
+        'WHERE "Integra RHNR?" GROUP BY ALL'
+    )
+"""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import pandas as pd
+
+from revisao_rhnr.databases.snapshot_parquet import DIRETORIO_SNAPSHOT
+
+if TYPE_CHECKING:
+    import duckdb
+
+
+def conecta_snapshot(
+    diretorio: Path = DIRETORIO_SNAPSHOT,
+) -> "duckdb.DuckDBPyConnection":
+    try:
+        import duckdb
+    except ImportError as erro:
+        raise ImportError(
+            "O modo de análise requer o pacote duckdb (pip install duckdb)."
+        ) from erro
+
+    if not diretorio.is_dir():
+        raise FileNotFoundError(
+            f"Snapshot não encontrado em {diretorio}: "
+            "execute `python -m revisao_rhnr.databases.snapshot_parquet`."
+        )
+
+    connection = duckdb.connect()
+    for dataset in sorted(
+        caminho for caminho in diretorio.iterdir() if caminho.is_dir()
+    ):
+        arquivos = (dataset / "**" / "*.parquet").as_posix().replace("'", "''")
+        connection.execute(
+            f'CREATE VIEW "{dataset.name}" AS SELECT * '
+            f"FROM read_parquet('{arquivos}', hive_partitioning = true)"
+        )
+    return connection
+
+
+def consulta_snapshot(
+    sql: str,
+    parametros: list[Any] | dict[str, Any] | None = None,
+    diretorio: Path = DIRETORIO_SNAPSHOT,
+) -> pd.DataFrame:
+    with conecta_snapshot(diretorio) as connection:
+        return connection.execute(sql, parametros).df()
+
+
+def resumo_por_bacia(diretorio: Path = DIRETORIO_SNAPSHOT) -> pd.DataFrame:
+    """Totais da tabela de revisão por bacia."""
+    return consulta_snapshot(
+        """
+        SELECT
+            "Bacia",
+            count(*) AS "Estações",
+            count(*) FILTER (WHERE "Operando" = 1) AS "Operando",
+            count(*) FILTER (WHERE "RHNR Inicial?") AS "RHNR Inicial",
+            count(*) FILTER (WHERE "RHNR Implementada") AS "RHNR Implementada",
+            count(*) FILTER (WHERE "Integra RHNR?") AS "Integra RHNR",
+            count(*) FILTER (WHERE "Tipologia Divergente?") AS "Tipologia Divergente"
+        FROM painel_revisao_rhnr
+        GROUP BY "Bacia"
+        ORDER BY "Bacia"
+        """,
+        diretorio=diretorio,
+    )
@@ -1,19 +1,48 @@
-from typing import Any, Literal, cast
+import operator
+from functools import reduce
+from pathlib import Path
+from typing import Any, Iterable, Literal, NamedTuple, cast
 
-from sqlalchemy import Engine, select
+import numpy as np
+import pandas as pd
+from sqlalchemy import (
+    ColumnElement,
+    Connection,
+    Engine,
+    Result,
+    Select,
+    String,
+    bindparam,
+    case,
+    column,
+    func,
+    select,
+    table,
+)
 from sqlalchemy.orm import Session
 
+from revisao_rhnr.databases.alimentacao_tabelas_bd_bases_cplar.constantes import (
+    COLS_OBJS_ESPECIFICOS,
+)
 from revisao_rhnr.databases.models_sqlite import (
     Bacia,
+    Base,
     Entidade,
     EstacaoFlu,
     EstacaoPropostaRHNR,
+    EstacaoRedundante,
     EstacaoRHNRSelecaoInicial,
     ObjetivoEspecificoEstacaoProposta,
     Operadora,
+    PainelRevisaoRHNR,
     Responsavel,
     TipoEstacaoFlu,
 )
+from revisao_rhnr.databases.objetivos_especificos import (
+    CONSULTA_CONTAGEM_OBJETIVOS_POR_BACIA,
+    ModoCobertura,
+    consulta_estacoes_por_objetivos,
+)
 
 type ColunaRHNRInicial = Literal[
     "Código",
@@ -23,6 +52,7 @@ type ColunaRHNRInicial = Literal[
     "Bacia",
     "Operando",
     "Descrição",
+    "RHNR Implementada",
     "Objetivo 1",
     "Objetivo 2",
     "Objetivo 3",
@@ -33,7 +63,14 @@ type ColunaRHNRInicial = Literal[
 
 
 type ColunaEstacaoValidadaRHNR = Literal[
-    "Código", "Nome", "Responsável", "Operadora", "Bacia", "Operando", "Descrição"
+    "Código",
+    "Nome",
+    "Responsável",
+    "Operadora",
+    "Bacia",
+    "Operando",
+    "Descrição",
+    "RHNR Implementada",
 ]
 
 
@@ -45,6 +82,7 @@ type ColunaRHNRProposta = Literal[
     "Bacia",
     "Operando",
     "Descrição",
+    "RHNR Implementada",
     "Tipologia Atual",
     "RHNR Inicial?",
     "Ação Proposta",
@@ -54,202 +92,282 @@ type ColunaRHNRProposta = Literal[
 ]
 
 
-def retorna_estacoes_flu_por_codigos(
-    engine: Engine,
-    codigos: list[int],
-) -> list[dict[ColunaRHNRInicial, Any]]:
-    query_responsavel = (
-        select(Responsavel.codigo_estacao, Entidade.sigla)
-        .where(Responsavel.responsavel_codigo == Entidade.codigo)
-        .subquery()
+type ColunaTabelaRHNRProposta = Literal[
+    "Código da Estação",
+    "Nome",
+    "Responsável",
+    "Operadora",
+    "Bacia",
+    "Operando",
+    "Tipologia Atual",
+    "Tipologia Mapeada",
+    "Tipologia Divergente?",
+    "RHNR Inicial?",
+    "RHNR Implementada",
+    "Ação Proposta",
+    "Tipologia Proposta",
+    "Integra RHNR?",
+    "Objs. Específicos",
+    "Grupo Redundância",
+]
+
+COLUNAS_PAINEL_REVISAO_RHNR: dict[ColunaTabelaRHNRProposta, str] = {
+    "Código da Estação": "codigo",
+    "Nome": "nome",
+    "Responsável": "responsavel",
+    "Operadora": "operadora",
+    "Bacia": "bacia",
+    "Operando": "operando",
+    "Tipologia Atual": "tipologia_atual",
+    "Tipologia Mapeada": "tipologia_mapeada",
+    "Tipologia Divergente?": "tipologia_divergente",
+    "RHNR Inicial?": "rhnr_inicial",
+    "RHNR Implementada": "rhnr_implementada",
+    "Ação Proposta": "acao_proposta",
+    "Tipologia Proposta": "tipologia_proposta",
+    "Integra RHNR?": "integra_rhnr",
+    "Objs. Específicos": "objs_especificos",
+    "Grupo Redundância": "grupo_redundancia",
+}
+
+# Dtypes das colunas da tabela de revisão, aplicados uma única vez na leitura do
+# banco: textos de baixa cardinalidade como categorias, flags com os tipos
+# anuláveis do pandas e o código da estação como int32. As demais colunas
+# seguem o tipo da consulta (ver `_dtype_da_coluna`).
+ESQUEMA_TABELA_RHNR_PROPOSTA: dict[ColunaTabelaRHNRProposta, str] = {
+    "Código da Estação": "int32",
+    "Nome": "object",
+    "Responsável": "category",
+    "Operadora": "category",
+    "Bacia": "category",
+    "Operando": "Int8",
+    "Tipologia Atual": "category",
+    "Tipologia Mapeada": "category",
+    "Tipologia Divergente?": "boolean",
+    "RHNR Inicial?": "boolean",
+    "RHNR Implementada": "boolean",
+    "Ação Proposta": "category",
+    "Tipologia Proposta": "category",
+    "Integra RHNR?": "boolean",
+    "Objs. Específicos": "string",
+    "Grupo Redundância": "Int32",
+}
+
+
+# Subconsultas e consulta base compartilhadas por todos os relatórios de estações.
+# São construídas uma única vez na importação do módulo: como os objetos de
+# consulta são imutáveis, a chave de cache do SQLAlchemy fica memorizada neles e
+# a compilação do SQL é reaproveitada pelo cache de compilação de cada engine.
+_query_responsavel = (
+    select(Responsavel.codigo_estacao, Entidade.sigla)
+    .where(Responsavel.responsavel_codigo == Entidade.codigo)
+    .subquery("query_responsavel")
+)
+
+_query_operadora = (
+    select(Operadora.codigo_estacao, Entidade.sigla)
+    .where(Operadora.operadora_codigo == Entidade.codigo)
+    .subquery("query_operadora")
+)
+
+_consulta_base_estacoes = (
+    select(
+        EstacaoFlu.codigo.label("Código da Estação"),
+        EstacaoFlu.nome.label("Nome"),
+        _query_responsavel.c.sigla.label("Responsável"),
+        _query_operadora.c.sigla.label("Operadora"),
+        Bacia.nome.label("Bacia"),
+        EstacaoFlu.operando.label("Operando"),
+        EstacaoFlu.descricao.label("Descrição"),
+        EstacaoFlu.rhnr_implementada.label("RHNR Implementada"),
+    )
+    .join(
+        target=Bacia,
+        onclause=EstacaoFlu.bacia_codigo == Bacia.codigo,
+    )
+    .join(
+        target=_query_responsavel,
+        onclause=EstacaoFlu.codigo == _query_responsavel.c.codigo_estacao,
+        isouter=True,
+    )
+    .join(
+        target=_query_operadora,
+        onclause=EstacaoFlu.codigo == _query_operadora.c.codigo_estacao,
+        isouter=True,
     )
+)
+
+CONSULTA_ESTACOES_FLU_POR_CODIGOS = _consulta_base_estacoes.where(
+    EstacaoFlu.codigo.in_(bindparam("codigos", expanding=True))
+)
+
+CONSULTA_ESTACOES_RHNR_SELECAO_INICIAL = _consulta_base_estacoes.add_columns(
+    EstacaoRHNRSelecaoInicial.objetivo1.label("Objetivo 1"),
+    EstacaoRHNRSelecaoInicial.objetivo2.label("Objetivo 2"),
+    EstacaoRHNRSelecaoInicial.objetivo3.label("Objetivo 3"),
+    EstacaoRHNRSelecaoInicial.objetivo4.label("Objetivo 4"),
+    EstacaoRHNRSelecaoInicial.objetivo5.label("Objetivo 5"),
+    EstacaoRHNRSelecaoInicial.objetivo6.label("Objetivo 6"),
+).join(
+    target=EstacaoRHNRSelecaoInicial,
+    onclause=EstacaoFlu.codigo == EstacaoRHNRSelecaoInicial.codigo,
+)
 
-    query_operadora = (
-        select(Operadora.codigo_estacao, Entidade.sigla)
-        .where(Operadora.operadora_codigo == Entidade.codigo)
-        .subquery()
+CONSULTA_ESTACOES_VALIDADAS_RHNR = _consulta_base_estacoes.where(
+    EstacaoFlu.rhnr_implementada
+)
+
+CONSULTA_ESTACOES_RHNR_PROPOSTA = _consulta_base_estacoes.add_columns(
+    EstacaoPropostaRHNR.tipo_estacao.label("Tipologia Atual"),
+    EstacaoPropostaRHNR.proposta_tipo.label("Tipologia Proposta"),
+    EstacaoPropostaRHNR.proposta_integra_rhnr.label("Integra RHNR?"),
+    EstacaoPropostaRHNR.proposta_operacao.label("Ação Proposta"),
+).join(
+    target=EstacaoPropostaRHNR,
+    onclause=EstacaoFlu.codigo == EstacaoPropostaRHNR.codigo,
+)
+
+# Sigla da tipologia ("FDSQT") e lista de objetivos específicos ("1a, 2b")
+# montadas pelo próprio banco, sem percorrer as estações em Python.
+CONSULTA_TIPOLOGIA_ESTACOES = select(
+    TipoEstacaoFlu.codigo_estacao.label("Código da Estação"),
+    (
+        case((TipoEstacaoFlu.escala, "F"), else_="")
+        + case((TipoEstacaoFlu.descarga_liquida, "D"), else_="")
+        + case((TipoEstacaoFlu.sedimentos, "S"), else_="")
+        + case((TipoEstacaoFlu.qualidade_agua, "Q"), else_="")
+        + case((TipoEstacaoFlu.telemetrica, "T"), else_="")
+    ).label("Tipologia Mapeada"),
+)
+
+CONSULTA_OBJETIVOS_ESPECIFICOS = select(
+    ObjetivoEspecificoEstacaoProposta.codigo.label("Código da Estação"),
+    func.rtrim(
+        reduce(
+            operator.add,
+            (
+                case(
+                    (
+                        ObjetivoEspecificoEstacaoProposta.__table__.c[coluna] != 0,
+                        f"{nome}, ",
+                    ),
+                    else_="",
+                )
+                for nome, coluna in COLS_OBJS_ESPECIFICOS.items()
+            ),
+        ),
+        ", ",
+        type_=String,
+    ).label("Objs. Específicos"),
+)
+
+CONSULTA_ESTACOES_REDUNDANTES = select(
+    EstacaoRedundante.codigo.label("Código da Estação"),
+    EstacaoRedundante.codigo_redundante.label("Código Redundante"),
+    EstacaoRedundante.tipo_estacao.label("Tipo da Estação Redundante"),
+)
+
+CONSULTA_PAINEL_REVISAO_RHNR = select(
+    *(
+        PainelRevisaoRHNR.__table__.c[nome_coluna].label(coluna)
+        for coluna, nome_coluna in COLUNAS_PAINEL_REVISAO_RHNR.items()
     )
+).order_by(PainelRevisaoRHNR.codigo)
 
-    with Session(engine) as session:
-        response = session.execute(
-            select(
-                EstacaoFlu.codigo.label("Código da Estação"),
-                EstacaoFlu.nome.label("Nome"),
-                query_responsavel.c.sigla.label("Responsável"),
-                query_operadora.c.sigla.label("Operadora"),
-                Bacia.nome.label("Bacia"),
-                EstacaoFlu.operando.label("Operando"),
-                EstacaoFlu.descricao.label("Descrição"),
-            )
-            .join(
-                target=Bacia,
-                onclause=EstacaoFlu.bacia_codigo == Bacia.codigo,
-            )
-            .join(
-                target=EstacaoRHNRSelecaoInicial,
-                onclause=EstacaoFlu.codigo == EstacaoRHNRSelecaoInicial.codigo,
-                isouter=True,
-            )
-            .join(
-                target=query_responsavel,
-                onclause=EstacaoFlu.codigo == query_responsavel.c.codigo_estacao,
-                isouter=True,
-            )
-            .join(
-                target=query_operadora,
-                onclause=EstacaoFlu.codigo == query_operadora.c.codigo_estacao,
-                isouter=True,
-            )
-            .where(EstacaoFlu.codigo.in_(codigos))
-        )
 
+def _executa_consulta(
+    engine: Engine, consulta: Select, parametros: dict[str, Any] | None = None
+) -> list[dict[str, Any]]:
+    with Session(engine) as session:
+        response = session.execute(consulta, parametros)
         result = [row._asdict() for row in response]
-    return cast(list[dict[ColunaRHNRInicial, Any]], result)
+    return result
 
 
-def retorna_estacoes_rhnr_selecao_inicial(
+def _dtype_da_coluna(coluna: ColumnElement) -> str | None:
+    try:
+        tipo_python = coluna.type.python_type
+    except NotImplementedError:
+        return None
+    if issubclass(tipo_python, bool):
+        return "boolean"
+    if issubclass(tipo_python, int):
+        return "Int64"
+    if issubclass(tipo_python, float):
+        return "Float64"
+    return None
+
+
+def categorias_de_texto(valores: Iterable[Any]) -> pd.Categorical:
+    """Coluna categórica de texto, mesmo quando todos os valores são nulos.
+
+    Sem nenhum valor o pandas deduz categorias float64, e a coluna seria
+    exportada como número (DOUBLE no Parquet e no DuckDB).
+    """
+    categorias = pd.Categorical(valores)
+    if len(categorias.categories):
+        return categorias
+    return pd.Categorical(valores, categories=pd.Index([], dtype="string"))
+
+
+def _resultado_para_dataframe(result: Result, consulta: Select) -> pd.DataFrame:
+    """Monta o DataFrame coluna a coluna a partir das tuplas do cursor.
+
+    As colunas da tabela de revisão recebem o dtype de
+    ESQUEMA_TABELA_RHNR_PROPOSTA; nas demais o tipo vem da própria consulta:
+    inteiros e booleanos usam os dtypes anuláveis do pandas e os demais campos
+    ficam como `object`.
+    """
+    nomes = list(result.keys())
+    linhas = result.all()
+    colunas = list(zip(*linhas)) if linhas else [()] * len(nomes)
+    dados = {}
+    for nome, coluna, valores in zip(nomes, consulta.selected_columns, colunas):
+        dtype = ESQUEMA_TABELA_RHNR_PROPOSTA.get(nome) or _dtype_da_coluna(coluna)
+        if dtype in (None, "object"):
+            dados[nome] = np.array(valores, dtype=object)
+        elif dtype == "category":
+            dados[nome] = categorias_de_texto(valores)
+        else:
+            dados[nome] = pd.array(valores, dtype=dtype)
+    return pd.DataFrame(dados, columns=nomes)
+
+
+def retorna_dataframe(
+    engine: Engine, consulta: Select, parametros: dict[str, Any] | None = None
+) -> pd.DataFrame:
+    """Executa a consulta e retorna o resultado em formato colunar."""
+    with engine.connect() as connection:
+        result = connection.execute(consulta, parametros)
+        return _resultado_para_dataframe(result, consulta)
+
+
+def retorna_estacoes_flu_por_codigos(
     engine: Engine,
+    codigos: list[int],
 ) -> list[dict[ColunaRHNRInicial, Any]]:
-    query_responsavel = (
-        select(Responsavel.codigo_estacao, Entidade.sigla)
-        .where(Responsavel.responsavel_codigo == Entidade.codigo)
-        .subquery()
-    )
-
-    query_operadora = (
-        select(Operadora.codigo_estacao, Entidade.sigla)
-        .where(Operadora.operadora_codigo == Entidade.codigo)
-        .subquery()
+    result = _executa_consulta(
+        engine, CONSULTA_ESTACOES_FLU_POR_CODIGOS, {"codigos": codigos}
     )
+    return cast(list[dict[ColunaRHNRInicial, Any]], result)
 
-    with Session(engine) as session:
-        response = session.execute(
-            select(
-                EstacaoFlu.codigo.label("Código da Estação"),
-                EstacaoFlu.nome.label("Nome"),
-                query_responsavel.c.sigla.label("Responsável"),
-                query_operadora.c.sigla.label("Operadora"),
-                Bacia.nome.label("Bacia"),
-                EstacaoFlu.operando.label("Operando"),
-                EstacaoFlu.descricao.label("Descrição"),
-                EstacaoRHNRSelecaoInicial.objetivo1.label("Objetivo 1"),
-                EstacaoRHNRSelecaoInicial.objetivo2.label("Objetivo 2"),
-                EstacaoRHNRSelecaoInicial.objetivo3.label("Objetivo 3"),
-                EstacaoRHNRSelecaoInicial.objetivo4.label("Objetivo 4"),
-                EstacaoRHNRSelecaoInicial.objetivo5.label("Objetivo 5"),
-                EstacaoRHNRSelecaoInicial.objetivo6.label("Objetivo 6"),
-            )
-            .where(
-                EstacaoFlu.codigo == EstacaoRHNRSelecaoInicial.codigo,
-                EstacaoFlu.bacia_codigo == Bacia.codigo,
-            )
-            .join(
-                target=query_responsavel,
-                onclause=EstacaoFlu.codigo == query_responsavel.c.codigo_estacao,
-                isouter=True,
-            )
-            .join(
-                target=query_operadora,
-                onclause=EstacaoFlu.codigo == query_operadora.c.codigo_estacao,
-                isouter=True,
-            )
-        )
 
-        result = [row._asdict() for row in response]
+def retorna_estacoes_rhnr_selecao_inicial(
+    engine: Engine,
+) -> list[dict[ColunaRHNRInicial, Any]]:
+    result = _executa_consulta(engine, CONSULTA_ESTACOES_RHNR_SELECAO_INICIAL)
     return cast(list[dict[ColunaRHNRInicial, Any]], result)
 
 
 def retorna_estacoes_validadas_rhnr(
     engine: Engine,
 ) -> list[dict[ColunaEstacaoValidadaRHNR, Any]]:
-    query_responsavel = (
-        select(Responsavel.codigo_estacao, Entidade.sigla)
-        .where(Responsavel.responsavel_codigo == Entidade.codigo)
-        .subquery()
-    )
-
-    query_operadora = (
-        select(Operadora.codigo_estacao, Entidade.sigla)
-        .where(Operadora.operadora_codigo == Entidade.codigo)
-        .subquery()
-    )
-
-    with Session(engine) as session:
-        response = session.execute(
-            select(
-                EstacaoFlu.codigo.label("Código da Estação"),
-                EstacaoFlu.nome.label("Nome"),
-                query_responsavel.c.sigla.label("Responsável"),
-                query_operadora.c.sigla.label("Operadora"),
-                Bacia.nome.label("Bacia"),
-                EstacaoFlu.operando.label("Operando"),
-                EstacaoFlu.descricao.label("Descrição"),
-            )
-            .join(
-                Bacia,
-                EstacaoFlu.bacia_codigo == Bacia.codigo,
-            )
-            .join(
-                target=query_responsavel,
-                onclause=EstacaoFlu.codigo == query_responsavel.c.codigo_estacao,
-                isouter=True,
-            )
-            .join(
-                target=query_operadora,
-                onclause=EstacaoFlu.codigo == query_operadora.c.codigo_estacao,
-                isouter=True,
-            )
-            .where(EstacaoFlu.descricao.like("%RHNR%"))
-        )
-
-        result = [row._asdict() for row in response]
+    result = _executa_consulta(engine, CONSULTA_ESTACOES_VALIDADAS_RHNR)
     return cast(list[dict[ColunaEstacaoValidadaRHNR, Any]], result)
 
 
 def retorna_estacoes_rhnr_proposta(engine) -> list[dict[ColunaRHNRProposta, Any]]:
-    query_responsavel = (
-        select(Responsavel.codigo_estacao, Entidade.sigla)
-        .where(Responsavel.responsavel_codigo == Entidade.codigo)
-        .subquery()
-    )
-
-    query_operadora = (
-        select(Operadora.codigo_estacao, Entidade.sigla)
-        .where(Operadora.operadora_codigo == Entidade.codigo)
-        .subquery()
-    )
-
-    with Session(engine) as session:
-        response = session.execute(
-            select(
-                EstacaoPropostaRHNR.codigo.label("Código da Estação"),
-                EstacaoFlu.nome.label("Nome"),
-                query_responsavel.c.sigla.label("Responsável"),
-                query_operadora.c.sigla.label("Operadora"),
-                Bacia.nome.label("Bacia"),
-                EstacaoFlu.operando.label("Operando"),
-                EstacaoFlu.descricao.label("Descrição"),
-                EstacaoPropostaRHNR.tipo_estacao.label("Tipologia Atual"),
-                EstacaoPropostaRHNR.proposta_tipo.label("Tipologia Proposta"),
-                EstacaoPropostaRHNR.proposta_integra_rhnr.label("Integra RHNR?"),
-                EstacaoPropostaRHNR.proposta_operacao.label("Ação Proposta"),
-            )
-            .where(
-                EstacaoFlu.codigo == EstacaoPropostaRHNR.codigo,
-                EstacaoFlu.bacia_codigo == Bacia.codigo,
-            )
-            .join(
-                target=query_responsavel,
-                onclause=EstacaoFlu.codigo == query_responsavel.c.codigo_estacao,
-                isouter=True,
-            )
-            .join(
-                target=query_operadora,
-                onclause=EstacaoFlu.codigo == query_operadora.c.codigo_estacao,
-                isouter=True,
-            )
-        )
-        result = [row._asdict() for row in response]
+    result = _executa_consulta(engine, CONSULTA_ESTACOES_RHNR_PROPOSTA)
     return cast(list[dict[ColunaRHNRProposta, Any]], result)
 
 
@@ -261,27 +379,148 @@ def retorna_objetivos_especificos(engine: Engine) -> list[dict[str, int]]:
     return [row.to_dict() for row in response]
 
 
+def retorna_estacoes_por_objetivos(
+    engine: Engine, objetivos: Iterable[str], modo: ModoCobertura = "algum"
+) -> pd.DataFrame:
+    """Estações propostas que cobrem algum (ou todos) os objetivos informados."""
+    return retorna_dataframe(engine, consulta_estacoes_por_objetivos(objetivos, modo))
+
+
+def retorna_contagem_objetivos_por_bacia(engine: Engine) -> pd.DataFrame:
+    """Número de estações propostas que cobrem cada objetivo específico, por bacia."""
+    return retorna_dataframe(engine, CONSULTA_CONTAGEM_OBJETIVOS_POR_BACIA)
+
+
 def retorna_tipologia_da_estacao(engine: Engine) -> list[dict]:
-    with Session(engine) as session:
-        response = session.execute(select(TipoEstacaoFlu)).scalars().all()
-
-        rows: list[dict] = []
-        for estacao in response:
-            sigla_tipologia = []
-            if estacao.escala:
-                sigla_tipologia.append("F")
-            if estacao.descarga_liquida:
-                sigla_tipologia.append("D")
-            if estacao.sedimentos:
-                sigla_tipologia.append("S")
-            if estacao.qualidade_agua:
-                sigla_tipologia.append("Q")
-            if estacao.telemetrica:
-                sigla_tipologia.append("T")
-            rows.append(
-                {
-                    "Código da Estação": estacao.codigo_estacao,
-                    "Tipologia Mapeada": "".join(sigla_tipologia),
-                }
+    return _executa_consulta(engine, CONSULTA_TIPOLOGIA_ESTACOES)
+
+
+class SnapshotDadosApp(NamedTuple):
+    tipologia: pd.DataFrame
+    selecao_inicial: pd.DataFrame
+    validadas: pd.DataFrame
+    proposta: pd.DataFrame
+    objetivos_especificos: pd.DataFrame
+    redundancias: pd.DataFrame
+
+
+type ConjuntoDadosApp = Literal[
+    "tipologia",
+    "selecao_inicial",
+    "validadas",
+    "proposta",
+    "objetivos_especificos",
+    "redundancias",
+]
+
+CONSULTAS_DADOS_APP: dict[ConjuntoDadosApp, Select] = {
+    "tipologia": CONSULTA_TIPOLOGIA_ESTACOES,
+    "selecao_inicial": CONSULTA_ESTACOES_RHNR_SELECAO_INICIAL,
+    "validadas": CONSULTA_ESTACOES_VALIDADAS_RHNR,
+    "proposta": CONSULTA_ESTACOES_RHNR_PROPOSTA,
+    "objetivos_especificos": CONSULTA_OBJETIVOS_ESPECIFICOS,
+    "redundancias": CONSULTA_ESTACOES_REDUNDANTES,
+}
+
+
+def _inicia_transacao_leitura(connection: Connection) -> None:
+    """Garante que todas as consultas da conexão leiam o mesmo estado do banco."""
+    if connection.dialect.name == "sqlite":
+        # O pysqlite não abre transação para SELECT: sem o BEGIN explícito cada
+        # consulta veria o arquivo como estiver no momento em que é executada.
+        connection.exec_driver_sql("BEGIN")
+    elif connection.dialect.name == "postgresql":
+        connection.execution_options(
+            isolation_level="REPEATABLE READ", postgresql_readonly=True
+        )
+
+
+def retorna_dados_app(
+    engine: Engine, conjuntos: Iterable[ConjuntoDadosApp]
+) -> dict[ConjuntoDadosApp, pd.DataFrame]:
+    """Lê apenas os conjuntos de dados pedidos, em uma única conexão e transação."""
+    with engine.connect() as connection:
+        _inicia_transacao_leitura(connection)
+        return {
+            conjunto: _resultado_para_dataframe(
+                connection.execute(CONSULTAS_DADOS_APP[conjunto]),
+                CONSULTAS_DADOS_APP[conjunto],
+            )
+            for conjunto in conjuntos
+        }
+
+
+def retorna_snapshot_dados_app(engine: Engine) -> SnapshotDadosApp:
+    """Lê todos os conjuntos de dados do app em uma única conexão e transação."""
+    conjuntos = cast(tuple[ConjuntoDadosApp, ...], SnapshotDadosApp._fields)
+    return SnapshotDadosApp(**retorna_dados_app(engine, conjuntos))
+
+
+# Tabelas lidas pelo app: qualquer carga nelas muda a versão dos dados.
+_TABELAS_VERSAO_DADOS = (
+    EstacaoPropostaRHNR,
+    EstacaoRedundante,
+    EstacaoRHNRSelecaoInicial,
+    ObjetivoEspecificoEstacaoProposta,
+    PainelRevisaoRHNR,
+    TipoEstacaoFlu,
+)
+
+CONSULTA_VERSAO_DADOS = select(
+    select(func.count()).select_from(EstacaoFlu).scalar_subquery(),
+    select(func.max(EstacaoFlu.ultima_atualizacao)).scalar_subquery(),
+    *(
+        select(func.count()).select_from(tabela).scalar_subquery()
+        for tabela in _TABELAS_VERSAO_DADOS
+    ),
+)
+
+
+# Contadores de escrita que o PostgreSQL mantém por tabela: somam toda linha
+# inserida, atualizada (inclusive pelos upserts) ou removida.
+_estatisticas_tabelas_postgres = table(
+    "pg_stat_user_tables",
+    column("relname"),
+    column("n_tup_ins"),
+    column("n_tup_upd"),
+    column("n_tup_del"),
+)
+
+CONSULTA_VERSAO_DADOS_POSTGRES = (
+    select(
+        _estatisticas_tabelas_postgres.c.relname,
+        _estatisticas_tabelas_postgres.c.n_tup_ins
+        + _estatisticas_tabelas_postgres.c.n_tup_upd
+        + _estatisticas_tabelas_postgres.c.n_tup_del,
+    )
+    .where(_estatisticas_tabelas_postgres.c.relname.in_(list(Base.metadata.tables)))
+    .order_by(_estatisticas_tabelas_postgres.c.relname)
+)
+
+
+def retorna_versao_dados(engine: Engine) -> str:
+    """Token barato que muda sempre que os dados do banco mudam.
+
+    Para o SQLite em arquivo basta o `stat` do banco (e do WAL, se houver). No
+    PostgreSQL usa os contadores de escrita de `pg_stat_user_tables` das tabelas
+    do app, que mudam a cada INSERT, UPDATE ou DELETE (com alguns segundos de
+    atraso, até o servidor publicar as estatísticas). Nos demais bancos usa a
+    contagem de linhas das tabelas do app e a maior `ultima_atualizacao` das
+    estações, que não percebe atualizações das demais colunas.
+    """
+    banco = engine.url.database
+    if engine.dialect.name == "sqlite" and banco and banco != ":memory:":
+        arquivos = (Path(banco), Path(f"{banco}-wal"))
+        return "|".join(
+            f"{stat.st_mtime_ns}:{stat.st_size}"
+            for stat in (arquivo.stat() for arquivo in arquivos if arquivo.exists())
+        )
+    with engine.connect() as connection:
+        if engine.dialect.name == "postgresql":
+            return "|".join(
+                f"{tabela}:{escritas}"
+                for tabela, escritas in connection.execute(
+                    CONSULTA_VERSAO_DADOS_POSTGRES
+                )
             )
-    return rows
+        return "|".join(map(str, connection.execute(CONSULTA_VERSAO_DADOS).one()))
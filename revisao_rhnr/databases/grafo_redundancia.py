@@ -0,0 +1,163 @@
+"""Grafo das redundâncias entre estações, em memória e no formato CSR.
+
+Os pares de `estacoes_redundantes` viram arestas não direcionadas entre índices
+densos (`np.unique` sobre os códigos). A adjacência fica em dois arrays,
+`indptr` e `indices`: os vizinhos do nó `i` são `indices[indptr[i]:indptr[i + 1]]`.
+Os grupos de redundância são as componentes conexas do grafo, calculadas por
+propagação do menor rótulo com operações vetorizadas sobre as arestas.
+"""
+
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+# Rótulo das estações que não aparecem em nenhum par de redundância.
+SEM_GRUPO = -1
+
+
+class GrafoRedundancia:
+    def __init__(
+        self, codigos: Iterable[int], codigos_redundantes: Iterable[int]
+    ) -> None:
+        origem = np.asarray(codigos, dtype=np.int64)
+        destino = np.asarray(codigos_redundantes, dtype=np.int64)
+        self.codigos, nos = np.unique(
+            np.concatenate([origem, destino]), return_inverse=True
+        )
+        total_nos = len(self.codigos)
+
+        # Arestas nos dois sentidos, sem laços e sem repetição, ordenadas pela origem.
+        # Cada aresta vira uma chave inteira (origem * total_nos + destino), o
+        # que deixa a deduplicação e a ordenação a cargo de um único np.unique.
+        origem, destino = nos[: len(origem)], nos[len(origem) :]
+        sem_lacos = origem != destino
+        origem, destino = origem[sem_lacos], destino[sem_lacos]
+        chaves = np.unique(
+            np.concatenate([origem * total_nos + destino, destino * total_nos + origem])
+        )
+        self._origem = (chaves // max(total_nos, 1)).astype(np.int32)
+        self.indices = (chaves % max(total_nos, 1)).astype(np.int32)
+        self.indptr = np.zeros(total_nos + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self._origem, minlength=total_nos), out=self.indptr[1:])
+
+        self.grupos = self._componentes_conexas()
+
+    @classmethod
+    def de_dataframe(cls, df: pd.DataFrame) -> "GrafoRedundancia":
+        """Monta o grafo a partir de CONSULTA_ESTACOES_REDUNDANTES."""
+        return cls(df["Código da Estação"], df["Código Redundante"])
+
+    def _componentes_conexas(self) -> np.ndarray:
+        """Grupo de cada nó, numerado a partir de 0 pela ordem do menor código.
+
+        Cada nó começa com o próprio índice como rótulo e recebe o menor rótulo
+        dos vizinhos até nada mudar; o salto de ponteiros (`rotulos[rotulos]`)
+        encurta as cadeias e reduz o número de rodadas. Nós isolados (só com
+        laços) ficam em SEM_GRUPO.
+        """
+        total_nos = len(self.codigos)
+        rotulos = np.arange(total_nos, dtype=np.int32)
+        while True:
+            novos = rotulos.copy()
+            np.minimum.at(novos, self._origem, rotulos[self.indices])
+            novos = novos[novos]
+            if np.array_equal(novos, rotulos):
+                break
+            rotulos = novos
+
+        _, grupos = np.unique(rotulos, return_inverse=True)
+        grupos = grupos.astype(np.int32)
+        isolados = np.diff(self.indptr) == 0
+        if isolados.any():
+            _, grupos[~isolados] = np.unique(grupos[~isolados], return_inverse=True)
+            grupos[isolados] = SEM_GRUPO
+        return grupos
+
+    @property
+    def total_grupos(self) -> int:
+        return int(self.grupos.max(initial=SEM_GRUPO)) + 1
+
+    def _nos(self, codigos: Iterable[int]) -> np.ndarray:
+        """Índice do nó de cada código, ou -1 se o código não está no grafo."""
+        codigos = np.asarray(codigos, dtype=np.int64)
+        posicoes = np.searchsorted(self.codigos, codigos)
+        posicoes = np.minimum(posicoes, max(len(self.codigos) - 1, 0))
+        encontrados = (
+            self.codigos[posicoes] == codigos
+            if len(self.codigos)
+            else np.zeros(len(codigos), dtype=bool)
+        )
+        return np.where(encontrados, posicoes, -1)
+
+    def grupo_das_estacoes(self, codigos: Iterable[int]) -> np.ndarray:
+        """Grupo de redundância de cada estação (SEM_GRUPO se não tiver)."""
+        nos = self._nos(codigos)
+        encontrados = nos >= 0
+        grupos = np.full(len(nos), SEM_GRUPO, dtype=np.int32)
+        grupos[encontrados] = self.grupos[nos[encontrados]]
+        return grupos
+
+    def redundantes_com(self, codigo: int, transitivo: bool = False) -> np.ndarray:
+        """Códigos das estações redundantes com `codigo`.
+
+        Sem `transitivo`, só as ligadas diretamente a ela; com `transitivo`, todas
+        as demais estações do mesmo grupo.
+        """
+        (no,) = self._nos([codigo])
+        if no < 0:
+            return np.empty(0, dtype=np.int64)
+        if transitivo:
+            membros = self.grupos == self.grupos[no]
+            membros[no] = False
+            return self.codigos[membros]
+        return self.codigos[self.indices[self.indptr[no] : self.indptr[no + 1]]]
+
+    def estacoes_por_grupo(self) -> pd.DataFrame:
+        """Uma linha por estação com grupo, ordenada por grupo e código."""
+        com_grupo = self.grupos != SEM_GRUPO
+        return pd.DataFrame(
+            {
+                "Grupo Redundância": self.grupos[com_grupo] + 1,
+                "Código da Estação": self.codigos[com_grupo],
+            }
+        ).sort_values(["Grupo Redundância", "Código da Estação"], ignore_index=True)
+
+    def grupos_com_varias_mantidas(self, codigos_mantidos: Iterable[int]) -> np.ndarray:
+        """Grupos em que mais de uma estação é mantida na rede proposta."""
+        grupos = self.grupo_das_estacoes(np.unique(np.asarray(codigos_mantidos)))
+        grupos = grupos[grupos != SEM_GRUPO]
+        mantidas_por_grupo = np.bincount(grupos, minlength=self.total_grupos)
+        return np.flatnonzero(mantidas_por_grupo > 1)
+
+
+def adiciona_grupo_redundancia(
+    df: pd.DataFrame, grafo: GrafoRedundancia
+) -> pd.DataFrame:
+    """Coluna "Grupo Redundância" (numerada a partir de 1) da tabela de revisão."""
+    grupos = grafo.grupo_das_estacoes(df["Código da Estação"].to_numpy())
+    df["Grupo Redundância"] = pd.arrays.IntegerArray(
+        (grupos + 1).astype(np.int32), grupos == SEM_GRUPO
+    )
+    return df
+
+
+def grupos_com_varias_mantidas(
+    df_revisao: pd.DataFrame, grafo: GrafoRedundancia
+) -> pd.DataFrame:
+    """Estações dos grupos de redundância com mais de uma estação mantida.
+
+    Uma estação é mantida quando "Integra RHNR?" é verdadeiro. Retorna as
+    linhas da tabela de revisão de todas as estações desses grupos.
+    """
+    mantidas = df_revisao["Integra RHNR?"].fillna(False).to_numpy(dtype=bool)
+    grupos = grafo.grupos_com_varias_mantidas(
+        df_revisao["Código da Estação"].to_numpy()[mantidas]
+    )
+    estacoes = grafo.estacoes_por_grupo()
+    estacoes = estacoes[estacoes["Grupo Redundância"].isin(grupos + 1)]
+    return estacoes.merge(
+        df_revisao.drop(columns="Grupo Redundância", errors="ignore"),
+        on="Código da Estação",
+        how="left",
+    )
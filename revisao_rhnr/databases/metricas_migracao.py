@@ -0,0 +1,129 @@
+"""Métricas por tabela da migração das bases CPLAR e relatório em JSON.
+
+Separa o tempo de leitura na origem, de transformação e de gravação no SQLite,
+para indicar se uma atualização lenta vem da rede ou da escrita local.
+"""
+
+import json
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator, Literal
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+type EtapaMigracao = Literal["leitura", "transformacao", "gravacao"]
+
+
+def pico_rss_mb() -> float | None:
+    """Pico de memória residente do processo até o momento, em MB.
+
+    No Windows, onde não há `resource`, o pico vem do `psutil` (`peak_wset`),
+    que é opcional: sem ele a função retorna None e o relatório fica sem o pico.
+    """
+    if resource is None:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        pico = getattr(psutil.Process().memory_info(), "peak_wset", None)
+        return pico / (1024 * 1024) if pico is not None else None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # O Linux informa em KB e o macOS em bytes.
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+
+def tamanho_lote(lote: list[dict[str, Any]]) -> int:
+    """Estimativa dos bytes de dados do lote: texto pelo tamanho, demais 8 bytes."""
+    return sum(
+        len(valor) if isinstance(valor, (str, bytes)) else 8
+        for linha in lote
+        for valor in linha.values()
+        if valor is not None
+    )
+
+
+@dataclass
+class MetricasTabela:
+    tabela: str
+    linhas: int = 0
+    bytes: int = 0
+    tempo_leitura: float = 0.0
+    tempo_transformacao: float = 0.0
+    tempo_gravacao: float = 0.0
+    tentativas_extras: int = 0
+    pico_rss_mb: float | None = None
+
+    @property
+    def linhas_por_segundo(self) -> float:
+        tempo_total = (
+            self.tempo_leitura + self.tempo_transformacao + self.tempo_gravacao
+        )
+        return self.linhas / tempo_total if tempo_total else 0.0
+
+    @contextmanager
+    def mede(self, etapa: EtapaMigracao) -> Iterator[None]:
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            atributo = f"tempo_{etapa}"
+            setattr(
+                self, atributo, getattr(self, atributo) + time.perf_counter() - inicio
+            )
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self) | {"linhas_por_segundo": self.linhas_por_segundo}
+
+
+@dataclass
+class RelatorioMigracao:
+    modo: Literal["completa", "incremental"]
+    inicio: datetime = field(default_factory=datetime.now)
+    duracao: float = 0.0
+    tempo_painel: float = 0.0
+    tabelas: dict[str, MetricasTabela] = field(default_factory=dict)
+
+    def metricas(self, tabela: str) -> MetricasTabela:
+        return self.tabelas.setdefault(tabela, MetricasTabela(tabela))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "modo": self.modo,
+            "inicio": self.inicio.isoformat(timespec="seconds"),
+            "duracao": self.duracao,
+            "tempo_painel": self.tempo_painel,
+            "pico_rss_mb": pico_rss_mb(),
+            "tabelas": [metricas.to_dict() for metricas in self.tabelas.values()],
+        }
+
+    def salva_json(self, caminho: Path) -> None:
+        caminho.write_text(
+            json.dumps(self.to_dict(), indent=2, ensure_ascii=False), encoding="utf-8"
+        )
+
+    def resumo(self) -> str:
+        cabecalho = (
+            f"{'Tabela':<32}{'Linhas':>10}{'Leitura':>10}{'Transf.':>10}"
+            f"{'Gravação':>10}{'Linhas/s':>12}{'MB':>9}{'Retries':>9}"
+        )
+        linhas = [cabecalho]
+        for metricas in self.tabelas.values():
+            linhas.append(
+                f"{metricas.tabela:<32}{metricas.linhas:>10}"
+                f"{metricas.tempo_leitura:>10.2f}{metricas.tempo_transformacao:>10.2f}"
+                f"{metricas.tempo_gravacao:>10.2f}{metricas.linhas_por_segundo:>12.0f}"
+                f"{metricas.bytes / 1e6:>9.1f}{metricas.tentativas_extras:>9}"
+            )
+        pico = pico_rss_mb()
+        linhas.append(
+            f"Total: {self.duracao:.2f} s (painel {self.tempo_painel:.2f} s), "
+            f"pico de memória: {f'{pico:.0f} MB' if pico is not None else 'n/d'}"
+        )
+        return "\n".join(linhas)
@@ -1,12 +1,43 @@
+import argparse
+import hashlib
 import os
-from inspect import isclass
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import closing
 from pathlib import Path
+from typing import Any, Callable, Iterable, NamedTuple, Sequence, TypeVar
 
 from dotenv import load_dotenv
-from sqlalchemy import create_engine, select
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    ColumnElement,
+    Connection,
+    Engine,
+    Select,
+    Table,
+    and_,
+    bindparam,
+    create_engine,
+    delete,
+    event,
+    insert,
+    select,
+    tuple_,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import DBAPIError, OperationalError
+from sqlalchemy.schema import CreateIndex, CreateTable
 
 from revisao_rhnr.databases import models_postgres, models_sqlite
+from revisao_rhnr.databases.metricas_migracao import (
+    MetricasTabela,
+    RelatorioMigracao,
+    pico_rss_mb,
+    tamanho_lote,
+)
+from revisao_rhnr.databases.painel_revisao_rhnr import atualiza_painel_revisao_rhnr
 
 
 def create_engine_bases_cplar():
@@ -15,61 +46,607 @@ def create_engine_bases_cplar():
     return engine
 
 
-def create_local_engine():
-    url = f"sqlite:///{Path(__file__).parent / 'database.db'}"
+CAMINHO_BANCO_LOCAL = Path(__file__).parent / "database.db"
+
+# Ajustes para montar o banco do zero em um arquivo temporário: sem journal e
+# sem fsync (se a carga falhar o arquivo é simplesmente descartado), cache de
+# páginas grande e estruturas temporárias em memória.
+PRAGMAS_CARGA_EM_MASSA = {
+    "journal_mode": "OFF",
+    "synchronous": "OFF",
+    "cache_size": -262_144,  # valor negativo é em KiB: 256 MiB
+    "temp_store": "MEMORY",
+}
+
+
+def create_local_engine(
+    caminho: Path = CAMINHO_BANCO_LOCAL, carga_em_massa: bool = False
+):
+    url = f"sqlite:///{caminho}"
     engine = create_engine(url=url)
+    if carga_em_massa:
+
+        @event.listens_for(engine, "connect")
+        def aplica_pragmas_carga_em_massa(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma, valor in PRAGMAS_CARGA_EM_MASSA.items():
+                cursor.execute(f"PRAGMA {pragma} = {valor}")
+            cursor.close()
+
     return engine
 
 
-def get_classes_from_module(module, classtype):
-    classes = {}
-    for classe in dir(module):
-        if not isclass(getattr(module, classe)):
+# Número de linhas lidas do cursor do servidor e inseridas por executemany.
+TAMANHO_LOTE = 5_000
+# Tabelas lidas simultaneamente do Postgres e lotes em memória por tabela.
+MAX_LEITURAS_SIMULTANEAS = 4
+MAX_LOTES_EM_FILA = 4
+# Falhas de conexão na origem são repetidas, com espera crescente entre elas.
+MAX_TENTATIVAS = 3
+ESPERA_ENTRE_TENTATIVAS = 2.0
+
+CAMINHO_RELATORIO = Path(__file__).parent / "relatorio_migracao.json"
+
+_FIM_DA_TABELA = object()
+
+T = TypeVar("T")
+
+
+def retorna_tabelas_para_migrar() -> list[tuple[Table, Table]]:
+    """Pares (tabela de origem, tabela local) em ordem de dependência das FKs.
+
+    A ordem vem de `sorted_tables` do metadata local, então cada tabela é gravada
+    depois das tabelas que ela referencia. Tabelas só locais (como o painel de
+    revisão) não têm origem e ficam de fora.
+    """
+    tabelas_origem = {
+        tabela.name: tabela for tabela in models_postgres.Base.metadata.sorted_tables
+    }
+    return [
+        (tabelas_origem[tabela.name], tabela)
+        for tabela in models_sqlite.Base.metadata.sorted_tables
+        if tabela.name in tabelas_origem
+    ]
+
+
+def _consulta_copia(tabela_origem: Table, tabela_destino: Table) -> Select:
+    # Colunas calculadas do destino são preenchidas pelo próprio SQLite.
+    colunas = [
+        coluna.name for coluna in tabela_destino.columns if coluna.computed is None
+    ]
+    return select(*(tabela_origem.c[coluna] for coluna in colunas))
+
+
+def _enfileira(fila: queue.Queue, item: Any, cancelado: threading.Event) -> None:
+    while not cancelado.is_set():
+        try:
+            fila.put(item, timeout=0.5)
+            return
+        except queue.Full:
             continue
-        if issubclass(getattr(module, classe), classtype):
-            classes[classe] = getattr(module, classe)
 
-    return classes
 
+def _espera_nova_tentativa(metricas: MetricasTabela, tentativa: int) -> None:
+    metricas.tentativas_extras += 1
+    time.sleep(ESPERA_ENTRE_TENTATIVAS * tentativa)
+
+
+def _com_tentativas(metricas: MetricasTabela, funcao: Callable[[], T]) -> T:
+    for tentativa in range(1, MAX_TENTATIVAS + 1):
+        try:
+            return funcao()
+        except OperationalError:
+            if tentativa == MAX_TENTATIVAS:
+                raise
+            _espera_nova_tentativa(metricas, tentativa)
+    raise AssertionError("unreachable")
+
+
+def _le_tabela(
+    engine_origem: Engine,
+    consulta: Select,
+    fila: queue.Queue,
+    cancelado: threading.Event,
+    metricas: MetricasTabela,
+) -> None:
+    """Lê a tabela por um cursor do lado do servidor e enfileira os lotes.
+
+    A fila é limitada, então a leitura espera o gravador quando ele fica para
+    trás. Falhas de conexão antes do primeiro lote são repetidas; os demais erros
+    do banco são repassados pela própria fila para o gravador. Qualquer outra
+    exceção sobe normalmente e chega ao gravador pelo Future da leitura.
+    """
+    for tentativa in range(1, MAX_TENTATIVAS + 1):
+        lotes_enviados = 0
+        try:
+            with engine_origem.connect() as origem:
+                with metricas.mede("leitura"):
+                    resultado = origem.execution_options(
+                        stream_results=True, yield_per=TAMANHO_LOTE
+                    ).execute(consulta)
+                    lotes = resultado.mappings().partitions()
+                while True:
+                    with metricas.mede("leitura"):
+                        lote = next(lotes, None)
+                    if lote is None or cancelado.is_set():
+                        break
+                    with metricas.mede("transformacao"):
+                        lote = [dict(linha) for linha in lote]
+                        metricas.bytes += tamanho_lote(lote)
+                    _enfileira(fila, lote, cancelado)
+                    lotes_enviados += 1
+            _enfileira(fila, _FIM_DA_TABELA, cancelado)
+            return
+        except DBAPIError as erro:
+            if (
+                not isinstance(erro, OperationalError)
+                or lotes_enviados
+                or tentativa == MAX_TENTATIVAS
+            ):
+                _enfileira(fila, erro, cancelado)
+                return
+            _espera_nova_tentativa(metricas, tentativa)
+
+
+def _proximo_lote(fila: queue.Queue, leitura: Future) -> Any:
+    """Próximo item da fila, ou a exceção da leitura se ela falhou sem enfileirar."""
+    while True:
+        try:
+            return fila.get(timeout=0.5)
+        except queue.Empty:
+            if leitura.done():
+                # Levanta a exceção da leitura; se ela terminou bem, o fim da
+                # tabela já está na fila.
+                leitura.result()
+
+
+def _grava_tabela(
+    destino: Connection,
+    tabela_destino: Table,
+    fila: queue.Queue,
+    leitura: Future,
+    metricas: MetricasTabela,
+) -> int:
+    while (lote := _proximo_lote(fila, leitura)) is not _FIM_DA_TABELA:
+        if isinstance(lote, Exception):
+            raise lote
+        with metricas.mede("gravacao"):
+            destino.execute(insert(tabela_destino), lote)
+        metricas.linhas += len(lote)
+    metricas.pico_rss_mb = pico_rss_mb()
+    return metricas.linhas
+
+
+def migra_tabelas(
+    engine_origem: Engine,
+    engine_destino: Engine,
+    tabelas: list[tuple[Table, Table]],
+    relatorio: RelatorioMigracao,
+) -> dict[str, int]:
+    """Lê as tabelas em paralelo e grava no SQLite com um único gravador.
+
+    As leituras são submetidas na ordem de `tabelas` e o gravador consome as
+    filas nessa mesma ordem, então a tabela que ele espera sempre já está sendo
+    lida e as FKs são respeitadas. O tempo total tende ao da maior tabela em vez
+    da soma de todas. Todas as tabelas são gravadas em uma única transação.
+    """
+    filas = [queue.Queue(maxsize=MAX_LOTES_EM_FILA) for _ in tabelas]
+    cancelado = threading.Event()
+    totais = {}
+    with ThreadPoolExecutor(max_workers=MAX_LEITURAS_SIMULTANEAS) as executor:
+        leituras = [
+            executor.submit(
+                _le_tabela,
+                engine_origem,
+                _consulta_copia(tabela_origem, tabela_destino),
+                fila,
+                cancelado,
+                relatorio.metricas(tabela_destino.name),
+            )
+            for (tabela_origem, tabela_destino), fila in zip(tabelas, filas)
+        ]
+        try:
+            with engine_destino.begin() as destino:
+                for (_, tabela_destino), fila, leitura in zip(tabelas, filas, leituras):
+                    print(f"Migrating data for table: {tabela_destino.name}")
+                    totais[tabela_destino.name] = _grava_tabela(
+                        destino,
+                        tabela_destino,
+                        fila,
+                        leitura,
+                        relatorio.metricas(tabela_destino.name),
+                    )
+                    print(
+                        f"Migrated {totais[tabela_destino.name]} records "
+                        f"for {tabela_destino.name}"
+                    )
+        except BaseException:
+            # Libera as leituras bloqueadas em filas cheias antes de sair.
+            cancelado.set()
+            raise
+    return totais
+
+
+# Coluna usada como versão da linha quando a tabela de origem a possui; nas
+# demais tabelas a versão é um hash do conteúdo da linha.
+COLUNA_VERSAO = "ultima_atualizacao"
+
+
+class AlteracoesTabela(NamedTuple):
+    tabela: Table
+    linhas_novas: list[dict[str, Any]]
+    linhas_alteradas: list[dict[str, Any]]
+    chaves_removidas: list[tuple]
+
+
+def _hash_linha(valores: Sequence[Any]) -> bytes:
+    return hashlib.md5(repr(tuple(valores)).encode()).digest()
+
+
+def _filtro_chaves(
+    tabela: Table, colunas_chave: list[str], chaves: Sequence[tuple]
+) -> ColumnElement[bool]:
+    if len(colunas_chave) == 1:
+        return tabela.c[colunas_chave[0]].in_([chave[0] for chave in chaves])
+    return tuple_(*(tabela.c[coluna] for coluna in colunas_chave)).in_(chaves)
 
-def get_data_from_base_class(engine_bases_cplar, classe):
-    with Session(engine_bases_cplar) as session:
-        instances = session.execute(select(classe)).scalars().all()
-        return instances
 
+def _lotes(itens: Sequence, tamanho: int = TAMANHO_LOTE) -> Iterable[Sequence]:
+    for inicio in range(0, len(itens), tamanho):
+        yield itens[inicio : inicio + tamanho]
 
-def migra_dados_dos_bancos():
-    classes = get_classes_from_module(models_postgres, models_postgres.Base)
 
+def _calcula_alteracoes(
+    engine_origem: Engine,
+    engine_destino: Engine,
+    tabela_origem: Table,
+    tabela_destino: Table,
+    metricas: MetricasTabela,
+) -> AlteracoesTabela:
+    """Compara origem e banco local e retorna só as linhas a gravar ou remover.
+
+    Com `ultima_atualizacao` (estacao_flu) apenas a chave e a data são lidas de
+    cada lado, e as linhas completas são buscadas só para as chaves que mudaram.
+    Nas demais tabelas as linhas são comparadas pelo hash do conteúdo.
+    """
+    consulta = _consulta_copia(tabela_origem, tabela_destino)
+    colunas = [coluna.name for coluna in consulta.selected_columns]
+    colunas_chave = [coluna.name for coluna in tabela_destino.primary_key.columns]
+    usa_coluna_versao = COLUNA_VERSAO in colunas
+
+    def chave(linha) -> tuple:
+        return tuple(linha._mapping[coluna] for coluna in colunas_chave)
+
+    def versoes(engine: Engine, tabela: Table) -> dict[tuple, Any]:
+        if usa_coluna_versao:
+            consulta_versao = select(
+                *(tabela.c[coluna] for coluna in colunas_chave + [COLUNA_VERSAO])
+            )
+        else:
+            consulta_versao = select(*(tabela.c[coluna] for coluna in colunas))
+        with engine.connect() as connection:
+            resultado = connection.execution_options(
+                stream_results=True, yield_per=TAMANHO_LOTE
+            ).execute(consulta_versao)
+            return {
+                chave(linha): (
+                    linha._mapping[COLUNA_VERSAO]
+                    if usa_coluna_versao
+                    else _hash_linha(linha)
+                )
+                for linha in resultado
+            }
+
+    def le_linhas_alteradas(chaves: Sequence[tuple]) -> list[dict[str, Any]]:
+        linhas = []
+        with engine_origem.connect() as origem:
+            for lote in _lotes(chaves):
+                resultado = origem.execute(
+                    consulta.where(_filtro_chaves(tabela_origem, colunas_chave, lote))
+                )
+                linhas.extend(dict(linha) for linha in resultado.mappings())
+        return linhas
+
+    with metricas.mede("leitura"):
+        versoes_locais = versoes(engine_destino, tabela_destino)
+        versoes_origem = _com_tentativas(
+            metricas, lambda: versoes(engine_origem, tabela_origem)
+        )
+    with metricas.mede("transformacao"):
+        chaves_alteradas = [
+            chave_origem
+            for chave_origem, versao in versoes_origem.items()
+            if versoes_locais.get(chave_origem) != versao
+        ]
+    with metricas.mede("leitura"):
+        linhas = _com_tentativas(
+            metricas, lambda: le_linhas_alteradas(chaves_alteradas)
+        )
+
+    def ja_existe(linha: dict[str, Any]) -> bool:
+        return tuple(linha[coluna] for coluna in colunas_chave) in versoes_locais
+
+    with metricas.mede("transformacao"):
+        metricas.linhas = len(versoes_origem)
+        metricas.bytes = tamanho_lote(linhas)
+        return AlteracoesTabela(
+            tabela=tabela_destino,
+            linhas_novas=[linha for linha in linhas if not ja_existe(linha)],
+            linhas_alteradas=[linha for linha in linhas if ja_existe(linha)],
+            chaves_removidas=[
+                chave_local
+                for chave_local in versoes_locais
+                if chave_local not in versoes_origem
+            ],
+        )
+
+
+def migra_tabelas_incremental(
+    engine_origem: Engine,
+    engine_destino: Engine,
+    tabelas: list[tuple[Table, Table]],
+    relatorio: RelatorioMigracao,
+) -> list[AlteracoesTabela]:
+    """Aplica no banco local só as inserções, atualizações e remoções detectadas.
+
+    As comparações são feitas em paralelo e sem escrita; as alterações de todas
+    as tabelas são então gravadas em uma única transação curta, com remoções em
+    ordem inversa das FKs e inserções/atualizações na ordem das FKs.
+    """
+    with ThreadPoolExecutor(max_workers=MAX_LEITURAS_SIMULTANEAS) as executor:
+        alteracoes = list(
+            executor.map(
+                lambda par: _calcula_alteracoes(
+                    engine_origem,
+                    engine_destino,
+                    *par,
+                    relatorio.metricas(par[1].name),
+                ),
+                tabelas,
+            )
+        )
+
+    with engine_destino.begin() as destino:
+        for alteracao in reversed(alteracoes):
+            if not alteracao.chaves_removidas:
+                continue
+            metricas = relatorio.metricas(alteracao.tabela.name)
+            colunas_chave = [coluna.name for coluna in alteracao.tabela.primary_key]
+            remove = delete(alteracao.tabela).where(
+                and_(
+                    *(
+                        alteracao.tabela.c[coluna] == bindparam(f"chave_{coluna}")
+                        for coluna in colunas_chave
+                    )
+                )
+            )
+            with metricas.mede("gravacao"):
+                destino.execute(
+                    remove,
+                    [
+                        {
+                            f"chave_{coluna}": valor
+                            for coluna, valor in zip(colunas_chave, chave)
+                        }
+                        for chave in alteracao.chaves_removidas
+                    ],
+                )
+
+        for alteracao in alteracoes:
+            linhas = alteracao.linhas_novas + alteracao.linhas_alteradas
+            if not linhas:
+                continue
+            metricas = relatorio.metricas(alteracao.tabela.name)
+            upsert = sqlite_insert(alteracao.tabela)
+            upsert = upsert.on_conflict_do_update(
+                index_elements=list(alteracao.tabela.primary_key),
+                set_={
+                    coluna: upsert.excluded[coluna]
+                    for coluna in linhas[0]
+                    if not alteracao.tabela.c[coluna].primary_key
+                },
+            )
+            with metricas.mede("gravacao"):
+                for lote in _lotes(linhas):
+                    destino.execute(upsert, list(lote))
+
+    for alteracao in alteracoes:
+        print(
+            f"{alteracao.tabela.name}: {len(alteracao.linhas_novas)} inserted, "
+            f"{len(alteracao.linhas_alteradas)} updated, "
+            f"{len(alteracao.chaves_removidas)} deleted"
+        )
+        relatorio.metricas(alteracao.tabela.name).pico_rss_mb = pico_rss_mb()
+    return alteracoes
+
+
+def cria_esquema_sem_indices(engine: Engine) -> None:
+    with engine.begin() as connection:
+        for tabela in models_sqlite.Base.metadata.sorted_tables:
+            connection.execute(CreateTable(tabela))
+
+
+def cria_indices(engine: Engine) -> None:
+    """Cria os índices depois da carga.
+
+    Um passo de ordenação por índice custa menos do que manter cada índice
+    atualizado linha a linha durante os inserts.
+    """
+    with engine.begin() as connection:
+        for tabela in models_sqlite.Base.metadata.sorted_tables:
+            for indice in tabela.indexes:
+                indice.create(connection)
+
+
+def tabelas_com_esquema_divergente(engine: Engine) -> list[str]:
+    """Tabelas do banco local que não existem ou diferem dos modelos.
+
+    O `create_all` não altera tabelas existentes: colunas novas ou calculadas e
+    índices só chegam a um banco antigo com a migração completa. A comparação é
+    feita com o DDL que o próprio SQLite guarda em `sqlite_master`, sem
+    diferenças de espaços.
+    """
+
+    def normaliza(ddl: str) -> str:
+        return " ".join(ddl.split())
+
+    with engine.connect() as connection:
+        existentes = {
+            nome: normaliza(ddl)
+            for nome, ddl in connection.exec_driver_sql(
+                "SELECT name, sql FROM sqlite_master WHERE sql IS NOT NULL"
+            )
+        }
+    divergentes = []
+    for tabela in models_sqlite.Base.metadata.sorted_tables:
+        esperados = [(tabela.name, CreateTable(tabela))] + [
+            (str(indice.name), CreateIndex(indice)) for indice in tabela.indexes
+        ]
+        if any(
+            existentes.get(nome) != normaliza(str(ddl.compile(dialect=engine.dialect)))
+            for nome, ddl in esperados
+        ):
+            divergentes.append(tabela.name)
+    return divergentes
+
+
+# Tempo que a cópia para o banco do app espera leituras em andamento terminarem.
+ESPERA_BANCO_OCUPADO = 60.0
+
+
+def copia_banco(origem: Path, destino: Path) -> None:
+    """Copia o banco `origem` por cima de `destino` com a API de backup do SQLite.
+
+    Todas as páginas são copiadas em um único passo, com o destino bloqueado
+    para escrita: quem lê `destino` vê o banco anterior ou o novo, nunca uma
+    mistura dos dois.
+    """
+    with closing(sqlite3.connect(origem)) as conexao_origem:
+        with closing(
+            sqlite3.connect(destino, timeout=ESPERA_BANCO_OCUPADO)
+        ) as conexao_destino:
+            conexao_origem.backup(conexao_destino)
+
+
+def migra_dados_dos_bancos(
+    incremental: bool = False,
+    caminho_relatorio: Path | None = CAMINHO_RELATORIO,
+    imprime_resumo: bool = False,
+) -> RelatorioMigracao:
+    """Migra as bases e grava as métricas por tabela em `caminho_relatorio`.
+
+    A migração completa monta um banco novo em `database.db.tmp`, no modo de
+    carga em massa, e só depois da carga, dos índices, do painel e do ANALYZE o
+    copia para `database.db` com a API de backup do SQLite, em um único passo.
+    Assim o app continua lendo o banco anterior durante toda a carga, e as
+    conexões já abertas por ele passam a ver o banco novo (o arquivo é o mesmo,
+    só o conteúdo muda, o que também funciona no Windows com o arquivo aberto).
+    A incremental altera o próprio `database.db` com as configurações padrão; se
+    o esquema do banco local estiver desatualizado em relação aos modelos, ela é
+    trocada pela completa.
+    """
     engine_bases_cplar = create_engine_bases_cplar()
-    engine_local = create_local_engine()
-    models_sqlite.Base.metadata.create_all(bind=engine_local)
-    
+    if incremental:
+        engine_local = create_local_engine(CAMINHO_BANCO_LOCAL)
+        if divergentes := tabelas_com_esquema_divergente(engine_local):
+            print(
+                f"Local schema differs from the models ({', '.join(divergentes)}); "
+                "running a full migration instead"
+            )
+            engine_local.dispose()
+            incremental = False
+    if not incremental:
+        caminho_temporario = CAMINHO_BANCO_LOCAL.with_name(
+            f"{CAMINHO_BANCO_LOCAL.name}.tmp"
+        )
+        caminho_temporario.unlink(missing_ok=True)
+        engine_local = create_local_engine(caminho_temporario, carga_em_massa=True)
+    if "postgresql" in str(engine_local.url):
+        raise ConnectionError("This operation is only allowed on SQLite databases.")
+
     print("Engine URL:", engine_bases_cplar.url)
     print("Engine URL:", engine_local.url)
 
-    for nome_classe, classe in classes.items():
-        
-        if nome_classe == "Base":
-            continue
-        
-        print(f"Migrating data for class: {nome_classe}")
-        instances = get_data_from_base_class(engine_bases_cplar, classe)
+    relatorio = RelatorioMigracao(modo="incremental" if incremental else "completa")
+    inicio = time.perf_counter()
+    houve_alteracoes = True
+    try:
+        if incremental:
+            alteracoes = migra_tabelas_incremental(
+                engine_bases_cplar,
+                engine_local,
+                retorna_tabelas_para_migrar(),
+                relatorio,
+            )
+            houve_alteracoes = any(
+                alteracao.linhas_novas
+                or alteracao.linhas_alteradas
+                or alteracao.chaves_removidas
+                for alteracao in alteracoes
+            )
+        else:
+            cria_esquema_sem_indices(engine_local)
+            migra_tabelas(
+                engine_bases_cplar,
+                engine_local,
+                retorna_tabelas_para_migrar(),
+                relatorio,
+            )
+            cria_indices(engine_local)
+
+        if houve_alteracoes:
+            inicio_painel = time.perf_counter()
+            total_painel = atualiza_painel_revisao_rhnr(engine_local)
+            relatorio.tempo_painel = time.perf_counter() - inicio_painel
+            print(f"Rebuilt painel_revisao_rhnr with {total_painel} records")
+        else:
+            print("No changes found; painel_revisao_rhnr kept as is")
 
-        new_class = getattr(models_sqlite, nome_classe)
-        new_instances = [new_class(**instance.to_dict()) for instance in instances]
-        with Session(engine_local) as local_session:
-            # Delete existing data in local database
-            if "postgresql" in str(engine_local.url):
-                raise ConnectionError("This operation is only allowed on SQLite databases.")
-            local_session.query(new_class).delete()
-            
-            # Add new data to local database
-            local_session.add_all(new_instances)
-            local_session.commit()
+        if not incremental:
+            # Estatísticas para o planejador de consultas do SQLite.
+            with engine_local.begin() as connection:
+                connection.exec_driver_sql("ANALYZE")
+        engine_local.dispose()
+        if not incremental:
+            copia_banco(caminho_temporario, CAMINHO_BANCO_LOCAL)
+            print(f"Local database replaced: {CAMINHO_BANCO_LOCAL}")
+    finally:
+        engine_local.dispose()
+        if not incremental:
+            caminho_temporario.unlink(missing_ok=True)
 
-        print(f"Migrated {len(new_instances)} records for {nome_classe}")
+    relatorio.duracao = time.perf_counter() - inicio
+    if caminho_relatorio is not None:
+        relatorio.salva_json(caminho_relatorio)
+        print(f"Migration report written to {caminho_relatorio}")
+    if imprime_resumo:
+        print(relatorio.resumo())
+    return relatorio
 
 
 if __name__ == "__main__":
-    migra_dados_dos_bancos()
+    parser = argparse.ArgumentParser(
+        description="Migra as bases CPLAR do Postgres para o SQLite local."
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="aplica apenas as linhas inseridas, alteradas ou removidas na origem",
+    )
+    parser.add_argument(
+        "--relatorio",
+        type=Path,
+        default=CAMINHO_RELATORIO,
+        help="arquivo JSON com as métricas por tabela",
+    )
+    parser.add_argument(
+        "--resumo",
+        action="store_true",
+        help="imprime uma tabela resumo das métricas ao final",
+    )
+    args = parser.parse_args()
+    migra_dados_dos_bancos(
+        incremental=args.incremental,
+        caminho_relatorio=args.relatorio,
+        imprime_resumo=args.resumo,
+    )
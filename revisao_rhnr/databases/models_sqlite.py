@@ -1,9 +1,20 @@
 from datetime import date
 from pathlib import Path
 
-from sqlalchemy import ForeignKey, SmallInteger, String, create_engine
+from sqlalchemy import (
+    Computed,
+    ForeignKey,
+    Index,
+    SmallInteger,
+    String,
+    create_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
+from revisao_rhnr.databases.alimentacao_tabelas_bd_bases_cplar.constantes import (
+    COLS_OBJS_ESPECIFICOS,
+)
+
 
 class Base(DeclarativeBase):
     def to_dict(self):
@@ -20,7 +31,7 @@ class EstacaoFlu(Base):
     longitude: Mapped[float]
     altitude: Mapped[float | None]
     area_drenagem: Mapped[float | None]
-    bacia_codigo: Mapped[int] = mapped_column(ForeignKey("bacia.codigo"))
+    bacia_codigo: Mapped[int] = mapped_column(ForeignKey("bacia.codigo"), index=True)
     subbacia_codigo: Mapped[int] = mapped_column(ForeignKey("subbacia.codigo"))
     estado_codigo: Mapped[int] = mapped_column(ForeignKey("estado.codigo"))
     municipio_codigo: Mapped[int] = mapped_column(ForeignKey("municipio.codigo"))
@@ -28,6 +39,15 @@ class EstacaoFlu(Base):
     operando: Mapped[int]
     descricao: Mapped[str]
     historico: Mapped[str]
+    # Calculada pelo SQLite na carga da tabela: evita o LIKE '%RHNR%' sobre a
+    # descrição, que não pode usar índice. O upper() mantém a comparação sem
+    # distinção de maiúsculas, como a do LIKE que selecionava as estações
+    # validadas. A flag exibida antes era calculada em Python com distinção de
+    # maiúsculas ("RHNR" in descricao); agora as estações validadas com "rhnr"
+    # também aparecem como implementadas, e a lista e a flag concordam.
+    rhnr_implementada: Mapped[bool] = mapped_column(
+        Computed("instr(upper(descricao), 'RHNR') > 0", persisted=True), index=True
+    )
 
 
 class Entidade(Base):
@@ -63,7 +83,9 @@ class Rio(Base):
         ForeignKey("estacao_flu.codigo"), primary_key=True
     )
     nome: Mapped[str]
-    jurisdicao: Mapped[int] = mapped_column(ForeignKey("entidade.codigo"), nullable=True)
+    jurisdicao: Mapped[int] = mapped_column(
+        ForeignKey("entidade.codigo"), nullable=True
+    )
     bacia_codigo: Mapped[int] = mapped_column(ForeignKey("bacia.codigo"))
     subbacia_codigo: Mapped[int] = mapped_column(ForeignKey("subbacia.codigo"))
 
@@ -88,6 +110,9 @@ class Municipio(Base):
 
 class Responsavel(Base):
     __tablename__ = "responsavel"
+    __table_args__ = (
+        Index("ix_responsavel_codigo_estacao", "responsavel_codigo", "codigo_estacao"),
+    )
 
     codigo_estacao: Mapped[int] = mapped_column(
         ForeignKey("estacao_flu.codigo"), primary_key=True
@@ -99,6 +124,9 @@ class Responsavel(Base):
 
 class Operadora(Base):
     __tablename__ = "operadora"
+    __table_args__ = (
+        Index("ix_operadora_codigo_estacao", "operadora_codigo", "codigo_estacao"),
+    )
 
     codigo_estacao: Mapped[int] = mapped_column(
         ForeignKey("estacao_flu.codigo"), primary_key=True
@@ -174,6 +202,17 @@ class ObjetivoEspecificoEstacaoProposta(Base):
     obj_6e: Mapped[int] = mapped_column(SmallInteger, nullable=False)
     obj_6f: Mapped[int] = mapped_column(SmallInteger, nullable=False)
     tipo_mapeamento: Mapped[str] = mapped_column(nullable=False)
+    # Bitset com um bit por objetivo, na ordem de COLS_OBJS_ESPECIFICOS
+    # (obj_1a = bit 0 ... obj_6f = bit 18), calculado pelo SQLite na carga.
+    objetivos_mascara: Mapped[int] = mapped_column(
+        Computed(
+            " + ".join(
+                f"(coalesce({coluna}, 0) != 0) * {1 << bit}"
+                for bit, coluna in enumerate(COLS_OBJS_ESPECIFICOS.values())
+            ),
+            persisted=True,
+        )
+    )
 
 
 class EstacaoRedundante(Base):
@@ -187,6 +226,29 @@ class EstacaoRedundante(Base):
     tipo_estacao: Mapped[str] = mapped_column(String(10), nullable=False)
 
 
+class PainelRevisaoRHNR(Base):
+    """Tabela final de revisão da RHNR, recalculada ao fim de cada migração."""
+
+    __tablename__ = "painel_revisao_rhnr"
+
+    codigo: Mapped[int] = mapped_column(primary_key=True)
+    nome: Mapped[str | None]
+    responsavel: Mapped[str | None]
+    operadora: Mapped[str | None]
+    bacia: Mapped[str | None]
+    operando: Mapped[int | None]
+    tipologia_atual: Mapped[str | None]
+    tipologia_mapeada: Mapped[str | None]
+    tipologia_divergente: Mapped[bool | None]
+    rhnr_inicial: Mapped[bool | None]
+    rhnr_implementada: Mapped[bool | None]
+    acao_proposta: Mapped[str | None]
+    tipologia_proposta: Mapped[str | None]
+    integra_rhnr: Mapped[bool | None]
+    objs_especificos: Mapped[str | None]
+    grupo_redundancia: Mapped[int | None]
+
+
 if __name__ == "__main__":
     url = f"sqlite:///{Path(__file__).parent / 'database.db'}"
     engine = create_engine(url=url)
@@ -0,0 +1,107 @@
+"""Consultas de cobertura dos objetivos específicos sobre o bitset `objetivos_mascara`.
+
+Cada objetivo de COLS_OBJS_ESPECIFICOS ocupa um bit (1a = bit 0 ... 6f = bit 18),
+o que permite responder "quais estações cobrem X", "algum/todos de {...}" e
+contagens por bacia com operações bit a bit, em SQL ou em NumPy.
+"""
+
+from typing import Iterable, Literal
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import ColumnElement, Integer, Select, func, select
+
+from revisao_rhnr.databases.alimentacao_tabelas_bd_bases_cplar.constantes import (
+    COLS_OBJS_ESPECIFICOS,
+)
+from revisao_rhnr.databases.models_sqlite import (
+    Bacia,
+    EstacaoFlu,
+    ObjetivoEspecificoEstacaoProposta,
+)
+
+type ModoCobertura = Literal["algum", "todos"]
+
+OBJETIVOS_ESPECIFICOS: tuple[str, ...] = tuple(COLS_OBJS_ESPECIFICOS)
+BIT_OBJETIVO: dict[str, int] = {
+    objetivo: bit for bit, objetivo in enumerate(OBJETIVOS_ESPECIFICOS)
+}
+
+
+def mascara_objetivos(objetivos: Iterable[str]) -> int:
+    """Converte nomes de objetivos ("1a", "6d"...) no bitset correspondente."""
+    mascara = 0
+    for objetivo in objetivos:
+        if objetivo not in BIT_OBJETIVO:
+            raise ValueError(f"Objetivo específico inválido: {objetivo}")
+        mascara |= 1 << BIT_OBJETIVO[objetivo]
+    return mascara
+
+
+def cobre_objetivos(
+    mascaras: pd.Series, objetivos: Iterable[str], modo: ModoCobertura = "algum"
+) -> pd.Series:
+    """Indica as estações que cobrem algum (ou todos) os objetivos informados."""
+    alvo = mascara_objetivos(objetivos)
+    valores = mascaras.fillna(0).to_numpy(dtype=np.uint32) & alvo
+    cobertas = valores == alvo if modo == "todos" else valores != 0
+    return pd.Series(cobertas, index=mascaras.index)
+
+
+def expande_objetivos(mascaras: pd.Series) -> pd.DataFrame:
+    """Abre o bitset em uma coluna 0/1 por objetivo, sem percorrer as linhas."""
+    valores = mascaras.fillna(0).to_numpy(dtype=np.uint32)
+    bits = (valores[:, np.newaxis] >> np.arange(len(OBJETIVOS_ESPECIFICOS))) & 1
+    return pd.DataFrame(
+        bits.astype(np.uint8), index=mascaras.index, columns=OBJETIVOS_ESPECIFICOS
+    )
+
+
+def conta_objetivos_por_bacia(
+    df: pd.DataFrame, coluna_bacia: str = "Bacia", coluna_mascara: str = "Máscara"
+) -> pd.DataFrame:
+    """Número de estações que cobrem cada objetivo, por bacia."""
+    return expande_objetivos(df[coluna_mascara]).groupby(df[coluna_bacia]).sum()
+
+
+def filtro_objetivos_sql(
+    objetivos: Iterable[str], modo: ModoCobertura = "algum"
+) -> ColumnElement[bool]:
+    """Equivalente SQL de `cobre_objetivos`, para uso em cláusulas WHERE."""
+    alvo = mascara_objetivos(objetivos)
+    mascara = ObjetivoEspecificoEstacaoProposta.objetivos_mascara
+    bits_cobertos = mascara.op("&", return_type=Integer)(alvo)
+    return bits_cobertos == alvo if modo == "todos" else bits_cobertos != 0
+
+
+def consulta_estacoes_por_objetivos(
+    objetivos: Iterable[str], modo: ModoCobertura = "algum"
+) -> Select:
+    return select(
+        ObjetivoEspecificoEstacaoProposta.codigo.label("Código da Estação"),
+        ObjetivoEspecificoEstacaoProposta.objetivos_mascara.label("Máscara"),
+    ).where(filtro_objetivos_sql(objetivos, modo))
+
+
+def _bit_objetivo_sql(bit: int) -> ColumnElement[int]:
+    mascara = ObjetivoEspecificoEstacaoProposta.objetivos_mascara
+    return mascara.op(">>", return_type=Integer)(bit).op("&", return_type=Integer)(1)
+
+
+CONSULTA_CONTAGEM_OBJETIVOS_POR_BACIA = (
+    select(
+        Bacia.nome.label("Bacia"),
+        *(
+            func.sum(_bit_objetivo_sql(bit), type_=Integer).label(objetivo)
+            for objetivo, bit in BIT_OBJETIVO.items()
+        ),
+    )
+    .select_from(ObjetivoEspecificoEstacaoProposta)
+    .join(
+        EstacaoFlu,
+        EstacaoFlu.codigo == ObjetivoEspecificoEstacaoProposta.codigo,
+    )
+    .join(Bacia, EstacaoFlu.bacia_codigo == Bacia.codigo)
+    .group_by(Bacia.nome)
+    .order_by(Bacia.nome)
+)
@@ -0,0 +1,167 @@
+"""Montagem da tabela final de revisão da RHNR e sua materialização no banco local."""
+
+from pathlib import Path
+from typing import get_args
+
+import pandas as pd
+from sqlalchemy import Engine, create_engine, delete, insert
+
+from revisao_rhnr.databases.database_access import (
+    COLUNAS_PAINEL_REVISAO_RHNR,
+    ColunaTabelaRHNRProposta,
+    SnapshotDadosApp,
+    retorna_snapshot_dados_app,
+)
+from revisao_rhnr.databases.grafo_redundancia import (
+    GrafoRedundancia,
+    adiciona_grupo_redundancia,
+)
+from revisao_rhnr.databases.models_sqlite import PainelRevisaoRHNR
+from revisao_rhnr.databases.tipologia import verifica_divergencia_tipologia
+
+COLUNAS_TABELA_RHNR_PROPOSTA: tuple[ColunaTabelaRHNRProposta, ...] = get_args(
+    ColunaTabelaRHNRProposta.__value__
+)
+
+
+def formatar_campo_descricao(estacoes: pd.DataFrame) -> pd.DataFrame:
+    # A flag "RHNR Implementada" já vem calculada pelo banco.
+    return estacoes.drop(columns="Descrição")
+
+
+def monta_estacoes_com_tipologia(
+    estacoes: pd.DataFrame, df_tipo_estacoes: pd.DataFrame
+) -> pd.DataFrame:
+    return formatar_campo_descricao(estacoes).merge(
+        df_tipo_estacoes, on="Código da Estação", how="left"
+    )
+
+
+def monta_proposta_rhnr(
+    df_estacoes_proposta: pd.DataFrame,
+    df_objs_especificos: pd.DataFrame,
+    df_tipo_estacoes: pd.DataFrame,
+    df_filtro: pd.DataFrame,
+    grafo_redundancia: GrafoRedundancia,
+) -> pd.DataFrame:
+    df = df_estacoes_proposta.merge(
+        df_objs_especificos, on="Código da Estação", how="left"
+    )
+    df["RHNR Inicial?"] = df["Código da Estação"].isin(df_filtro["Código da Estação"])
+    df = df.merge(df_tipo_estacoes, on="Código da Estação", how="left")
+    df["Tipologia Divergente?"] = verifica_divergencia_tipologia(df)
+    df = adiciona_grupo_redundancia(df, grafo_redundancia)
+    return df[list(COLUNAS_TABELA_RHNR_PROPOSTA)]
+
+
+def padroniza_dicionario_rhnr(dataframe: pd.DataFrame) -> dict:
+    dicionario = {}
+    total_linhas = dataframe.shape[0]
+    for col in dataframe.columns:
+        if "Objetivo" in col:
+            continue
+        if col in COLUNAS_TABELA_RHNR_PROPOSTA:
+            dicionario[col] = dataframe[col].to_list()
+        else:
+            dicionario[col] = [None] * total_linhas
+    return dicionario
+
+
+def _sem_colunas_vazias(df: pd.DataFrame) -> pd.DataFrame:
+    """Remove as colunas só com nulos antes do `pd.concat`.
+
+    O pandas ignora essas colunas ao escolher o dtype do resultado, mas vai
+    deixar de ignorar (FutureWarning); sem elas o dtype vem só dos valores.
+    """
+    return df.loc[:, df.notna().any()]
+
+
+def adiciona_estacoes_rhrn_inicial_e_validadas(
+    df_rhnr_inicial: pd.DataFrame,
+    df_estacoes_validadas: pd.DataFrame,
+    df_rhnr_proposta: pd.DataFrame,
+) -> pd.DataFrame:
+    dict_rede_inicial = padroniza_dicionario_rhnr(df_rhnr_inicial)
+    df_rede_inicial = pd.DataFrame(dict_rede_inicial)
+    df_rede_inicial["RHNR Inicial?"] = True
+    df_rede_inicial_sem_proposta = df_rede_inicial[
+        ~df_rede_inicial["Código da Estação"].isin(
+            df_rhnr_proposta["Código da Estação"]
+        )
+    ]
+
+    dict_estacoes_validadas = padroniza_dicionario_rhnr(df_estacoes_validadas)
+    df_rede_validada = pd.DataFrame(dict_estacoes_validadas)
+    df_rede_validada_sem_inicial = df_rede_validada[
+        ~df_rede_validada["Código da Estação"].isin(
+            df_rede_inicial["Código da Estação"]
+        )
+    ].copy()
+    df_rede_validada_sem_inicial["RHNR Inicial?"] = False
+    df_rede_validada_sem_inicial_e_sem_proposta = df_rede_validada_sem_inicial[
+        ~df_rede_validada_sem_inicial["Código da Estação"].isin(
+            df_rhnr_proposta["Código da Estação"]
+        )
+    ]
+
+    partes = [
+        df_rhnr_proposta,
+        df_rede_inicial_sem_proposta,
+        df_rede_validada_sem_inicial_e_sem_proposta,
+    ]
+    colunas = list(dict.fromkeys(coluna for df in partes for coluna in df.columns))
+    return (
+        pd.concat([_sem_colunas_vazias(df) for df in partes])
+        .reindex(columns=colunas)
+        .sort_values(by="Código da Estação")
+        .reset_index(drop=True)
+    )
+
+
+def monta_painel_revisao_rhnr(snapshot: SnapshotDadosApp) -> pd.DataFrame:
+    grafo_redundancia = GrafoRedundancia.de_dataframe(snapshot.redundancias)
+    df_rhnr_inicial = monta_estacoes_com_tipologia(
+        snapshot.selecao_inicial, snapshot.tipologia
+    )
+    df_rhnr_proposta = monta_proposta_rhnr(
+        df_estacoes_proposta=formatar_campo_descricao(snapshot.proposta),
+        df_objs_especificos=snapshot.objetivos_especificos,
+        df_tipo_estacoes=snapshot.tipologia,
+        df_filtro=df_rhnr_inicial,
+        grafo_redundancia=grafo_redundancia,
+    )
+    df_painel = adiciona_estacoes_rhrn_inicial_e_validadas(
+        df_rhnr_inicial=df_rhnr_inicial,
+        df_estacoes_validadas=monta_estacoes_com_tipologia(
+            snapshot.validadas, snapshot.tipologia
+        ),
+        df_rhnr_proposta=df_rhnr_proposta,
+    )
+    df_painel["Tipologia Divergente?"] = verifica_divergencia_tipologia(df_painel)
+    return adiciona_grupo_redundancia(df_painel, grafo_redundancia)
+
+
+def atualiza_painel_revisao_rhnr(engine: Engine) -> int:
+    """Recalcula a tabela `painel_revisao_rhnr` a partir dos dados do banco local."""
+    df_painel = monta_painel_revisao_rhnr(retorna_snapshot_dados_app(engine))
+    df_painel = df_painel[list(COLUNAS_PAINEL_REVISAO_RHNR)].rename(
+        columns=COLUNAS_PAINEL_REVISAO_RHNR
+    )
+    registros = (
+        df_painel.astype(object).where(df_painel.notna(), None).to_dict("records")
+    )
+
+    with engine.begin() as connection:
+        connection.execute(delete(PainelRevisaoRHNR))
+        if registros:
+            connection.execute(insert(PainelRevisaoRHNR), registros)
+
+    return len(registros)
+
+
+if __name__ == "__main__":
+    url = f"sqlite:///{Path(__file__).parent / 'database.db'}"
+    engine = create_engine(url=url)
+    PainelRevisaoRHNR.__table__.create(bind=engine, checkfirst=True)
+    total_estacoes = atualiza_painel_revisao_rhnr(engine)
+    print(f"Painel de revisão da RHNR atualizado com {total_estacoes} estações")
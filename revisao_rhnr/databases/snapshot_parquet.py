@@ -0,0 +1,113 @@
+"""Snapshot em Parquet das tabelas de estações e da tabela final de revisão da RHNR.
+
+Cada conjunto de dados é gravado como um dataset Parquet particionado por bacia
+(`<destino>/<tabela>/Bacia=<nome>/*.parquet`), com o esquema Arrow derivado dos
+dtypes aplicados na leitura do banco. Assim as análises ad hoc leem os arquivos
+(ver `analise_duckdb`) em vez de consultar o SQLite usado pelo app.
+"""
+
+import argparse
+import shutil
+from pathlib import Path
+
+import pandas as pd
+from sqlalchemy import Engine, create_engine
+
+from revisao_rhnr.databases.database_access import (
+    ESQUEMA_TABELA_RHNR_PROPOSTA,
+    categorias_de_texto,
+    retorna_snapshot_dados_app,
+)
+from revisao_rhnr.databases.painel_revisao_rhnr import monta_painel_revisao_rhnr
+
+DIRETORIO_SNAPSHOT = Path(__file__).parent / "snapshot_parquet"
+COLUNA_PARTICAO = "Bacia"
+
+
+def _aplica_esquema(df: pd.DataFrame) -> pd.DataFrame:
+    """Reaplica os dtypes da tabela de revisão, perdidos nas concatenações."""
+    esquema = {
+        coluna: dtype
+        for coluna, dtype in ESQUEMA_TABELA_RHNR_PROPOSTA.items()
+        if coluna in df.columns
+    }
+    df = df.astype(esquema)
+    # Categorias de colunas sem nenhum valor continuam texto (ver
+    # `categorias_de_texto`), e não DOUBLE no Parquet.
+    return df.assign(
+        **{
+            coluna: categorias_de_texto(df[coluna])
+            for coluna, dtype in esquema.items()
+            if dtype == "category"
+        }
+    )
+
+
+def monta_tabelas_snapshot(engine: Engine) -> dict[str, pd.DataFrame]:
+    """Lê as tabelas do app em uma única transação e monta a tabela final."""
+    snapshot = retorna_snapshot_dados_app(engine)
+    return {
+        "estacoes_selecao_inicial": snapshot.selecao_inicial,
+        "estacoes_validadas": snapshot.validadas,
+        "estacoes_proposta": snapshot.proposta,
+        "tipologia_estacoes": snapshot.tipologia,
+        "objetivos_especificos": snapshot.objetivos_especificos,
+        "estacoes_redundantes": snapshot.redundancias,
+        "painel_revisao_rhnr": _aplica_esquema(monta_painel_revisao_rhnr(snapshot)),
+    }
+
+
+def escreve_dataset_parquet(df: pd.DataFrame, destino: Path) -> None:
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError as erro:
+        raise ImportError(
+            "O snapshot em Parquet requer o pacote pyarrow (pip install pyarrow)."
+        ) from erro
+
+    tabela = pa.Table.from_pandas(df, preserve_index=False)
+    particionamento = None
+    if COLUNA_PARTICAO in tabela.column_names:
+        # A coluna de partição vira o nome dos diretórios e precisa ser texto
+        # simples, não dicionário (categoria do pandas).
+        posicao = tabela.schema.get_field_index(COLUNA_PARTICAO)
+        tabela = tabela.set_column(
+            posicao, COLUNA_PARTICAO, tabela[COLUNA_PARTICAO].cast(pa.string())
+        )
+        particionamento = ds.partitioning(
+            pa.schema([(COLUNA_PARTICAO, pa.string())]), flavor="hive"
+        )
+
+    # Remove partições de snapshots anteriores, inclusive de bacias que sumiram.
+    shutil.rmtree(destino, ignore_errors=True)
+    ds.write_dataset(
+        tabela,
+        destino,
+        format="parquet",
+        partitioning=particionamento,
+        existing_data_behavior="overwrite_or_ignore",
+    )
+
+
+def escreve_snapshot_parquet(
+    engine: Engine, destino: Path = DIRETORIO_SNAPSHOT
+) -> dict[str, int]:
+    """Grava todas as tabelas do snapshot e retorna o número de linhas de cada."""
+    tabelas = monta_tabelas_snapshot(engine)
+    for nome, df in tabelas.items():
+        escreve_dataset_parquet(df, destino / nome)
+    return {nome: len(df) for nome, df in tabelas.items()}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Grava o snapshot em Parquet, particionado por bacia."
+    )
+    parser.add_argument("destino", nargs="?", type=Path, default=DIRETORIO_SNAPSHOT)
+    args = parser.parse_args()
+
+    url = f"sqlite:///{Path(__file__).parent / 'database.db'}"
+    engine = create_engine(url=url)
+    for nome, total_linhas in escreve_snapshot_parquet(engine, args.destino).items():
+        print(f"{nome}: {total_linhas} linhas")
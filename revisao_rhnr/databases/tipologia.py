@@ -0,0 +1,83 @@
+"""Representação canônica da tipologia das estações fluviométricas como máscara de bits.
+
+Cada sigla de tipologia ocupa um bit (F=1, D=2, S=4, Q=8, T=16), de modo que a
+ordem das letras deixa de importar e consultas como "tem D mas não tem Q"
+viram operações bit a bit em NumPy.
+"""
+
+from enum import IntFlag
+
+import numpy as np
+import pandas as pd
+
+
+class TipologiaEstacao(IntFlag):
+    F = 1  # Escala
+    D = 2  # Descarga líquida
+    S = 4  # Sedimentos
+    Q = 8  # Qualidade da água
+    T = 16  # Telemétrica
+
+
+SIGLAS_TIPOLOGIA = "".join(tipologia.name for tipologia in TipologiaEstacao)
+
+# Sigla canônica de cada uma das 32 máscaras possíveis, usada na decodificação.
+_SIGLA_POR_MASCARA = np.array(
+    [
+        "".join(tipologia.name for tipologia in TipologiaEstacao if mascara & tipologia)
+        for mascara in range(1 << len(TipologiaEstacao))
+    ],
+    dtype=object,
+)
+
+
+def codifica_tipologia(siglas: pd.Series) -> pd.Series:
+    """Converte siglas como "FDQST" na máscara de bits (UInt8); nulos viram <NA>."""
+    siglas = siglas.astype("string").str.upper()
+    preenchidas = siglas.fillna("")
+    mascaras = np.zeros(len(siglas), dtype=np.uint8)
+    for tipologia in TipologiaEstacao:
+        tem_tipologia = preenchidas.str.contains(tipologia.name, regex=False)
+        mascaras |= tem_tipologia.to_numpy(dtype=bool) * np.uint8(tipologia.value)
+    return pd.Series(mascaras, index=siglas.index, dtype="UInt8").mask(siglas.isna())
+
+
+def decodifica_tipologia(mascaras: pd.Series) -> pd.Series:
+    """Converte máscaras de bits em siglas na ordem canônica "FDSQT"."""
+    nulos = mascaras.isna()
+    siglas = _SIGLA_POR_MASCARA[mascaras.fillna(0).to_numpy(dtype=np.uint8)]
+    return pd.Series(siglas, index=mascaras.index, dtype=object).mask(nulos, None)
+
+
+def filtra_tipologia(
+    mascaras: pd.Series,
+    inclui: TipologiaEstacao | None = None,
+    exclui: TipologiaEstacao | None = None,
+) -> pd.Series:
+    """Seleciona as estações com todas as tipologias de `inclui` e nenhuma de `exclui`.
+
+    Exemplo: `filtra_tipologia(mascaras, inclui=TipologiaEstacao.D,
+    exclui=TipologiaEstacao.Q)` retorna as estações com D e sem Q.
+    """
+    inclui = inclui or TipologiaEstacao(0)
+    exclui = exclui or TipologiaEstacao(0)
+    valores = mascaras.fillna(0).to_numpy(dtype=np.uint8)
+    selecionadas = ((valores & inclui.value) == inclui.value) & (
+        (valores & exclui.value) == 0
+    )
+    return pd.Series(selecionadas, index=mascaras.index) & mascaras.notna()
+
+
+def verifica_divergencia_tipologia(
+    df: pd.DataFrame,
+    coluna_atual: str = "Tipologia Atual",
+    coluna_mapeada: str = "Tipologia Mapeada",
+) -> pd.Series:
+    """Indica as estações cuja tipologia atual difere da tipologia mapeada.
+
+    A comparação é feita sobre as máscaras, então "FDQS" e "FDSQ" são
+    equivalentes. Estações sem uma das duas tipologias não são marcadas.
+    """
+    mascara_atual = codifica_tipologia(df[coluna_atual])
+    mascara_mapeada = codifica_tipologia(df[coluna_mapeada])
+    return (mascara_atual != mascara_mapeada).fillna(False).astype(bool)
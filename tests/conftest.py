@@ -0,0 +1,119 @@
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, insert
+
+from revisao_rhnr.databases import models_sqlite
+from revisao_rhnr.databases.alimentacao_tabelas_bd_bases_cplar.constantes import (
+    COLS_OBJS_ESPECIFICOS,
+)
+
+
+@pytest.fixture
+def engine_local(tmp_path):
+    """Banco local (SQLite) com quatro estações e nenhuma tipologia proposta."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'database.db'}")
+    models_sqlite.Base.metadata.create_all(engine)
+    estacao = {
+        "codigo_adicional": None,
+        "latitude": -10.0,
+        "longitude": -40.0,
+        "altitude": None,
+        "area_drenagem": None,
+        "subbacia_codigo": 1,
+        "estado_codigo": 1,
+        "municipio_codigo": 1,
+        "ultima_atualizacao": date(2024, 1, 1),
+        "historico": "",
+    }
+    with engine.begin() as connection:
+        connection.execute(
+            insert(models_sqlite.Entidade),
+            [{"codigo": 1, "nome": "Agência", "sigla": "ANA"}],
+        )
+        connection.execute(
+            insert(models_sqlite.Bacia),
+            [{"codigo": 1, "nome": "Doce"}, {"codigo": 2, "nome": "Paraná"}],
+        )
+        connection.execute(
+            insert(models_sqlite.EstacaoFlu),
+            [
+                {"codigo": 1, "nome": "Um", "bacia_codigo": 1, "operando": 1}
+                | {"descricao": "RHNR", **estacao},
+                {"codigo": 2, "nome": "Dois", "bacia_codigo": 2, "operando": 0}
+                | {"descricao": "", **estacao},
+                {"codigo": 3, "nome": "Três", "bacia_codigo": 1, "operando": 1}
+                | {"descricao": "RHNR", **estacao},
+                {"codigo": 4, "nome": "Quatro", "bacia_codigo": 2, "operando": 1}
+                | {"descricao": "", **estacao},
+            ],
+        )
+        connection.execute(
+            insert(models_sqlite.Responsavel),
+            [
+                {
+                    "codigo_estacao": codigo,
+                    "responsavel_codigo": 1,
+                    "responsavel_unidade": None,
+                    "responsavel_jurisdicao": None,
+                }
+                for codigo in (1, 2, 3, 4)
+            ],
+        )
+        connection.execute(
+            insert(models_sqlite.TipoEstacaoFlu),
+            [
+                {
+                    "codigo_estacao": codigo,
+                    "escala": True,
+                    "registrador_nivel": False,
+                    "descarga_liquida": codigo != 2,
+                    "sedimentos": False,
+                    "qualidade_agua": False,
+                    "telemetrica": False,
+                }
+                for codigo in (1, 2, 3, 4)
+            ],
+        )
+        connection.execute(
+            insert(models_sqlite.EstacaoRHNRSelecaoInicial),
+            [
+                {"codigo": codigo} | {f"objetivo{i}": i % 2 for i in range(1, 7)}
+                for codigo in (1, 4)
+            ],
+        )
+        connection.execute(
+            insert(models_sqlite.EstacaoPropostaRHNR),
+            [
+                {
+                    "codigo": 1,
+                    "tipo_estacao": "FD",
+                    "proposta_tipo": None,
+                    "proposta_integra_rhnr": True,
+                    "proposta_operacao": "Manter",
+                },
+                {
+                    "codigo": 2,
+                    "tipo_estacao": "F",
+                    "proposta_tipo": None,
+                    "proposta_integra_rhnr": False,
+                    "proposta_operacao": "Desativar",
+                },
+            ],
+        )
+        connection.execute(
+            insert(models_sqlite.ObjetivoEspecificoEstacaoProposta),
+            [
+                {"codigo": codigo, "tipo_mapeamento": "Manual"}
+                | {
+                    coluna: int(nome == "1a")
+                    for nome, coluna in COLS_OBJS_ESPECIFICOS.items()
+                }
+                for codigo in (1, 2)
+            ],
+        )
+        connection.execute(
+            insert(models_sqlite.EstacaoRedundante),
+            [{"codigo": 1, "codigo_redundante": 2, "tipo_estacao": "F"}],
+        )
+    return engine
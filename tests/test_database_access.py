@@ -0,0 +1,134 @@
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, insert, select, update
+from sqlalchemy.pool import StaticPool
+
+from revisao_rhnr.databases import database_access, models_sqlite
+from revisao_rhnr.databases.models_sqlite import EstacaoFlu, EstacaoRedundante
+
+
+def test_categoria_sem_valores_continua_texto(engine_local):
+    pa = pytest.importorskip("pyarrow")
+
+    df = database_access.retorna_dataframe(
+        engine_local, database_access.CONSULTA_ESTACOES_RHNR_PROPOSTA
+    )
+
+    assert df["Tipologia Proposta"].isna().all()
+    assert isinstance(df["Tipologia Proposta"].dtype, pd.CategoricalDtype)
+    assert df["Tipologia Proposta"].cat.categories.dtype == "string"
+    assert pa.Table.from_pandas(df).schema.field(
+        "Tipologia Proposta"
+    ).type == pa.dictionary(pa.int8(), pa.string())
+
+
+def test_categorias_de_texto_reaplicadas_a_coluna_vazia():
+    coluna = pd.Series([None, None], dtype=object).astype("category")
+
+    categorias = database_access.categorias_de_texto(coluna)
+
+    assert categorias.categories.dtype == "string"
+    assert pd.isna(categorias).all()
+
+
+def test_rhnr_implementada_sem_distincao_de_maiusculas(engine_local):
+    descricoes = {1: "RHNR", 2: "", 3: "rede rhnr", 4: "Rhnr (2019)"}
+    with engine_local.begin() as connection:
+        for codigo, descricao in descricoes.items():
+            connection.execute(
+                update(EstacaoFlu)
+                .where(EstacaoFlu.codigo == codigo)
+                .values(descricao=descricao)
+            )
+        com_like = connection.scalars(
+            select(EstacaoFlu.codigo).where(EstacaoFlu.descricao.like("%RHNR%"))
+        ).all()
+
+    validadas = database_access.retorna_dataframe(
+        engine_local, database_access.CONSULTA_ESTACOES_VALIDADAS_RHNR
+    )
+
+    assert sorted(validadas["Código da Estação"]) == sorted(com_like) == [1, 3, 4]
+    assert validadas["RHNR Implementada"].all()
+
+
+def test_dataframe_colunar_usa_o_esquema_da_tabela(engine_local):
+    df = database_access.retorna_dataframe(
+        engine_local, database_access.CONSULTA_ESTACOES_RHNR_PROPOSTA
+    )
+
+    assert df["Código da Estação"].tolist() == [1, 2]
+    assert df["Código da Estação"].dtype == "int32"
+    assert df["Nome"].dtype == object
+    assert df["Operando"].dtype == "Int8"
+    assert df["Integra RHNR?"].dtype == "boolean"
+    assert df["Integra RHNR?"].tolist() == [True, False]
+    assert isinstance(df["Ação Proposta"].dtype, pd.CategoricalDtype)
+    assert df["Ação Proposta"].tolist() == ["Manter", "Desativar"]
+
+
+def test_dataframe_colunar_usa_os_tipos_da_consulta(engine_local):
+    df = database_access.retorna_dataframe(
+        engine_local, database_access.CONSULTA_ESTACOES_REDUNDANTES
+    )
+
+    assert df.dtypes.to_dict() == {
+        "Código da Estação": "int32",
+        "Código Redundante": "Int64",
+        "Tipo da Estação Redundante": object,
+    }
+    assert df.to_dict("records") == [
+        {
+            "Código da Estação": 1,
+            "Código Redundante": 2,
+            "Tipo da Estação Redundante": "F",
+        }
+    ]
+
+
+def test_dataframe_colunar_vazio_mantem_colunas_e_dtypes(engine_local):
+    consulta = database_access.CONSULTA_ESTACOES_REDUNDANTES.where(
+        EstacaoRedundante.codigo == -1
+    )
+
+    df = database_access.retorna_dataframe(engine_local, consulta)
+
+    assert df.empty
+    assert df.columns.tolist() == [
+        "Código da Estação",
+        "Código Redundante",
+        "Tipo da Estação Redundante",
+    ]
+    assert df["Código Redundante"].dtype == "Int64"
+
+
+def test_versao_dados_do_arquivo_muda_apos_escrita(engine_local):
+    versao = database_access.retorna_versao_dados(engine_local)
+    database_access.retorna_dataframe(
+        engine_local, database_access.CONSULTA_ESTACOES_RHNR_PROPOSTA
+    )
+
+    assert database_access.retorna_versao_dados(engine_local) == versao
+
+    with engine_local.begin() as connection:
+        connection.execute(
+            update(EstacaoFlu).where(EstacaoFlu.codigo == 2).values(operando=1)
+        )
+
+    assert database_access.retorna_versao_dados(engine_local) != versao
+
+
+def test_versao_dados_sem_arquivo_usa_contagens():
+    engine = create_engine("sqlite://", poolclass=StaticPool)
+    models_sqlite.Base.metadata.create_all(engine)
+    versao = database_access.retorna_versao_dados(engine)
+
+    assert database_access.retorna_versao_dados(engine) == versao
+
+    with engine.begin() as connection:
+        connection.execute(
+            insert(EstacaoRedundante),
+            [{"codigo": 1, "codigo_redundante": 2, "tipo_estacao": "F"}],
+        )
+
+    assert database_access.retorna_versao_dados(engine) != versao
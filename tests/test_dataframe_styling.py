@@ -0,0 +1,79 @@
+import pandas as pd
+import pytest
+
+from revisao_rhnr.app.paginas.dataframe_styling import highlight_rows_by_category
+
+
+@pytest.fixture
+def df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Código": [1, 2, 3, 4, 5],
+            "Integra RHNR?": pd.array([True, False, None, True, False], "boolean"),
+            "Bacia": pd.Categorical(["Doce", "Paraná", None, "Doce", "Outra"]),
+        },
+        index=[10, 20, 30, 40, 50],
+    )
+
+
+def _estilos_por_linha(estilos: pd.DataFrame) -> list[str]:
+    assert (estilos.nunique(axis=1, dropna=False) == 1).all()
+    return estilos.iloc[:, 0].tolist()
+
+
+def test_cor_por_categoria(df):
+    estilos = highlight_rows_by_category(
+        df, "Integra RHNR?", [True, False, None], ["green", "red", "gray"]
+    )
+
+    assert estilos.index.equals(df.index) and estilos.columns.equals(df.columns)
+    assert _estilos_por_linha(estilos) == [
+        "background-color: green",
+        "background-color: red",
+        "background-color: gray",
+        "background-color: green",
+        "background-color: red",
+    ]
+
+
+def test_valores_sem_cor_ficam_sem_estilo(df):
+    estilos = highlight_rows_by_category(df, "Bacia", ["Doce"], ["blue"])
+
+    assert _estilos_por_linha(estilos) == [
+        "background-color: blue",
+        "",
+        "",
+        "background-color: blue",
+        "",
+    ]
+
+
+def test_valor_repetido_usa_a_primeira_cor(df):
+    estilos = highlight_rows_by_category(
+        df, "Bacia", ["Doce", "Paraná", "Doce"], ["blue", "yellow", "red"]
+    )
+
+    assert _estilos_por_linha(estilos)[:2] == [
+        "background-color: blue",
+        "background-color: yellow",
+    ]
+
+
+def test_cores_sao_repetidas_em_ciclo(df):
+    estilos = highlight_rows_by_category(
+        df, "Bacia", ["Doce", "Paraná", "Outra"], ["blue", "yellow"]
+    )
+
+    assert _estilos_por_linha(estilos)[-1] == "background-color: blue"
+
+
+def test_uso_com_styler(df):
+    html = df.style.apply(
+        highlight_rows_by_category,
+        column="Bacia",
+        match_values=["Paraná"],
+        colors=["yellow"],
+        axis=None,
+    ).to_html()
+
+    assert "background-color: yellow" in html
@@ -0,0 +1,91 @@
+from io import BytesIO
+
+import pandas as pd
+import pytest
+from openpyxl import load_workbook
+
+from revisao_rhnr.app import exportacao
+
+
+@pytest.fixture
+def df() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "Código da Estação": pd.array([1, 2, 3], dtype="int32"),
+            "Nome": ["São João", "Três Marias", None],
+            "Bacia": pd.Categorical(["Doce", "Paraná", "Doce"]),
+            "Integra RHNR?": pd.array([True, None, False], dtype="boolean"),
+            "Grupo Redundância": pd.array([1, None, 1], dtype="Int32"),
+        }
+    )
+
+
+@pytest.fixture(autouse=True)
+def lotes_pequenos(monkeypatch):
+    # Força mais de um lote mesmo com poucas linhas.
+    monkeypatch.setattr(exportacao, "_TAMANHO_LOTE", 2)
+
+
+def test_exporta_xlsx(df):
+    planilha = load_workbook(BytesIO(exportacao.exporta_tabela(df, "xlsx"))).active
+
+    assert list(planilha.values) == [
+        tuple(df.columns),
+        (1, "São João", "Doce", True, 1),
+        (2, "Três Marias", "Paraná", None, None),
+        (3, None, "Doce", False, 1),
+    ]
+
+
+def test_exporta_csv(df):
+    conteudo = exportacao.exporta_tabela(df, "csv")
+
+    assert conteudo.startswith("\ufeff".encode())
+    lido = pd.read_csv(BytesIO(conteudo), encoding="utf-8-sig")
+    assert lido.columns.tolist() == df.columns.tolist()
+    assert lido["Nome"].tolist()[:2] == ["São João", "Três Marias"]
+    assert len(lido) == len(df)
+
+
+def test_exporta_parquet(df):
+    pytest.importorskip("pyarrow")
+
+    lido = pd.read_parquet(BytesIO(exportacao.exporta_tabela(df, "parquet")))
+
+    pd.testing.assert_frame_equal(lido, df)
+
+
+def test_exporta_somente_a_selecao_quando_pedido(engine_local, monkeypatch):
+    data = pytest.importorskip("revisao_rhnr.app.data")
+    from revisao_rhnr.databases.painel_revisao_rhnr import (
+        atualiza_painel_revisao_rhnr,
+    )
+
+    atualiza_painel_revisao_rhnr(engine_local)
+    exportadas = []
+
+    def exporta_tabela(df, formato):
+        exportadas.append(df["Código da Estação"].tolist())
+        return exportacao.exporta_tabela(df, formato)
+
+    monkeypatch.setattr(data, "exporta_tabela", exporta_tabela)
+    for funcao in (
+        data.get_painel_revisao_rhnr,
+        data.get_indice_painel_revisao_rhnr,
+        data.get_exportacao_painel_revisao_rhnr,
+    ):
+        funcao.clear()
+    filtros = (("Bacia", ("Doce",)),)
+
+    conteudo = data.get_exportacao_painel_revisao_rhnr(
+        engine_local, "v1", filtros, "todos", "csv"
+    )
+    data.get_exportacao_painel_revisao_rhnr(engine_local, "v1", filtros, "todos", "csv")
+
+    assert exportadas == [[1, 3]]
+    lido = pd.read_csv(BytesIO(conteudo), encoding="utf-8-sig")
+    assert lido["Código da Estação"].tolist() == [1, 3]
+
+    data.get_exportacao_painel_revisao_rhnr(engine_local, "v1", (), "todos", "csv")
+
+    assert exportadas == [[1, 3], [1, 2, 3, 4]]
@@ -0,0 +1,89 @@
+import numpy as np
+import pandas as pd
+
+from revisao_rhnr.databases.grafo_redundancia import (
+    SEM_GRUPO,
+    GrafoRedundancia,
+    adiciona_grupo_redundancia,
+    grupos_com_varias_mantidas,
+)
+
+# Dois grupos (10-20-30 em cadeia e 40-50), uma aresta repetida nos dois
+# sentidos e um laço (60-60), que não forma grupo.
+PARES = pd.DataFrame(
+    {
+        "Código da Estação": [10, 20, 20, 40, 50, 60],
+        "Código Redundante": [20, 30, 10, 50, 40, 60],
+    }
+)
+
+
+def test_grupos_sao_as_componentes_conexas():
+    grafo = GrafoRedundancia.de_dataframe(PARES)
+
+    assert grafo.total_grupos == 2
+    np.testing.assert_array_equal(
+        grafo.grupo_das_estacoes([10, 20, 30, 40, 50, 60, 99]),
+        [0, 0, 0, 1, 1, SEM_GRUPO, SEM_GRUPO],
+    )
+
+
+def test_adjacencia_sem_repeticao_nem_lacos():
+    grafo = GrafoRedundancia.de_dataframe(PARES)
+
+    np.testing.assert_array_equal(grafo.codigos, [10, 20, 30, 40, 50, 60])
+    np.testing.assert_array_equal(grafo.indptr, [0, 1, 3, 4, 5, 6, 6])
+    np.testing.assert_array_equal(grafo.indices, [1, 0, 2, 1, 4, 3])
+
+
+def test_redundantes_com():
+    grafo = GrafoRedundancia.de_dataframe(PARES)
+
+    np.testing.assert_array_equal(grafo.redundantes_com(10), [20])
+    np.testing.assert_array_equal(grafo.redundantes_com(20), [10, 30])
+    np.testing.assert_array_equal(grafo.redundantes_com(10, transitivo=True), [20, 30])
+    assert grafo.redundantes_com(60).size == 0
+    assert grafo.redundantes_com(99, transitivo=True).size == 0
+
+
+def test_estacoes_por_grupo():
+    grafo = GrafoRedundancia.de_dataframe(PARES)
+
+    assert grafo.estacoes_por_grupo().to_dict("list") == {
+        "Grupo Redundância": [1, 1, 1, 2, 2],
+        "Código da Estação": [10, 20, 30, 40, 50],
+    }
+
+
+def test_grafo_vazio():
+    grafo = GrafoRedundancia([], [])
+
+    assert grafo.total_grupos == 0
+    np.testing.assert_array_equal(grafo.grupo_das_estacoes([1]), [SEM_GRUPO])
+    assert grafo.estacoes_por_grupo().empty
+
+
+def test_adiciona_grupo_redundancia():
+    grafo = GrafoRedundancia.de_dataframe(PARES)
+    df = pd.DataFrame({"Código da Estação": [30, 99, 40]})
+
+    df = adiciona_grupo_redundancia(df, grafo)
+
+    assert df["Grupo Redundância"].dtype == "Int32"
+    assert df["Grupo Redundância"].tolist() == [1, pd.NA, 2]
+
+
+def test_grupos_com_varias_mantidas():
+    grafo = GrafoRedundancia.de_dataframe(PARES)
+    df_revisao = pd.DataFrame(
+        {
+            "Código da Estação": [10, 20, 30, 40, 50],
+            "Integra RHNR?": pd.array([True, None, True, True, False]),
+        }
+    )
+
+    np.testing.assert_array_equal(grafo.grupos_com_varias_mantidas([10, 30, 40]), [0])
+    resultado = grupos_com_varias_mantidas(df_revisao, grafo)
+
+    assert resultado["Código da Estação"].tolist() == [10, 20, 30]
+    assert resultado["Grupo Redundância"].unique().tolist() == [1]
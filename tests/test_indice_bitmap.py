@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from revisao_rhnr.app.indice_bitmap import IndiceBitmap
+
+COLUNAS = ["Bacia", "Integra RHNR?", "Operando"]
+
+
+@pytest.fixture
+def df() -> pd.DataFrame:
+    gerador = np.random.default_rng(0)
+    total = 203  # fora de múltiplos de 8, para testar o fim do bitset
+    return pd.DataFrame(
+        {
+            "Bacia": pd.Categorical(
+                gerador.choice(["Doce", "Paraná", "São Francisco", None], total)
+            ),
+            "Integra RHNR?": pd.array(
+                gerador.choice([True, False, None], total), dtype="boolean"
+            ),
+            "Operando": pd.array(gerador.choice([0, 1], total), dtype="Int8"),
+        }
+    )
+
+
+def _mascara(df: pd.DataFrame, coluna: str, valores: list) -> pd.Series:
+    mascara = df[coluna].isin([valor for valor in valores if valor is not None])
+    if None in valores:
+        mascara |= df[coluna].isna()
+    return mascara.fillna(False).astype(bool)
+
+
+@pytest.mark.parametrize(
+    "filtros",
+    [
+        {"Bacia": ["Doce"]},
+        {"Bacia": ["Doce", None]},
+        {"Bacia": ["Paraná"], "Integra RHNR?": [True, None]},
+        {"Bacia": ["São Francisco"], "Integra RHNR?": [False], "Operando": [1]},
+        {"Bacia": ["Doce"], "Operando": []},
+    ],
+)
+@pytest.mark.parametrize("modo", ["todos", "algum"])
+def test_filtra_igual_a_mascara_do_pandas(df, filtros, modo):
+    indice = IndiceBitmap(df, COLUNAS)
+    mascaras = [
+        _mascara(df, coluna, valores) for coluna, valores in filtros.items() if valores
+    ]
+    combina = np.logical_and if modo == "todos" else np.logical_or
+    esperado = combina.reduce(mascaras)
+
+    selecao = indice.filtra(filtros, modo)
+
+    np.testing.assert_array_equal(indice.linhas(selecao), np.flatnonzero(esperado))
+    assert indice.conta(selecao) == esperado.sum()
+
+
+def test_sem_filtros_seleciona_todas_as_linhas(df):
+    indice = IndiceBitmap(df, COLUNAS)
+
+    selecao = indice.filtra({"Bacia": []})
+
+    assert indice.conta(selecao) == len(df)
+    np.testing.assert_array_equal(indice.linhas(selecao), np.arange(len(df)))
+
+
+def test_valor_inexistente_nao_seleciona_nada(df):
+    indice = IndiceBitmap(df, COLUNAS)
+
+    assert indice.conta(indice.filtra({"Bacia": ["Amazonas"]})) == 0
+
+
+def test_valores_e_contagens(df):
+    indice = IndiceBitmap(df, COLUNAS)
+
+    assert indice.valores("Bacia") == ["Doce", "Paraná", "São Francisco", None]
+    contagens = df["Bacia"].value_counts(dropna=False)
+    assert indice.contagens("Bacia") == {
+        (None if pd.isna(valor) else valor): total for valor, total in contagens.items()
+    }
+
+
+def test_contagens_dentro_da_selecao(df):
+    indice = IndiceBitmap(df, COLUNAS)
+    selecao = indice.filtra({"Operando": [1]})
+
+    contagens = df.loc[df["Operando"] == 1, "Integra RHNR?"].value_counts(dropna=False)
+    esperado = {
+        (None if pd.isna(valor) else bool(valor)): total
+        for valor, total in contagens.items()
+    }
+
+    assert indice.contagens("Integra RHNR?", selecao) == esperado
+    assert set(indice.valores_presentes("Integra RHNR?", selecao)) == set(esperado)
+
+
+def test_dataframe_vazio():
+    indice = IndiceBitmap(
+        pd.DataFrame({"Bacia": pd.Series([], dtype=object)}), ["Bacia"]
+    )
+
+    assert indice.valores("Bacia") == []
+    assert indice.contagens("Bacia") == {}
+    assert indice.conta(indice.filtra({"Bacia": ["Doce"]})) == 0
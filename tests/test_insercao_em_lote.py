@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, select
+
+from revisao_rhnr.databases.alimentacao_tabelas_bd_bases_cplar.insercao_em_lote import (
+    insere_novas,
+    insere_ou_atualiza,
+)
+
+metadata = MetaData()
+estacoes = Table(
+    "estacoes",
+    metadata,
+    Column("codigo", Integer, primary_key=True),
+    Column("tipo", String),
+    Column("observacao", String),
+)
+
+
+@pytest.fixture
+def connection():
+    engine = create_engine("sqlite://")
+    metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            estacoes.insert(), [{"codigo": 1, "tipo": "F", "observacao": "antiga"}]
+        )
+        yield connection
+
+
+def _linhas(connection) -> list[tuple]:
+    return connection.execute(select(estacoes).order_by(estacoes.c.codigo)).all()
+
+
+def test_insere_novas_mantem_as_existentes(connection):
+    inseridas = insere_novas(
+        connection,
+        estacoes,
+        [
+            {"codigo": 1, "tipo": "FD", "observacao": "nova"},
+            {"codigo": 2, "tipo": "FD", "observacao": "nova"},
+        ],
+    )
+
+    assert inseridas == [2]
+    assert _linhas(connection) == [(1, "F", "antiga"), (2, "FD", "nova")]
+
+
+def test_insere_ou_atualiza_sobrescreve_so_as_colunas_do_lote(connection):
+    gravadas = insere_ou_atualiza(
+        connection, estacoes, [{"codigo": 1, "tipo": "FDQ"}, {"codigo": 3, "tipo": "F"}]
+    )
+
+    assert sorted(gravadas) == [1, 3]
+    assert _linhas(connection) == [(1, "FDQ", "antiga"), (3, "F", None)]
+
+
+def test_lote_vazio(connection):
+    assert insere_novas(connection, estacoes, []) == []
+    assert insere_ou_atualiza(connection, estacoes, []) == []
+    assert _linhas(connection) == [(1, "F", "antiga")]
+
+
+def test_dialeto_nao_suportado():
+    connection = SimpleNamespace(dialect=SimpleNamespace(name="mssql"))
+
+    with pytest.raises(NotImplementedError, match="mssql"):
+        insere_novas(connection, estacoes, [{"codigo": 1}])
@@ -0,0 +1,111 @@
+from datetime import datetime
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+from revisao_rhnr.databases.alimentacao_tabelas_bd_bases_cplar import (
+    leitura_planilhas,
+)
+
+COLUNAS = ["Código", "Tipo", "Nota", "Data"]
+
+
+@pytest.fixture
+def planilha(tmp_path):
+    """Planilha com título antes do cabeçalho, nulos, linhas vazias e colunas extras."""
+    workbook = Workbook()
+    aba = workbook.active
+    aba.append(["Revisão da RHNR"])
+    aba.append([])
+    aba.append(["Código", "Ignorada", "Tipo", "Nota", "Data", "Extra"])
+    aba.append([10, "x", "FD", 1, datetime(2020, 1, 1), "z"])
+    aba.append(["NOVA", "x", "-", 1.5, None, "z"])
+    aba.append([])
+    aba.append([99999999, "x", " --", "***", datetime(2020, 1, 3), "z"])
+    aba.append([12, None, "P", 2, datetime(2020, 1, 4)])
+    aba.append([])
+    aba.append([])
+    # Só a coluna ignorada preenchida: a linha existe para o pandas.
+    aba.append([None, "só aqui"])
+    aba.append([])
+    caminho = tmp_path / "planilha.xlsx"
+    workbook.save(caminho)
+    return caminho
+
+
+def test_igual_ao_read_excel(planilha):
+    esperado = pd.read_excel(
+        planilha, skiprows=2, usecols=COLUNAS, na_values=leitura_planilhas.VALORES_NULOS
+    )
+
+    obtido = leitura_planilhas.le_planilha_excel(planilha, COLUNAS, skip_rows=2)
+
+    pd.testing.assert_frame_equal(obtido, esperado)
+    assert obtido["Código"].isna().tolist() == [
+        False,
+        True,
+        True,
+        True,
+        False,
+        True,
+        True,
+        True,
+    ]
+
+
+def test_colunas_na_ordem_da_planilha(planilha):
+    obtido = leitura_planilhas.le_planilha_excel(
+        planilha, ["Data", "Código"], skip_rows=2
+    )
+
+    assert obtido.columns.tolist() == ["Código", "Data"]
+
+
+def test_coluna_inexistente(planilha):
+    with pytest.raises(ValueError, match="Inexistente"):
+        leitura_planilhas.le_planilha_excel(
+            planilha, ["Código", "Inexistente"], skip_rows=2
+        )
+
+
+def test_aba_pelo_nome(tmp_path):
+    workbook = Workbook()
+    workbook.active.append(["Outra"])
+    aba = workbook.create_sheet("Revisão")
+    aba.append(["Código"])
+    aba.append([1])
+    caminho = tmp_path / "abas.xlsx"
+    workbook.save(caminho)
+
+    obtido = leitura_planilhas.le_planilha_excel(
+        caminho, ["Código"], sheet_name="Revisão"
+    )
+
+    assert obtido["Código"].tolist() == [1]
+
+
+@pytest.mark.filterwarnings("error")
+def test_cache_da_planilha(planilha, tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(leitura_planilhas, "DIRETORIO_CACHE", tmp_path / "cache")
+    lida = leitura_planilhas.le_planilha(planilha, ["Código", "Tipo"], skip_rows=2)
+    (arquivo_cache,) = (tmp_path / "cache").iterdir()
+
+    monkeypatch.setattr(
+        leitura_planilhas,
+        "le_planilha_excel",
+        lambda *args: pytest.fail("a planilha não mudou e devia vir do cache"),
+    )
+    do_cache = leitura_planilhas.le_planilha(planilha, ["Código", "Tipo"], skip_rows=2)
+
+    pd.testing.assert_frame_equal(do_cache, lida)
+    assert list((tmp_path / "cache").iterdir()) == [arquivo_cache]
+
+
+def test_sem_cache_nao_grava(planilha, tmp_path, monkeypatch):
+    monkeypatch.setattr(leitura_planilhas, "DIRETORIO_CACHE", tmp_path / "cache")
+
+    leitura_planilhas.le_planilha(planilha, ["Código"], skip_rows=2, usa_cache=False)
+
+    assert not (tmp_path / "cache").exists()
@@ -0,0 +1,97 @@
+import json
+from datetime import datetime
+
+import pytest
+
+from revisao_rhnr.databases import metricas_migracao
+from revisao_rhnr.databases.metricas_migracao import RelatorioMigracao, tamanho_lote
+
+
+@pytest.fixture
+def relatorio(monkeypatch):
+    instantes = iter([0.0, 2.0, 2.0, 2.5, 10.0, 11.0])
+    monkeypatch.setattr(metricas_migracao.time, "perf_counter", lambda: next(instantes))
+    relatorio = RelatorioMigracao("incremental", inicio=datetime(2024, 5, 1, 8, 30))
+    metricas = relatorio.metricas("estacao_flu")
+    with metricas.mede("leitura"):
+        metricas.linhas += 300
+    with metricas.mede("gravacao"):
+        metricas.bytes += 2_500_000
+    with relatorio.metricas("bacia").mede("leitura"):
+        pass
+    relatorio.metricas("estacao_flu").tentativas_extras += 1
+    relatorio.duracao, relatorio.tempo_painel = 4.0, 0.5
+    return relatorio
+
+
+def test_metricas_acumulam_por_etapa(relatorio):
+    metricas = relatorio.metricas("estacao_flu")
+
+    assert list(relatorio.tabelas) == ["estacao_flu", "bacia"]
+    assert (metricas.tempo_leitura, metricas.tempo_gravacao) == (2.0, 0.5)
+    assert metricas.linhas_por_segundo == 120.0
+    assert relatorio.metricas("bacia").linhas_por_segundo == 0.0
+
+
+def test_salva_json(relatorio, tmp_path, monkeypatch):
+    monkeypatch.setattr(metricas_migracao, "pico_rss_mb", lambda: 256.0)
+    caminho = tmp_path / "relatorio.json"
+
+    relatorio.salva_json(caminho)
+    conteudo = json.loads(caminho.read_text(encoding="utf-8"))
+
+    assert conteudo["modo"] == "incremental"
+    assert conteudo["inicio"] == "2024-05-01T08:30:00"
+    assert (conteudo["duracao"], conteudo["pico_rss_mb"]) == (4.0, 256.0)
+    assert [tabela["tabela"] for tabela in conteudo["tabelas"]] == [
+        "estacao_flu",
+        "bacia",
+    ]
+    assert conteudo["tabelas"][0] == {
+        "tabela": "estacao_flu",
+        "linhas": 300,
+        "bytes": 2_500_000,
+        "tempo_leitura": 2.0,
+        "tempo_transformacao": 0.0,
+        "tempo_gravacao": 0.5,
+        "tentativas_extras": 1,
+        "pico_rss_mb": None,
+        "linhas_por_segundo": 120.0,
+    }
+
+
+@pytest.mark.parametrize(("pico", "texto"), [(512.4, "512 MB"), (None, "n/d")])
+def test_resumo(relatorio, monkeypatch, pico, texto):
+    monkeypatch.setattr(metricas_migracao, "pico_rss_mb", lambda: pico)
+
+    cabecalho, estacao_flu, bacia, total = relatorio.resumo().splitlines()
+
+    assert cabecalho.split() == [
+        "Tabela",
+        "Linhas",
+        "Leitura",
+        "Transf.",
+        "Gravação",
+        "Linhas/s",
+        "MB",
+        "Retries",
+    ]
+    assert len(estacao_flu) == len(cabecalho)
+    assert estacao_flu.split() == [
+        "estacao_flu",
+        "300",
+        "2.00",
+        "0.00",
+        "0.50",
+        "120",
+        "2.5",
+        "1",
+    ]
+    assert bacia.split()[:2] == ["bacia", "0"]
+    assert total == f"Total: 4.00 s (painel 0.50 s), pico de memória: {texto}"
+
+
+def test_tamanho_lote():
+    lote = [{"nome": "Doce", "codigo": 1, "nulo": None}, {"dados": b"abc"}]
+
+    assert tamanho_lote(lote) == 4 + 8 + 3
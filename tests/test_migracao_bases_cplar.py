@@ -0,0 +1,211 @@
+import sqlite3
+from contextlib import closing
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, delete, event, insert, select, update
+
+from revisao_rhnr.databases import migracao_bases_cplar, models_postgres, models_sqlite
+
+
+@pytest.fixture
+def engine_origem(tmp_path):
+    """Bases CPLAR simuladas em SQLite, com os esquemas do Postgres anexados."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'origem.db'}")
+
+    @event.listens_for(engine, "connect")
+    def anexa_esquemas(dbapi_connection, connection_record):
+        for esquema in ("estacoes", "revisao_rhnr"):
+            dbapi_connection.execute(
+                f"ATTACH DATABASE '{tmp_path / esquema}.db' AS {esquema}"
+            )
+
+    models_postgres.Base.metadata.create_all(engine)
+    estacao = {
+        "codigo_adicional": None,
+        "latitude": -10.0,
+        "longitude": -40.0,
+        "altitude": None,
+        "area_drenagem": None,
+        "bacia_codigo": 1,
+        "subbacia_codigo": 1,
+        "estado_codigo": 1,
+        "municipio_codigo": 1,
+        "ultima_atualizacao": date(2024, 1, 1),
+        "operando": 1,
+        "historico": "",
+    }
+    with engine.begin() as connection:
+        connection.execute(
+            insert(models_postgres.Bacia), [{"codigo": 1, "nome": "Doce"}]
+        )
+        connection.execute(
+            insert(models_postgres.EstacaoFlu),
+            [
+                {"codigo": 1, "nome": "Um", "descricao": "RHNR", **estacao},
+                {"codigo": 2, "nome": "Dois", "descricao": "", **estacao},
+                {"codigo": 3, "nome": "Três", "descricao": "rhnr", **estacao},
+            ],
+        )
+        connection.execute(
+            insert(models_postgres.TipoEstacaoFlu),
+            [
+                {
+                    "codigo_estacao": codigo,
+                    "escala": True,
+                    "registrador_nivel": False,
+                    "descarga_liquida": codigo != 2,
+                    "sedimentos": False,
+                    "qualidade_agua": False,
+                    "telemetrica": codigo == 3,
+                }
+                for codigo in (1, 2, 3)
+            ],
+        )
+        connection.execute(
+            insert(models_postgres.EstacaoPropostaRHNR),
+            [
+                {"codigo": 1, "tipo_estacao": "FD", "observacao": None},
+                {"codigo": 3, "tipo_estacao": "FDT", "observacao": "nova"},
+            ],
+        )
+        connection.execute(
+            insert(models_postgres.EstacaoRedundante),
+            [
+                {"codigo": 1, "codigo_redundante": 2, "tipo_estacao": "FD"},
+                {"codigo": 3, "codigo_redundante": 2, "tipo_estacao": "F"},
+            ],
+        )
+    return engine
+
+
+def _migra(monkeypatch, engine_origem, caminho_banco, incremental=False):
+    monkeypatch.setattr(
+        migracao_bases_cplar, "create_engine_bases_cplar", lambda: engine_origem
+    )
+    monkeypatch.setattr(migracao_bases_cplar, "CAMINHO_BANCO_LOCAL", caminho_banco)
+    return migracao_bases_cplar.migra_dados_dos_bancos(
+        incremental=incremental, caminho_relatorio=None
+    )
+
+
+def _conteudo(caminho_banco) -> dict[str, list[tuple]]:
+    engine = create_engine(f"sqlite:///{caminho_banco}")
+    with engine.connect() as connection:
+        return {
+            tabela.name: connection.execute(
+                select(tabela).order_by(*tabela.primary_key)
+            ).all()
+            for tabela in models_sqlite.Base.metadata.sorted_tables
+        }
+
+
+def _altera_origem(engine_origem):
+    with engine_origem.begin() as connection:
+        connection.execute(
+            update(models_postgres.EstacaoFlu)
+            .where(models_postgres.EstacaoFlu.codigo == 2)
+            .values(nome="Dois (nova)", ultima_atualizacao=date(2024, 6, 1))
+        )
+        connection.execute(
+            insert(models_postgres.EstacaoFlu).from_select(
+                [
+                    coluna.name
+                    for coluna in models_postgres.EstacaoFlu.__table__.columns
+                ],
+                select(
+                    *(
+                        4 if coluna.name == "codigo" else coluna
+                        for coluna in models_postgres.EstacaoFlu.__table__.columns
+                    )
+                ).where(models_postgres.EstacaoFlu.codigo == 1),
+            )
+        )
+        connection.execute(
+            update(models_postgres.EstacaoPropostaRHNR)
+            .where(models_postgres.EstacaoPropostaRHNR.codigo == 1)
+            .values(observacao="revisada", proposta_integra_rhnr=True)
+        )
+        connection.execute(
+            delete(models_postgres.EstacaoRedundante).where(
+                models_postgres.EstacaoRedundante.codigo == 3
+            )
+        )
+        connection.execute(
+            delete(models_postgres.TipoEstacaoFlu).where(
+                models_postgres.TipoEstacaoFlu.codigo_estacao == 3
+            )
+        )
+
+
+def test_completa_copia_a_origem(monkeypatch, engine_origem, tmp_path):
+    caminho_banco = tmp_path / "database.db"
+
+    _migra(monkeypatch, engine_origem, caminho_banco)
+    conteudo = _conteudo(caminho_banco)
+
+    assert [linha.codigo for linha in conteudo["estacao_flu"]] == [1, 2, 3]
+    assert [linha.rhnr_implementada for linha in conteudo["estacao_flu"]] == [
+        True,
+        False,
+        True,
+    ]
+    assert len(conteudo["painel_revisao_rhnr"]) == 2
+    assert not caminho_banco.with_name("database.db.tmp").exists()
+
+
+def test_incremental_igual_a_completa(monkeypatch, engine_origem, tmp_path):
+    caminho_incremental = tmp_path / "incremental.db"
+    _migra(monkeypatch, engine_origem, caminho_incremental)
+    _altera_origem(engine_origem)
+
+    relatorio = _migra(
+        monkeypatch, engine_origem, caminho_incremental, incremental=True
+    )
+    caminho_completa = tmp_path / "completa.db"
+    _migra(monkeypatch, engine_origem, caminho_completa)
+
+    assert relatorio.modo == "incremental"
+    assert _conteudo(caminho_incremental) == _conteudo(caminho_completa)
+
+
+def test_incremental_sem_alteracoes(monkeypatch, engine_origem, tmp_path):
+    caminho_banco = tmp_path / "database.db"
+    _migra(monkeypatch, engine_origem, caminho_banco)
+    antes = _conteudo(caminho_banco)
+
+    relatorio = _migra(monkeypatch, engine_origem, caminho_banco, incremental=True)
+
+    assert _conteudo(caminho_banco) == antes
+    assert relatorio.tempo_painel == 0.0
+
+
+@pytest.mark.parametrize(
+    "esquema_antigo",
+    [
+        "ALTER TABLE painel_revisao_rhnr DROP COLUMN grupo_redundancia",
+        "DROP INDEX ix_estacao_flu_rhnr_implementada",
+        "DROP TABLE estacoes_redundantes",
+    ],
+)
+def test_incremental_com_esquema_antigo_faz_a_completa(
+    monkeypatch, engine_origem, tmp_path, esquema_antigo
+):
+    caminho_banco = tmp_path / "database.db"
+    _migra(monkeypatch, engine_origem, caminho_banco)
+    with closing(sqlite3.connect(caminho_banco)) as conexao:
+        conexao.execute(esquema_antigo)
+    _altera_origem(engine_origem)
+
+    relatorio = _migra(monkeypatch, engine_origem, caminho_banco, incremental=True)
+    caminho_completa = tmp_path / "completa.db"
+    _migra(monkeypatch, engine_origem, caminho_completa)
+
+    assert relatorio.modo == "completa"
+    assert _conteudo(caminho_banco) == _conteudo(caminho_completa)
+    assert (
+        migracao_bases_cplar.tabelas_com_esquema_divergente(
+            create_engine(f"sqlite:///{caminho_banco}")
+        )
+        == []
+    )
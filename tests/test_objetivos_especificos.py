@@ -0,0 +1,114 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, insert, select
+
+from revisao_rhnr.databases.alimentacao_tabelas_bd_bases_cplar.constantes import (
+    COLS_OBJS_ESPECIFICOS,
+)
+from revisao_rhnr.databases.models_sqlite import ObjetivoEspecificoEstacaoProposta
+from revisao_rhnr.databases.objetivos_especificos import (
+    OBJETIVOS_ESPECIFICOS,
+    cobre_objetivos,
+    consulta_estacoes_por_objetivos,
+    conta_objetivos_por_bacia,
+    expande_objetivos,
+    mascara_objetivos,
+)
+
+
+@pytest.fixture
+def engine_objetivos():
+    """SQLite em memória com objetivos aleatórios (0, 1 ou 2) por estação."""
+    gerador = np.random.default_rng(0)
+    valores = gerador.choice([0, 0, 1, 2], size=(200, len(COLS_OBJS_ESPECIFICOS)))
+    engine = create_engine("sqlite://")
+    ObjetivoEspecificoEstacaoProposta.__table__.create(engine)
+    with engine.begin() as connection:
+        connection.execute(
+            insert(ObjetivoEspecificoEstacaoProposta),
+            [
+                {
+                    "codigo": codigo,
+                    "tipo_mapeamento": "Manual",
+                    **dict(
+                        zip(
+                            COLS_OBJS_ESPECIFICOS.values(), map(int, linha), strict=True
+                        )
+                    ),
+                }
+                for codigo, linha in enumerate(valores)
+            ],
+        )
+    return engine, valores
+
+
+def test_mascara_objetivos():
+    assert mascara_objetivos([]) == 0
+    assert mascara_objetivos(["1a", "1b"]) == 0b11
+    assert mascara_objetivos(["6f"]) == 1 << (len(OBJETIVOS_ESPECIFICOS) - 1)
+    with pytest.raises(ValueError, match="7a"):
+        mascara_objetivos(["7a"])
+
+
+def test_mascara_calculada_pelo_banco(engine_objetivos):
+    engine, valores = engine_objetivos
+    with engine.connect() as connection:
+        mascaras = pd.Series(
+            connection.scalars(
+                select(ObjetivoEspecificoEstacaoProposta.objetivos_mascara).order_by(
+                    ObjetivoEspecificoEstacaoProposta.codigo
+                )
+            ).all()
+        )
+
+    np.testing.assert_array_equal(expande_objetivos(mascaras), valores != 0)
+
+
+@pytest.mark.parametrize("objetivos", [["1a"], ["2b", "6f"], ["3a", "4d", "5b"]])
+@pytest.mark.parametrize("modo", ["algum", "todos"])
+def test_consulta_sql_igual_ao_numpy(engine_objetivos, objetivos, modo):
+    engine, _ = engine_objetivos
+    with engine.connect() as connection:
+        todas = pd.DataFrame(
+            connection.execute(consulta_estacoes_por_objetivos(OBJETIVOS_ESPECIFICOS))
+            .mappings()
+            .all()
+        )
+        selecionadas = connection.execute(
+            consulta_estacoes_por_objetivos(objetivos, modo)
+        ).all()
+
+    cobertas = cobre_objetivos(todas["Máscara"], objetivos, modo)
+
+    assert sorted(codigo for codigo, _ in selecionadas) == sorted(
+        todas.loc[cobertas, "Código da Estação"]
+    )
+
+
+def test_cobre_objetivos_com_nulos():
+    mascaras = pd.Series([0b011, 0b001, None, 0b100], dtype="UInt32")
+
+    assert cobre_objetivos(mascaras, ["1a", "1b"]).tolist() == [
+        True,
+        True,
+        False,
+        False,
+    ]
+    assert cobre_objetivos(mascaras, ["1a", "1b"], "todos").tolist() == [
+        True,
+        False,
+        False,
+        False,
+    ]
+
+
+def test_conta_objetivos_por_bacia():
+    df = pd.DataFrame(
+        {"Bacia": ["Doce", "Doce", "Paraná"], "Máscara": [0b011, 0b001, 0b010]}
+    )
+
+    contagens = conta_objetivos_por_bacia(df)
+
+    assert contagens.loc["Doce", ["1a", "1b", "2a"]].tolist() == [2, 1, 0]
+    assert contagens.loc["Paraná", ["1a", "1b", "2a"]].tolist() == [0, 1, 0]
@@ -0,0 +1,35 @@
+import pytest
+
+from revisao_rhnr.databases.database_access import retorna_snapshot_dados_app
+from revisao_rhnr.databases.painel_revisao_rhnr import (
+    atualiza_painel_revisao_rhnr,
+    monta_painel_revisao_rhnr,
+)
+
+
+@pytest.mark.filterwarnings("error")
+def test_painel_junta_proposta_inicial_e_validadas(engine_local):
+    painel = monta_painel_revisao_rhnr(retorna_snapshot_dados_app(engine_local))
+
+    assert painel["Código da Estação"].tolist() == [1, 2, 3, 4]
+    assert painel["RHNR Inicial?"].tolist() == [True, False, False, True]
+    assert painel["Ação Proposta"].tolist()[:2] == ["Manter", "Desativar"]
+    assert painel["Ação Proposta"].iloc[2:].isna().all()
+    assert painel["Grupo Redundância"].tolist()[:2] == [1, 1]
+    assert painel["Grupo Redundância"].iloc[2:].isna().all()
+
+
+@pytest.mark.filterwarnings("error")
+def test_painel_sem_validadas_fora_da_proposta(engine_local):
+    snapshot = retorna_snapshot_dados_app(engine_local)
+    snapshot = snapshot._replace(validadas=snapshot.validadas.iloc[:0])
+
+    painel = monta_painel_revisao_rhnr(snapshot)
+
+    assert painel["Código da Estação"].tolist() == [1, 2, 4]
+    assert painel["Integra RHNR?"].dtype == "boolean"
+
+
+def test_atualiza_painel(engine_local):
+    assert atualiza_painel_revisao_rhnr(engine_local) == 4
+    assert atualiza_painel_revisao_rhnr(engine_local) == 4
@@ -0,0 +1,248 @@
+import pickle
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+from sqlalchemy import create_engine, event, select
+
+from revisao_rhnr.databases import models_postgres
+from revisao_rhnr.databases.alimentacao_tabelas_bd_bases_cplar import (
+    planilhas_revisao_para_tabelas_bd as planilhas,
+)
+from revisao_rhnr.databases.alimentacao_tabelas_bd_bases_cplar.constantes import (
+    COLS_OBJS_ESPECIFICOS,
+)
+
+COLUNAS_POR_TABELA = {
+    "estacoes_proposta_rhnr": {
+        "codigo",
+        "tipo_estacao",
+        "proposta_operacao",
+        "proposta_tipo",
+        "proposta_integra_rhnr",
+        "observacao",
+    },
+    "estacoes_redundantes": {"codigo", "redundancia"},
+    "obj_espec_estacoes_propostas": {
+        "codigo",
+        "tipo_mapeamento",
+        *COLS_OBJS_ESPECIFICOS.values(),
+    },
+}
+
+
+def _extrai(redundancia: str) -> tuple[pd.DataFrame, pd.DataFrame]:
+    return planilhas.extrai_estacoes_redundantes(
+        pd.DataFrame({"codigo": [100.0], "redundancia": [redundancia]})
+    )
+
+
+@pytest.mark.parametrize(
+    ("texto", "codigo_redundante", "tipo_estacao"),
+    [
+        ("12 - FD", 12, "FD"),
+        ("  12   - FDQ (desativada)", 12, "FDQ"),
+        ("99 - -x", 99, "-x"),
+        ("7 - FD\tcomentário", 7, "FD\tcomentário"),
+        ("8 - ", 8, ""),
+    ],
+)
+def test_linhas_no_padrao(texto, codigo_redundante, tipo_estacao):
+    validas, malformadas = _extrai(texto)
+
+    assert validas.to_dict("records") == [
+        {
+            "codigo": 100,
+            "codigo_redundante": codigo_redundante,
+            "tipo_estacao": tipo_estacao,
+        }
+    ]
+    assert malformadas.empty
+
+
+@pytest.mark.parametrize(
+    "texto",
+    ["12-FD", "12 -FD", "55 - P - comentario", "FD - 12", "12 x - FD", "12"],
+)
+def test_linhas_fora_do_padrao(texto):
+    validas, malformadas = _extrai(texto)
+
+    assert validas.empty
+    assert malformadas.redundancia.tolist() == [texto]
+
+
+def test_varias_linhas_por_estacao():
+    df = pd.DataFrame(
+        {
+            "codigo": [1.0, 2.0, None, 3.0],
+            "redundancia": ["10 - FD\n\n11 - P (x)", None, "12 - FD", "13-F\n14 - F"],
+        }
+    )
+
+    validas, malformadas = planilhas.extrai_estacoes_redundantes(df)
+
+    assert validas.to_dict("records") == [
+        {"codigo": 1, "codigo_redundante": 10, "tipo_estacao": "FD"},
+        {"codigo": 1, "codigo_redundante": 11, "tipo_estacao": "P"},
+        {"codigo": 3, "codigo_redundante": 14, "tipo_estacao": "F"},
+    ]
+    assert validas.dtypes[["codigo", "codigo_redundante"]].eq("int64").all()
+    assert malformadas.to_dict("records") == [{"codigo": 3.0, "redundancia": "13-F"}]
+
+
+@pytest.mark.parametrize("nome", list(planilhas.PERFIS_PLANILHAS))
+def test_perfis_geram_as_colunas_das_tabelas(nome, monkeypatch):
+    perfil = planilhas.PERFIS_PLANILHAS[nome]
+    lida = pd.DataFrame({coluna: [1.0] for coluna in perfil.colunas.values()})
+    monkeypatch.setattr(
+        planilhas, "retorna_dataframe_da_tabela_excel", lambda *_, **__: lida.copy()
+    )
+
+    df = planilhas.le_planilha_perfil(perfil)
+
+    # Os perfis vão para os processos de leitura, então precisam ser serializáveis.
+    assert pickle.loads(pickle.dumps(perfil)) == perfil
+    assert df.columns.is_unique
+    for tabela in perfil.tabelas:
+        assert COLUNAS_POR_TABELA[tabela] <= set(df.columns)
+    assert ("tipo_mapeamento" in df.columns) == (perfil.tipo_mapeamento is not None)
+
+
+def test_objetivos_exigem_tipo_mapeamento():
+    with pytest.raises(ValueError, match="tipo_mapeamento"):
+        planilhas.PerfilPlanilha(
+            arquivo="x.xlsx", colunas={}, skip_rows=0, tipo_mapeamento=None
+        )
+
+
+def _salva_planilha(caminho, cabecalho, linhas, aba=None):
+    workbook = Workbook()
+    planilha = workbook.active
+    if aba:
+        planilha.title = aba
+    planilha.append(["Revisão da RHNR"])
+    planilha.append(cabecalho)
+    for linha in linhas:
+        planilha.append(linha)
+    workbook.save(caminho)
+    return str(caminho)
+
+
+@pytest.fixture
+def perfis(tmp_path):
+    """Dois perfis com planilhas em tmp_path (caminho absoluto ignora a pasta)."""
+    objetivos = list(COLS_OBJS_ESPECIFICOS)
+    completa = _salva_planilha(
+        tmp_path / "completa.xlsx",
+        ["Código", "Tipo", "Redundância", *objetivos, "Operação", "Tipo Sugerido"]
+        + ["RHNR", "Obs"],
+        [
+            [10, "FD", "11 - F\n12 - FD", 1, *[0] * 18, "Manter", "FD", "Sim", None],
+            [20, "F", None, *[0] * 19, "Desativar", None, "Não", "x"],
+            [None, "F", None, *[0] * 19, None, None, None, "sem código"],
+        ],
+    )
+    recife = _salva_planilha(
+        tmp_path / "recife.xlsx",
+        ["Código", "Tipo Atual", "Proposição", "RHNR", "Operação 2022"],
+        [[30, "FD", "Instalar", "Sim", "nova"], [31, "P", "Manter", "Sim", None]],
+        aba="Geral",
+    )
+    return {
+        "completa": planilhas.PerfilPlanilha(
+            arquivo=completa,
+            colunas={"Código": "codigo", "Tipo": "tipo_estacao"}
+            | {"Redundância": "redundancia"}
+            | COLS_OBJS_ESPECIFICOS
+            | {
+                "Operação": "proposta_operacao",
+                "Tipo Sugerido": "proposta_tipo",
+                "RHNR": "proposta_integra_rhnr",
+                "Obs": "observacao",
+            },
+            skip_rows=1,
+            tipo_mapeamento="Manual",
+            tabelas=(
+                "estacoes_proposta_rhnr",
+                "estacoes_redundantes",
+                "obj_espec_estacoes_propostas",
+            ),
+        ),
+        "recife": planilhas.PerfilPlanilha(
+            arquivo=recife,
+            colunas={
+                "Código": "codigo",
+                "Tipo Atual": "tipo_estacao",
+                "Proposição": "proposta_operacao",
+                "RHNR": "proposta_integra_rhnr",
+                "Operação 2022": "observacao",
+            },
+            skip_rows=1,
+            tipo_mapeamento=None,
+            sheet_name="Geral",
+            ajustes=(planilhas._sem_proposta_tipo,),
+            filtro_proposta=planilhas._exclui_pluviometricas,
+            tabelas=("estacoes_proposta_rhnr",),
+        ),
+    }
+
+
+@pytest.fixture
+def engine_revisao(tmp_path):
+    """SQLite com os esquemas do Postgres anexados."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'revisao.db'}")
+
+    @event.listens_for(engine, "connect")
+    def anexa_esquemas(dbapi_connection, connection_record):
+        for esquema in ("estacoes", "revisao_rhnr"):
+            dbapi_connection.execute(
+                f"ATTACH DATABASE '{tmp_path / esquema}.db' AS {esquema}"
+            )
+
+    models_postgres.Base.metadata.create_all(engine)
+    return engine
+
+
+def _conteudo_revisao(engine) -> dict[str, list[tuple]]:
+    proposta = models_postgres.EstacaoPropostaRHNR
+    redundante = models_postgres.EstacaoRedundante
+    objetivos = models_postgres.ObjetivoEspecificoEstacaoProposta
+    with engine.connect() as connection:
+        return {
+            "proposta": connection.execute(
+                select(
+                    proposta.codigo,
+                    proposta.proposta_tipo,
+                    proposta.proposta_integra_rhnr,
+                ).order_by(proposta.codigo)
+            ).all(),
+            "redundantes": connection.execute(
+                select(
+                    redundante.codigo,
+                    redundante.codigo_redundante,
+                    redundante.tipo_estacao,
+                ).order_by(redundante.codigo_redundante)
+            ).all(),
+            "objetivos": connection.execute(
+                select(
+                    objetivos.codigo, objetivos.obj_1a, objetivos.tipo_mapeamento
+                ).order_by(objetivos.codigo)
+            ).all(),
+        }
+
+
+def test_carga_em_processos_e_repetivel(perfis, engine_revisao):
+    planilhas.alimenta_tabelas_planilhas(
+        engine_revisao, perfis, max_processos=2, usa_cache=False
+    )
+    primeira = _conteudo_revisao(engine_revisao)
+    planilhas.alimenta_tabelas_planilhas(
+        engine_revisao, perfis, max_processos=2, usa_cache=False
+    )
+
+    assert primeira == {
+        "proposta": [(10, "FD", True), (20, None, False), (30, None, True)],
+        "redundantes": [(10, 11, "F"), (10, 12, "FD")],
+        "objetivos": [(10, 1, "Manual"), (20, 0, "Manual")],
+    }
+    assert _conteudo_revisao(engine_revisao) == primeira
@@ -0,0 +1,69 @@
+from urllib.parse import unquote
+
+import pytest
+
+from revisao_rhnr.databases.snapshot_parquet import escreve_snapshot_parquet
+
+pa = pytest.importorskip("pyarrow")
+ds = pytest.importorskip("pyarrow.dataset")
+
+
+def _particoes(diretorio) -> list[str]:
+    # O pyarrow codifica os valores da partição nos nomes dos diretórios.
+    return sorted(unquote(caminho.name) for caminho in diretorio.iterdir())
+
+
+def test_snapshot_particionado_por_bacia(engine_local, tmp_path):
+    destino = tmp_path / "snapshot"
+
+    linhas = escreve_snapshot_parquet(engine_local, destino)
+
+    assert linhas["painel_revisao_rhnr"] == 4
+    assert linhas["estacoes_redundantes"] == 1
+    assert _particoes(destino / "painel_revisao_rhnr") == ["Bacia=Doce", "Bacia=Paraná"]
+    painel = ds.dataset(destino / "painel_revisao_rhnr", partitioning="hive")
+    assert painel.count_rows() == 4
+    assert painel.schema.field("Código da Estação").type == pa.int32()
+    assert painel.schema.field("Integra RHNR?").type == pa.bool_()
+    assert pa.types.is_string(painel.schema.field("Tipologia Proposta").type.value_type)
+
+
+def test_snapshot_remove_particoes_anteriores(engine_local, tmp_path):
+    destino = tmp_path / "snapshot"
+    particao_antiga = destino / "painel_revisao_rhnr" / "Bacia=Antiga"
+    particao_antiga.mkdir(parents=True)
+    (particao_antiga / "part-0.parquet").write_bytes(b"")
+
+    escreve_snapshot_parquet(engine_local, destino)
+
+    assert _particoes(destino / "painel_revisao_rhnr") == ["Bacia=Doce", "Bacia=Paraná"]
+
+
+def test_resumo_por_bacia_com_duckdb(engine_local, tmp_path):
+    pytest.importorskip("duckdb")
+    from revisao_rhnr.databases.analise_duckdb import (
+        consulta_snapshot,
+        resumo_por_bacia,
+    )
+
+    destino = tmp_path / "snapshot"
+    escreve_snapshot_parquet(engine_local, destino)
+
+    resumo = resumo_por_bacia(destino)
+
+    assert resumo["Bacia"].tolist() == ["Doce", "Paraná"]
+    assert resumo["Estações"].tolist() == [2, 2]
+    assert resumo["Operando"].tolist() == [2, 1]
+    assert resumo["RHNR Inicial"].tolist() == [1, 1]
+    assert resumo["Integra RHNR"].tolist() == [1, 0]
+    assert consulta_snapshot(
+        "SELECT count(*) AS total FROM estacoes_redundantes", diretorio=destino
+    )["total"].tolist() == [1]
+
+
+def test_consulta_sem_snapshot(tmp_path):
+    pytest.importorskip("duckdb")
+    from revisao_rhnr.databases.analise_duckdb import consulta_snapshot
+
+    with pytest.raises(FileNotFoundError):
+        consulta_snapshot("SELECT 1", diretorio=tmp_path / "inexistente")
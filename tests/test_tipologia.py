@@ -0,0 +1,45 @@
+import pandas as pd
+
+from revisao_rhnr.databases.tipologia import (
+    TipologiaEstacao,
+    codifica_tipologia,
+    decodifica_tipologia,
+    filtra_tipologia,
+    verifica_divergencia_tipologia,
+)
+
+
+def test_codifica_independe_da_ordem_e_da_caixa():
+    mascaras = codifica_tipologia(pd.Series(["FDQST", "tsqdf", "FD", "", None]))
+
+    assert mascaras.dtype == "UInt8"
+    assert mascaras.tolist() == [31, 31, 3, 0, pd.NA]
+
+
+def test_decodifica_na_ordem_canonica():
+    siglas = decodifica_tipologia(codifica_tipologia(pd.Series(["QDF", "T", None])))
+
+    assert siglas.tolist() == ["FDQ", "T", None]
+
+
+def test_filtra_tipologia():
+    mascaras = codifica_tipologia(pd.Series(["FD", "FDQ", "FQ", "F", None]))
+
+    com_d_sem_q = filtra_tipologia(
+        mascaras, inclui=TipologiaEstacao.D, exclui=TipologiaEstacao.Q
+    )
+    sem_filtro = filtra_tipologia(mascaras)
+
+    assert com_d_sem_q.tolist() == [True, False, False, False, False]
+    assert sem_filtro.tolist() == [True, True, True, True, False]
+
+
+def test_verifica_divergencia_tipologia():
+    df = pd.DataFrame(
+        {
+            "Tipologia Atual": ["FDQS", "FD", None, "F"],
+            "Tipologia Mapeada": ["FDSQ", "FDQ", "FD", None],
+        }
+    )
+
+    assert verifica_divergencia_tipologia(df).tolist() == [False, True, False, False]